@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 import argparse
-from simplex import LinearProgram, Parser, Array, SparseMatrix, DenseMatrix
+from simplex import LinearProgram, Parser, MPSParser, MPSWriter, Array, SparseMatrix, IndexedSparseMatrix, CompressedMatrix, DenseMatrix, NumpyMatrix, Simplex, RevisedSimplex, MixedSimplex, FractionFreeSimplex, DualSimplex, Presolve, Empty, Unbounded, PIVOT_RULES
+from simplex.array import numpy
+from simplex import binaryFormat
+from fractions import Fraction
 import time
 import sys
 
@@ -20,6 +23,14 @@ LATEX_FOOTER = r'''
 \end{document}
 '''
 
+ENGINES = {
+    'tableau': Simplex,
+    'revised': RevisedSimplex,
+    'mixed': MixedSimplex,
+    'integer': FractionFreeSimplex,
+    'dual': DualSimplex,
+}
+
 class bcolors:
     """
         From http://stackoverflow.com/questions/287871/print-in-terminal-with-colors-using-python
@@ -57,6 +68,23 @@ class Clock:
             string+= s.ljust(length) + ('%.4fs\n' % t)
         return string + 'Total'.ljust(length) + ('%.4fs\n' % (toc-self.start)) + bcolors.ENDC
 
+def parseDirection(string, key):
+    '''
+        Parse a direction of the parametric analysis: a comma separated list of
+        pairs key:factor.
+    '''
+    direction = {}
+    for item in string.split(','):
+        name, sep, factor = item.partition(':')
+        try:
+            direction[key(name.strip())] = Fraction(factor.strip())
+        except ValueError:
+            sys.exit('Wrong direction: %s.' % item)
+    return direction
+
+def rangeToString(bounds):
+    return '[%s, %s]' % ('-inf' if bounds[0] is None else bounds[0], '+inf' if bounds[1] is None else bounds[1])
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
             description='Simplex algorithm, to solve linear programs.')
@@ -68,35 +96,160 @@ if __name__ == '__main__':
     parser.add_argument('-t', '--timer', action='store_true',
             help='Display the time needed to complete each task.')
     parser.add_argument('-m', '--mode', type=str,
-            default='sparse', help='Internal representation (sparse/dense, default=sparse).')
+            default='sparse', help='Internal representation (sparse/indexed/compressed/dense/numpy, default=sparse).')
+    parser.add_argument('-e', '--engine', type=str,
+            default='tableau', help='Simplex implementation (tableau/revised/mixed/integer/dual, default=tableau).')
+    parser.add_argument('-p', '--pivot-rule', type=str,
+            default=None, help='Pivot rule of the tableau, mixed, integer and dual engines (%s, default=dantzig).' % '/'.join(sorted(PIVOT_RULES)))
+    parser.add_argument('-r', '--refactorization', type=int,
+            default=None, help='Maximal number of pivots between two factorizations of the basis (revised engine, default=%d).' % RevisedSimplex.refactorizationInterval)
+    parser.add_argument('--fixed-refactorization', action='store_true',
+            help='Only factorize the basis every REFACTORIZATION pivots, instead of as soon as the eta file grows larger than the factors (revised engine).')
+    parser.add_argument('--presolve', action='store_true',
+            help='Reduce the linear program before the resolution.')
+    parser.add_argument('-b', '--basis', type=str,
+            default=None, help='Start from the basis stored in the given file (written by --save-basis).')
+    parser.add_argument('--save-basis', type=str,
+            default=None, help='Write the final basis in the given file.')
+    parser.add_argument('--crash', action='store_true',
+            help='Start from a triangular crash basis instead of the slack basis.')
+    parser.add_argument('-f', '--format', type=str,
+            default='lp', help='Format of the input file (lp/mps/fixed-mps/binary, default=lp).')
+    parser.add_argument('--write-mps', type=str,
+            default=None, help='Write the linear program in the given file, in the free MPS format (the factors which are not decimal numbers, e.g. 1/3, are rounded to 17 significant digits).')
+    parser.add_argument('--save-binary', type=str,
+            default=None, help='Write the linear program in the given file, in the binary format (read with --format binary).')
+    parser.add_argument('-j', '--jobs', type=int,
+            default=1, help='Parse the input file with the given number of processes.')
+    parser.add_argument('--sensitivity', action='store_true',
+            help='Display the reduced costs, the dual values, and the ranges for which the optimal basis stays optimal.')
+    parser.add_argument('--parametric-objective', type=str,
+            default=None, help='Walk the breakpoints when the factors of the objective increase by theta times the given ones (var:factor,...).')
+    parser.add_argument('--parametric-rhs', type=str,
+            default=None, help='Walk the breakpoints when the right bounds of the rows increase by theta times the given factors (row:factor,..., the rows being numbered like in --sensitivity).')
+    parser.add_argument('--theta-max', type=Fraction,
+            default=None, help='Stop the parametric analysis at this value of theta.')
     args = parser.parse_args()
     if args.mode == 'sparse':
         Array.__bases__ = (SparseMatrix,)
+    elif args.mode == 'indexed':
+        Array.__bases__ = (IndexedSparseMatrix,)
+    elif args.mode == 'compressed':
+        Array.__bases__ = (CompressedMatrix,)
     elif args.mode == 'dense':
         Array.__bases__ = (DenseMatrix,)
+    elif args.mode == 'numpy':
+        if numpy is None:
+            sys.exit('The numpy mode requires numpy.')
+        Array.__bases__ = (NumpyMatrix,)
     else:
         sys.exit('Unknown mode: %s.' % args.mode)
+    if not args.engine in ENGINES:
+        sys.exit('Unknown engine: %s.' % args.engine)
+    if args.engine in ('integer', 'mixed') and args.mode == 'numpy':
+        sys.exit('The %s engine requires an exact representation.' % args.engine)
+    if args.pivot_rule is not None:
+        if not args.pivot_rule in PIVOT_RULES:
+            sys.exit('Unknown pivot rule: %s.' % args.pivot_rule)
+        if args.engine == 'revised':
+            sys.exit('The pivot rules are not available with the revised engine.')
+        pivotRule = PIVOT_RULES[args.pivot_rule]()
+    else:
+        pivotRule = None
+    if (args.basis or args.crash) and not ENGINES[args.engine].supportsWarmStart:
+        sys.exit('The %s engine cannot start from a given basis.' % args.engine)
+    if (args.sensitivity or args.parametric_objective or args.parametric_rhs) and not ENGINES[args.engine].supportsSensitivity:
+        sys.exit('The %s engine cannot perform the sensitivity analysis.' % args.engine)
+    if args.parametric_objective and args.parametric_rhs:
+        sys.exit('Only one parametric analysis can be performed.')
+    if not args.format in ('lp', 'mps', 'fixed-mps', 'binary'):
+        sys.exit('Unknown format: %s.' % args.format)
+    if args.jobs < 1:
+        sys.exit('The number of jobs must be positive.')
+    if args.jobs > 1 and args.format != 'lp':
+        sys.exit('Only the lp format can be parsed by several processes.')
+    basis = LinearProgram.loadBasis(args.basis) if args.basis else None
+    if args.refactorization is not None:
+        RevisedSimplex.refactorizationInterval = args.refactorization
+    if args.fixed_refactorization:
+        RevisedSimplex.adaptiveRefactorization = False
     # Instanciation of the linear program
     lp = LinearProgram()
     # Instanciation of the parser
-    parser = Parser(lp, args.inputfile)
+    if args.format == 'lp':
+        parser = Parser(lp, args.inputfile)
+    elif args.format != 'binary':
+        parser = MPSParser(lp, args.inputfile, args.format == 'fixed-mps')
     clock = Clock()
     # Parsing
-    parser.parse()
+    if args.format == 'lp':
+        parser.parse(args.jobs)
+    elif args.format == 'binary':
+        binaryFormat.load(args.inputfile, lp)
+    else:
+        parser.parse()
     clock.tic('Parsing')
+    if args.write_mps:
+        MPSWriter(lp, args.write_mps).write()
+        clock.tic('Writing')
+    if args.save_binary:
+        binaryFormat.save(lp, args.save_binary)
+        clock.tic('Saving')
     # Normalization
     lp.normalize()
     clock.tic('Normalization')
+    # Presolve
+    if args.presolve:
+        try:
+            Presolve(lp).run()
+        except Empty:
+            print('No optimal solution (empty).')
+            sys.exit()
+        clock.tic('Presolve')
     # Resolution
     if args.latex:
         latex = open(args.latex, 'w')
         latex.write(LATEX_HEADER)
     else:
         latex = None
-    lp.solve(args.verbose, latex)
+    lp.keepArtificialColumns = bool(args.sensitivity or args.parametric_rhs)
+    result = lp.solve(args.verbose, latex, ENGINES[args.engine], pivotRule, basis, args.crash)
+    if args.save_basis:
+        lp.saveBasis(args.save_basis)
     if latex:
         latex.write(LATEX_FOOTER)
         latex.close()
     clock.tic('Resolution')
+    if result is not None and args.sensitivity:
+        variables, rows = lp.sensitivity()
+        print('\nSensitivity analysis:')
+        for var in sorted(variables):
+            reducedCost, bounds = variables[var]
+            print('%s: reduced cost %s, objective factor in %s' % (var, reducedCost, rangeToString(bounds)))
+        for i, (expr, dualValue, bounds) in enumerate(rows):
+            print('row %d (%s): dual value %s, right bound in %s' % (i, expr, dualValue, rangeToString(bounds)))
+        clock.tic('Sensitivity analysis')
+    if result is not None and (args.parametric_objective or args.parametric_rhs):
+        if args.parametric_objective:
+            breakpoints, status = lp.parametricObjective(parseDirection(args.parametric_objective, str), args.theta_max)
+        else:
+            breakpoints, status = lp.parametricRightHandSide(parseDirection(args.parametric_rhs, int), args.theta_max)
+        print('\nParametric analysis:')
+        for theta, opt, values in breakpoints:
+            print('theta = %s: optimal value %s' % (theta, opt))
+        if status is not None:
+            print('No optimal solution beyond theta = %s (%s).' % (breakpoints[-1][0], 'unbounded' if status is Unbounded else 'empty'))
+        clock.tic('Parametric analysis')
     if args.timer:
         print("\n%s" % clock)
+        if lp.presolver is not None:
+            print('Presolve: %d rows and %d columns removed, %d bounds tightened' % (lp.presolver.nbRemovedRows,
+                    lp.presolver.nbRemovedColumns, lp.presolver.nbTightenedBounds))
+        print('Pivots: %d' % lp.simplex.nbPivots)
+        if lp.simplex.supportsBounds:
+            print('Bound flips: %d' % lp.simplex.nbBoundFlips)
+        if isinstance(lp.simplex, MixedSimplex):
+            print('Floating point pivots: %d' % lp.simplex.floatPivots)
+            print('Basis verified: %s' % lp.simplex.verified)
+        if getattr(lp.simplex, 'factorization', None) is not None:
+            print(lp.simplex.factorization)
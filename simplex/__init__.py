@@ -1,6 +1,14 @@
 from .linearProgram import Literal, Expression, Variable, LinearProgram
 from .simplex import Simplex, EndOfAlgorithm, Unbounded, Empty
+from .pivotRule import PivotRule, DantzigRule, BlandRule, DevexRule, SteepestEdgeRule, PartialPricingRule, PIVOT_RULES
+from .revisedSimplex import RevisedSimplex
+from .mixedSimplex import MixedSimplex
+from .fractionFreeSimplex import FractionFreeSimplex
+from .dualSimplex import DualSimplex
+from .factorization import BasisFactorization, SingularBasis
+from .presolve import Presolve
 from .parser import Parser
-from .array import Array, DenseMatrix, SparseLine, SparseMatrix
+from .mps import MPSParser, MPSWriter
+from .array import Array, DenseMatrix, SparseLine, IndexedHeap, ObjectiveLine, SparseMatrix, IndexedSparseMatrix, CompressedLine, CompressedMatrix, NumpyLine, NumpyMatrix
 
-__all__ = ['Literal', 'Expression', 'Variable', 'LinearProgram', 'Simplex, EndOfAlgorithm, Unbounded', 'Empty', 'Parser', 'Array', 'DenseMatrix', 'SparseLine', 'SparseMatrix']
+__all__ = ['Literal', 'Expression', 'Variable', 'LinearProgram', 'Simplex', 'EndOfAlgorithm', 'Unbounded', 'Empty', 'PivotRule', 'DantzigRule', 'BlandRule', 'DevexRule', 'SteepestEdgeRule', 'PartialPricingRule', 'PIVOT_RULES', 'RevisedSimplex', 'MixedSimplex', 'FractionFreeSimplex', 'DualSimplex', 'BasisFactorization', 'SingularBasis', 'Presolve', 'Parser', 'MPSParser', 'MPSWriter', 'Array', 'DenseMatrix', 'SparseLine', 'IndexedHeap', 'ObjectiveLine', 'SparseMatrix', 'IndexedSparseMatrix', 'CompressedLine', 'CompressedMatrix', 'NumpyLine', 'NumpyMatrix']
@@ -1,7 +1,26 @@
+import heapq
+from array import array
+from bisect import bisect_left
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
+def nonZeroItems(line):
+    '''
+        Iterate over the (index, value) pairs of the non-zero elements of a line,
+        whatever its representation.
+    '''
+    if isinstance(line, (dict, CompressedLine)):
+        return line.items()
+    return ((i, x) for i, x in enumerate(line) if x != 0)
+
 class DenseMatrix(list):
     '''
         A class for dense matrix computations.
     '''
+    EPSILON = 0
+
     def __init__(self, l):
         def a(x):
             if hasattr(x, '__iter__'):
@@ -72,6 +91,19 @@ class DenseMatrix(list):
     def __div__(self, other):
         return self.scalarOperation(other, lambda a, b: a/b)
 
+    def __ifloordiv__(self, other):
+        return self.inplaceScalarOperation(other, lambda a, b: a//b)
+
+    def axpy(self, alpha, other):
+        '''
+            Perform the operation self[i] += alpha*other[i] for all indices i where
+            other[i] is not 0.
+        '''
+        if alpha:
+            for i, x in nonZeroItems(other):
+                self[i] += alpha*x
+        return self
+
     def addColumn(self, element, columnID=0):
         '''
             Add a whole column made of the given element at the columnID position.
@@ -86,6 +118,60 @@ class DenseMatrix(list):
         for l in self:
             del l[columnID]
 
+    def addRow(self, line):
+        '''
+            Append the given line (a list of elements) as the last row.
+        '''
+        self.append(DenseMatrix(line))
+
+    @classmethod
+    def fromRows(cls, rows, width):
+        '''
+            Build the matrix from the given rows, each one being a map from the
+            indices of its non-zero elements to their value, and the number of
+            columns.
+        '''
+        return cls([[row.get(k, 0) for k in range(width)] for row in rows])
+
+    def pivot(self, row, column):
+        '''
+            Divide the given row by its element at the given column, and
+            eliminate this column from all the other rows.
+        '''
+        self[row] /= self[row][column]
+        for r in range(len(self)):
+            if r != row:
+                self[r].axpy(-self[r][column], self[row])
+
+    def fractionFreePivot(self, row, column, denominator):
+        '''
+            Perform an integer-preserving (Bareiss) pivot on a matrix of integers
+            whose elements are all multiplied by denominator: the other rows
+            become (pivot*line - line[column]*pivotRow)/denominator, the division
+            being exact. The pivot row is negated if needed so that the pivot
+            is positive. Return the pivot, which is the new denominator.
+        '''
+        pivotLine = self[row]
+        pivot = pivotLine[column]
+        if pivot < 0:
+            pivotLine *= -1
+            pivot = -pivot
+        for r in range(len(self)):
+            if r != row:
+                line = self[r]
+                coeff = line[column]
+                line *= pivot
+                line.axpy(-coeff, pivotLine)
+                line //= denominator
+        return pivot
+
+    def nonZeroRows(self, column):
+        '''
+            Return the rows (except the first one) which may have a non-zero
+            element in the given column.
+        '''
+        return range(1, len(self))
+
     def argmin(self, inf=0, sup=None):
         '''
             Return the index of the minimum element.
@@ -100,7 +186,7 @@ class SparseLine(dict):
     '''
         A class for sparse line computations.
     '''
-    def __init__(self, l=[]):
+    def __init__(self, l=[], length=None):
         if isinstance(l, dict):
             for k, elt in l.items():
                 self[k] = elt
@@ -108,7 +194,7 @@ class SparseLine(dict):
             for (i, x) in enumerate(l):
                 if x != 0:
                     self[i] = x
-        self.__nbitem__ = len(l)
+        self.__nbitem__ = len(l) if length is None else length
 
     def __getitem__(self, i):
         if i<0:
@@ -119,7 +205,9 @@ class SparseLine(dict):
         if i<0:
             i=len(self)+i
         if elt:
-            super(self.__class__, self).__setitem__(i, elt)
+            super(SparseLine, self).__setitem__(i, elt)
+        else:
+            self.pop(i, None)
 
     def __len__(self):
         return self.__nbitem__
@@ -208,13 +296,29 @@ class SparseLine(dict):
     def __div__(self, other):
         return self.scalarOperation(other, lambda a, b: a/b)
 
+    def __ifloordiv__(self, other):
+        return self.inplaceScalarOperation(other, lambda a, b: a//b)
+
+    def axpy(self, alpha, other):
+        '''
+            Perform the operation self[i] += alpha*other[i] in place, only for the
+            non-zero elements of other. The elements which become 0 are removed.
+        '''
+        if alpha:
+            get = self.get
+            for k, elt in nonZeroItems(other):
+                elt = get(k, 0) + alpha*elt
+                if elt:
+                    dict.__setitem__(self, k, elt)
+                else:
+                    dict.pop(self, k, None)
+        return self
+
     def addColumn(self, element, columnID=0):
         '''
             Add the given element at the columnID position.
         '''
-        for k in sorted(self.keys(), key = lambda x:-x):
-            if k < columnID:
-                break
+        for k in sorted((k for k in self.keys() if k >= columnID), reverse=True):
             self[k+1] = self[k]
             self.pop(k)
         self[columnID] = element
@@ -224,11 +328,9 @@ class SparseLine(dict):
         '''
             Remove the element laying at position columnID.
         '''
-        for k in sorted(self.keys()):
-            if k < columnID:
-                continue
-            if k > columnID:
-                self[k-1] = self[k]
+        self.pop(columnID, None)
+        for k in sorted(k for k in self.keys() if k > columnID):
+            self[k-1] = self[k]
             self.pop(k)
         self.__nbitem__ -= 1
 
@@ -253,7 +355,7 @@ class SparseLine(dict):
         for k in keys:
             if k-oldK > 1 and m > 0:
                 m = 0
-                minIndex = k
+                minIndex = oldK+1
             else:
                 if m is None or self[k] < m:
                     m = self[k]
@@ -262,15 +364,161 @@ class SparseLine(dict):
         return minIndex if m is not None else inf # in case the min is 0
 
     def copy(self):
-        return SparseLine(self)
+        return self.__class__(self)
+
+class IndexedHeap:
+    '''
+        A binary min-heap of (value, index) pairs, where each index appears at most
+        once, and whose value can be changed or removed in logarithmic time.
+    '''
+    def __init__(self, pairs=[]):
+        self.heap = sorted((value, index) for index, value in pairs)
+        self.positions = {index: position for position, (value, index) in enumerate(self.heap)}
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, index):
+        return index in self.positions
+
+    def top(self, excluded=()):
+        '''
+            Return the (value, index) pair of minimal value whose index is not in
+            excluded, or None if there is none. The heap is explored from its root
+            by increasing values, thus only the excluded pairs smaller than the
+            result (and their children) are visited.
+        '''
+        if not excluded:
+            return self.heap[0] if self.heap else None
+        candidates = [(self.heap[0], 0)] if self.heap else []
+        while candidates:
+            pair, i = heapq.heappop(candidates)
+            if not pair[1] in excluded:
+                return pair
+            for child in (2*i+1, 2*i+2):
+                if child < len(self.heap):
+                    heapq.heappush(candidates, (self.heap[child], child))
+        return None
+
+    def swap(self, i, j):
+        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+        self.positions[self.heap[i][1]] = i
+        self.positions[self.heap[j][1]] = j
+
+    def siftUp(self, i):
+        while i > 0 and self.heap[i] < self.heap[(i-1)//2]:
+            self.swap(i, (i-1)//2)
+            i = (i-1)//2
+
+    def siftDown(self, i):
+        while True:
+            smallest = i
+            for child in (2*i+1, 2*i+2):
+                if child < len(self.heap) and self.heap[child] < self.heap[smallest]:
+                    smallest = child
+            if smallest == i:
+                return
+            self.swap(i, smallest)
+            i = smallest
+
+    def update(self, index, value):
+        '''
+            Set the value associated to the index, adding it if needed.
+        '''
+        if index in self.positions:
+            i = self.positions[index]
+            self.heap[i] = (value, index)
+        else:
+            i = len(self.heap)
+            self.heap.append((value, index))
+            self.positions[index] = i
+        self.siftUp(i)
+        self.siftDown(self.positions[index])
+
+    def remove(self, index):
+        '''
+            Remove the index from the heap, if present.
+        '''
+        i = self.positions.pop(index, None)
+        if i is None:
+            return
+        last = self.heap.pop()
+        if i < len(self.heap):
+            self.heap[i] = last
+            self.positions[last[1]] = i
+            self.siftUp(i)
+            self.siftDown(self.positions[last[1]])
+
+class ObjectiveLine(SparseLine):
+    '''
+        A sparse line whose non-zero elements (except the last one) are also
+        stored in an IndexedHeap, updated at each modification of an element.
+        Thus, the index of the minimal element is found in logarithmic time when
+        it is negative.
+    '''
+    def __init__(self, l=[], length=None):
+        self.heap = None
+        super(ObjectiveLine, self).__init__(l, length)
+        self.resetHeap()
+
+    def resetHeap(self):
+        '''
+            Build the heap from the elements of the line.
+        '''
+        self.heap = IndexedHeap((k, elt) for k, elt in self.items() if k < len(self)-1)
+
+    def __setitem__(self, i, elt):
+        if i<0:
+            i=len(self)+i
+        super(ObjectiveLine, self).__setitem__(i, elt)
+        if elt and self.heap is not None and i < len(self)-1:
+            self.heap.update(i, elt)
+
+    def pop(self, i, *default):
+        if self.heap is not None:
+            self.heap.remove(i)
+        return super(ObjectiveLine, self).pop(i, *default)
+
+    def axpy(self, alpha, other):
+        '''
+            Perform the operation self[i] += alpha*other[i] in place, only for the
+            non-zero elements of other, and update the heap accordingly.
+        '''
+        if alpha:
+            for k, elt in nonZeroItems(other):
+                elt = self.get(k, 0) + alpha*elt
+                if elt:
+                    self[k] = elt
+                else:
+                    self.pop(k, None)
+        return self
+
+    def addColumn(self, element, columnID=0):
+        super(ObjectiveLine, self).addColumn(element, columnID)
+        self.resetHeap()
+
+    def removeColumn(self, columnID=0):
+        super(ObjectiveLine, self).removeColumn(columnID)
+        self.resetHeap()
+
+    def argmin(self, inf=0, sup=None):
+        '''
+            Return the index of the minimum element.
+        '''
+        top = self.heap.top()
+        if inf == 0 and sup in {-1, len(self)-1} and top is not None and top[0] < 0:
+            return top[1]
+        return super(ObjectiveLine, self).argmin(inf, sup)
 
 class SparseMatrix(list):
     '''
         A class for sparse matrix computations.
+        The first line is an ObjectiveLine.
     '''
-    def __init__(self, l):
-        self.extend(SparseLine(elt) for elt in l)
+    EPSILON = 0
 
+    def __init__(self, l):
+        self.extend((ObjectiveLine if i == 0 else SparseLine)(elt) for i, elt in enumerate(l))
 
     def addColumn(self, element, columnID=0):
         '''
@@ -286,8 +534,621 @@ class SparseMatrix(list):
         for l in self:
             l.removeColumn(columnID)
 
+    def addRow(self, line):
+        '''
+            Append the given line (a list of elements) as the last row.
+        '''
+        self.append(SparseLine(line))
+
+    @classmethod
+    def fromRows(cls, rows, width):
+        '''
+            Build the matrix from the given rows, each one being a map from the
+            indices of its non-zero elements to their value, and the number of
+            columns, without building dense lines.
+        '''
+        matrix = cls([])
+        matrix.extend((ObjectiveLine if i == 0 else SparseLine)(row, width) for i, row in enumerate(rows))
+        return matrix
+
+    def pivot(self, row, column):
+        '''
+            Divide the given row by its element at the given column, and
+            eliminate this column from all the other rows.
+        '''
+        pivotLine = self[row]
+        pivotLine /= pivotLine[column]
+        for r in range(len(self)):
+            if r != row:
+                self[r].axpy(-self[r][column], pivotLine)
+
+    def fractionFreePivot(self, row, column, denominator):
+        '''
+            Perform an integer-preserving (Bareiss) pivot on a matrix of integers
+            whose elements are all multiplied by denominator: the other rows
+            become (pivot*line - line[column]*pivotRow)/denominator, the division
+            being exact. The pivot row is negated if needed so that the pivot
+            is positive. Return the pivot, which is the new denominator.
+        '''
+        pivotLine = self[row]
+        pivot = pivotLine[column]
+        if pivot < 0:
+            pivotLine *= -1
+            pivot = -pivot
+        for r in range(len(self)):
+            if r != row:
+                line = self[r]
+                coeff = line[column]
+                line *= pivot
+                line.axpy(-coeff, pivotLine)
+                line //= denominator
+        return pivot
+
+    def nonZeroRows(self, column):
+        '''
+            Return the rows (except the first one) which may have a non-zero
+            element in the given column.
+        '''
+        return range(1, len(self))
+
+class IndexedSparseMatrix(SparseMatrix):
+    '''
+        A sparse matrix which also maps each column to the set of rows having a
+        non-zero element in this column. The map is updated during the pivots, so
+        that they only visit the rows having a non-zero element in the pivot column.
+        The integer-preserving pivots scale all the other rows by
+        pivot/denominator; this scaling is delayed until a row is accessed. Since
+        the successive scalings of a row telescope, a row which was last updated
+        when the denominator was d only has to be multiplied by the current
+        denominator and divided by d (see syncRow).
+    '''
+    def __init__(self, l):
+        super(IndexedSparseMatrix, self).__init__(l)
+        self.resetScaling()
+        self.resetIndex()
+
+    def resetScaling(self):
+        '''
+            Mark all the rows as up to date.
+        '''
+        self.denominator = 1
+        self.baseDenominator = 1
+        self.rowDenominators = {}
+        self.stale = False
+
+    def syncRow(self, i):
+        '''
+            Apply the delayed scaling of the given row.
+        '''
+        denominator = self.rowDenominators.get(i, self.baseDenominator)
+        if denominator != self.denominator:
+            line = list.__getitem__(self, i)
+            line *= self.denominator
+            line //= denominator
+            self.rowDenominators[i] = self.denominator
+
+    def syncRows(self):
+        '''
+            Apply the delayed scaling of all the rows.
+        '''
+        if self.stale:
+            for i in range(len(self)):
+                self.syncRow(i)
+            self.baseDenominator = self.denominator
+            self.rowDenominators = {}
+            self.stale = False
+
+    def __getitem__(self, i):
+        if self.stale:
+            if isinstance(i, slice):
+                self.syncRows()
+            else:
+                self.syncRow(i if i >= 0 else len(self)+i)
+        return list.__getitem__(self, i)
+
+    def __iter__(self):
+        self.syncRows()
+        return list.__iter__(self)
+
+    def __eq__(self, other):
+        self.syncRows()
+        return list.__eq__(self, other)
+
+    def __repr__(self):
+        self.syncRows()
+        return list.__repr__(self)
+
+    @classmethod
+    def fromRows(cls, rows, width):
+        matrix = super(IndexedSparseMatrix, cls).fromRows(rows, width)
+        matrix.resetScaling()
+        matrix.resetIndex()
+        return matrix
+
+    def resetIndex(self):
+        '''
+            Build the map from the columns to the rows.
+        '''
+        self.columnRows = {}
+        for r, line in enumerate(self):
+            for k in line:
+                self.columnRows.setdefault(k, set()).add(r)
+
+    def __setitem__(self, i, line):
+        if i<0:
+            i=len(self)+i
+        for k in self[i]:
+            self.columnRows.get(k, set()).discard(i)
+        super(IndexedSparseMatrix, self).__setitem__(i, line)
+        if self.stale:
+            self.rowDenominators[i] = self.denominator
+        for k in line:
+            self.columnRows.setdefault(k, set()).add(i)
+
+    def addColumn(self, element, columnID=0):
+        self.syncRows()
+        super(IndexedSparseMatrix, self).addColumn(element, columnID)
+        self.columnRows = {(k+1 if k >= columnID else k): rows for k, rows in self.columnRows.items()}
+        if element:
+            self.columnRows[columnID] = set(range(len(self)))
+
+    def removeColumn(self, columnID=0):
+        super(IndexedSparseMatrix, self).removeColumn(columnID)
+        self.columnRows.pop(columnID, None)
+        self.columnRows = {(k-1 if k > columnID else k): rows for k, rows in self.columnRows.items()}
+
+    def addRow(self, line):
+        super(IndexedSparseMatrix, self).addRow(line)
+        if self.stale:
+            self.rowDenominators[len(self)-1] = self.denominator
+        for k in self[-1]:
+            self.columnRows.setdefault(k, set()).add(len(self)-1)
+
+    def pivot(self, row, column):
+        '''
+            Divide the given row by its element at the given column, and
+            eliminate this column from the other rows having a non-zero element
+            in this column. The first row (the objective) is always visited,
+            since it may be modified in place by the Simplex class.
+        '''
+        self.syncRows()
+        pivotLine = list.__getitem__(self, row)
+        pivotLine /= pivotLine[column]
+        for r in self.columnRows.get(column, set()) | {0}:
+            if r != row:
+                line = list.__getitem__(self, r)
+                line.axpy(-line[column], pivotLine)
+                for k in pivotLine:
+                    if k in line:
+                        self.columnRows.setdefault(k, set()).add(r)
+                    else:
+                        self.columnRows[k].discard(r)
+
+    def fractionFreePivot(self, row, column, denominator):
+        '''
+            Perform an integer-preserving (Bareiss) pivot, as SparseMatrix does,
+            on the rows having a non-zero element in the given column (and the
+            objective). The scaling of the other rows by pivot/denominator is
+            delayed (see syncRow).
+        '''
+        if denominator != self.denominator:
+            self.syncRows()
+            self.denominator = self.baseDenominator = denominator
+        pivotLine = self[row]
+        pivot = pivotLine[column]
+        if pivot < 0:
+            pivotLine *= -1
+            pivot = -pivot
+        for r in self.columnRows.get(column, set()) | {0}:
+            if r == row:
+                continue
+            line = self[r]
+            coeff = line[column]
+            line *= pivot
+            if coeff:
+                line.axpy(-coeff, pivotLine)
+                for k in pivotLine:
+                    if k in line:
+                        self.columnRows.setdefault(k, set()).add(r)
+                    else:
+                        self.columnRows[k].discard(r)
+            line //= denominator
+            self.rowDenominators[r] = pivot
+        self.rowDenominators[row] = pivot
+        self.denominator = pivot
+        self.stale = True
+        return pivot
+
+    def nonZeroRows(self, column):
+        '''
+            Return the rows (except the first one) having a non-zero element in
+            the given column.
+        '''
+        return sorted(r for r in self.columnRows.get(column, ()) if r != 0)
+class CompressedLine:
+    '''
+        A sparse line stored as two parallel arrays: the sorted indices of the
+        non-zero elements (a compact array of machine integers) and their values.
+        It uses far less memory than a SparseLine, whose elements are entries of
+        a hash table.
+    '''
+    def __init__(self, l=[], length=None):
+        if isinstance(l, CompressedLine):
+            self.indices = array('i', l.indices)
+            self.values = list(l.values)
+            self.length = l.length
+        else:
+            self.indices = array('i')
+            self.values = []
+            for i, x in (sorted(l.items()) if isinstance(l, dict) else enumerate(l)):
+                if x != 0:
+                    self.indices.append(i)
+                    self.values.append(x)
+            self.length = len(l) if length is None else length
+
+    def __len__(self):
+        return self.length
+
+    def position(self, i):
+        '''
+            Return the position where the index i is (or would be) stored.
+        '''
+        return bisect_left(self.indices, i)
+
+    def __getitem__(self, i):
+        if i<0:
+            i=len(self)+i
+        p = self.position(i)
+        if p < len(self.indices) and self.indices[p] == i:
+            return self.values[p]
+        return 0
+
+    def __setitem__(self, i, elt):
+        if i<0:
+            i=len(self)+i
+        p = self.position(i)
+        if p < len(self.indices) and self.indices[p] == i:
+            if elt:
+                self.values[p] = elt
+            else:
+                del self.indices[p]
+                del self.values[p]
+        elif elt:
+            self.indices.insert(p, i)
+            self.values.insert(p, elt)
+
+    def items(self):
+        '''
+            Iterate over the (index, value) pairs of the non-zero elements.
+        '''
+        return zip(self.indices, self.values)
+
+    def __eq__(self, other):
+        return len(self) == len(other) and all(self[i] == other[i] for i in range(len(other)))
+
+    def __repr__(self):
+        return ' | '.join(str(self[k]) for k in range(len(self)))
+
+    def __itruediv__(self, other):
+        self.values = [x/other for x in self.values]
+        return self
+
+    def __ifloordiv__(self, other):
+        self.values = [x//other for x in self.values]
+        return self
+
+    def __imul__(self, other):
+        if other:
+            self.values = [x*other for x in self.values]
+        else:
+            self.indices, self.values = array('i'), []
+        return self
+
+    def axpy(self, alpha, other):
+        '''
+            Perform the operation self[i] += alpha*other[i], by merging the sorted
+            indices of the two lines. The elements which become 0 are removed.
+        '''
+        if not alpha:
+            return self
+        if isinstance(other, CompressedLine):
+            otherIndices, otherValues = other.indices, other.values
+        else:
+            pairs = sorted(nonZeroItems(other))
+            otherIndices, otherValues = [i for i, x in pairs], [x for i, x in pairs]
+        selfIndices, selfValues = self.indices, self.values
+        indices, values = array('i'), []
+        i, j, n, m = 0, 0, len(selfIndices), len(otherIndices)
+        while i < n and j < m:
+            a, b = selfIndices[i], otherIndices[j]
+            if a < b:
+                indices.append(a)
+                values.append(selfValues[i])
+                i += 1
+            elif a > b:
+                indices.append(b)
+                values.append(alpha*otherValues[j])
+                j += 1
+            else:
+                elt = selfValues[i] + alpha*otherValues[j]
+                if elt:
+                    indices.append(a)
+                    values.append(elt)
+                i += 1
+                j += 1
+        indices.extend(selfIndices[i:])
+        values.extend(selfValues[i:])
+        for k in range(j, m):
+            indices.append(otherIndices[k])
+            values.append(alpha*otherValues[k])
+        self.indices, self.values = indices, values
+        return self
+
+    def addColumn(self, element, columnID=0):
+        '''
+            Add the given element at the columnID position.
+        '''
+        p = self.position(columnID)
+        for k in range(p, len(self.indices)):
+            self.indices[k] += 1
+        self.length += 1
+        self[columnID] = element
+
+    def removeColumn(self, columnID=0):
+        '''
+            Remove the element laying at position columnID.
+        '''
+        self[columnID] = 0
+        p = self.position(columnID)
+        for k in range(p, len(self.indices)):
+            self.indices[k] -= 1
+        self.length -= 1
+
+    def argmin(self, inf=0, sup=None):
+        '''
+            Return the index of the minimum element.
+        '''
+        sup = sup if sup is not None else len(self)
+        if sup < 0:
+            sup = len(self)+sup
+        if inf >= sup:
+            raise Exception('inf is greater than sup, no argmin')
+        start, end = self.position(inf), self.position(sup)
+        m, minIndex = None, None
+        for p in range(start, end):
+            if m is None or self.values[p] < m:
+                m, minIndex = self.values[p], self.indices[p]
+        if m is None or m > 0:
+            # Look for the first 0 of the range.
+            expected = inf
+            for p in range(start, end):
+                if self.indices[p] != expected:
+                    break
+                expected += 1
+            if expected < sup:
+                return expected
+        return minIndex
+
+    def copy(self):
+        return self.__class__(self)
+
+class CompressedMatrix(list):
+    '''
+        A class for sparse matrix computations, in compressed sparse row format:
+        each line is a CompressedLine.
+    '''
+    EPSILON = 0
+
+    def __init__(self, l):
+        self.extend(CompressedLine(elt) for elt in l)
+
+    def addColumn(self, element, columnID=0):
+        '''
+            Add a whole column made of the given element at the columnID position.
+        '''
+        for l in self:
+            l.addColumn(element, columnID)
+
+    def removeColumn(self, columnID=0):
+        '''
+            Remove the whole column.
+        '''
+        for l in self:
+            l.removeColumn(columnID)
+
+    def addRow(self, line):
+        '''
+            Append the given line (a list of elements) as the last row.
+        '''
+        self.append(CompressedLine(line))
+
+    @classmethod
+    def fromRows(cls, rows, width):
+        '''
+            Build the matrix from the given rows, each one being a map from the
+            indices of its non-zero elements to their value, and the number of
+            columns, without building dense lines.
+        '''
+        matrix = cls([])
+        matrix.extend(CompressedLine(row, width) for row in rows)
+        return matrix
+
+    def pivot(self, row, column):
+        '''
+            Divide the given row by its element at the given column, and
+            eliminate this column from all the other rows.
+        '''
+        pivotLine = self[row]
+        pivotLine /= pivotLine[column]
+        for r in range(len(self)):
+            if r != row:
+                self[r].axpy(-self[r][column], pivotLine)
+
+    def fractionFreePivot(self, row, column, denominator):
+        '''
+            Perform an integer-preserving (Bareiss) pivot on a matrix of integers
+            whose elements are all multiplied by denominator: the other rows
+            become (pivot*line - line[column]*pivotRow)/denominator, the division
+            being exact. The pivot row is negated if needed so that the pivot
+            is positive. Return the pivot, which is the new denominator.
+        '''
+        pivotLine = self[row]
+        pivot = pivotLine[column]
+        if pivot < 0:
+            pivotLine *= -1
+            pivot = -pivot
+        for r in range(len(self)):
+            if r != row:
+                line = self[r]
+                coeff = line[column]
+                line *= pivot
+                line.axpy(-coeff, pivotLine)
+                line //= denominator
+        return pivot
+
+    def nonZeroRows(self, column):
+        '''
+            Return the rows (except the first one) having a non-zero element in
+            the given column.
+        '''
+        return [r for r in range(1, len(self)) if self[r][column] != 0]
+
+    def columns(self):
+        '''
+            Return the matrix in compressed sparse column format: a list of
+            CompressedLine, the k-th one being the k-th column.
+        '''
+        width = len(self[0]) if self else 0
+        columns = [CompressedLine() for k in range(width)]
+        for column in columns:
+            column.length = len(self)
+        for r, line in enumerate(self):
+            for k, elt in line.items():
+                columns[k].indices.append(r)
+                columns[k].values.append(elt)
+        return columns
+
+if numpy is not None:
+    class NumpyLine(numpy.ndarray):
+        '''
+            A line of a NumpyMatrix, viewing one row of its float64 array.
+        '''
+        def __new__(cls, l=[]):
+            return numpy.array(l, dtype=numpy.float64).view(cls)
+
+        def argmin(self, inf=0, sup=None):
+            '''
+                Return the index of the minimum element.
+            '''
+            sup = sup if sup is not None else len(self)
+            return int(numpy.ndarray.argmin(self[inf:sup])) + inf
+
+        def axpy(self, alpha, other):
+            '''
+                Perform the operation self += alpha*other in place.
+            '''
+            self += alpha*other
+            return self
+
+        def copy(self):
+            return NumpyLine(self)
+else: # pragma: no cover
+    NumpyLine = None
+
+class NumpyMatrix(list):
+    '''
+        A class for float64 matrix computations, backed by a single numpy array.
+        The lines are views on the rows of this array, thus any in-place
+        modification of a line modifies the matrix.
+    '''
+    EPSILON = 1e-9
+
+    def __init__(self, l):
+        if numpy is None: # pragma: no cover
+            raise ImportError('The numpy mode requires numpy.')
+        if isinstance(l, NumpyMatrix):
+            self.data = l.data.copy()
+        else:
+            self.data = numpy.array([list(elt) for elt in l], dtype=numpy.float64)
+        self.resetLines()
+
+    @classmethod
+    def fromRows(cls, rows, width):
+        '''
+            Build the matrix from the given rows, each one being a map from the
+            indices of its non-zero elements to their value, and the number of
+            columns, directly in the array.
+        '''
+        if numpy is None: # pragma: no cover
+            raise ImportError('The numpy mode requires numpy.')
+        matrix = cls.__new__(cls)
+        matrix.data = numpy.zeros((len(rows), width), dtype=numpy.float64)
+        for r, row in enumerate(rows):
+            for k, elt in row.items():
+                matrix.data[r, k] = elt
+        matrix.resetLines()
+        return matrix
+
+    def resetLines(self):
+        '''
+            Make the lines of the list views on the rows of the array.
+        '''
+        list.clear(self)
+        list.extend(self, (line.view(NumpyLine) for line in self.data))
+
+    def __setitem__(self, i, line):
+        self.data[i] = line
+        list.__setitem__(self, i, self.data[i].view(NumpyLine))
+
+    def addColumn(self, element, columnID=0):
+        '''
+            Add a whole column made of the given element at the columnID position.
+        '''
+        self.data = numpy.insert(self.data, columnID, float(element), axis=1)
+        self.resetLines()
+
+    def removeColumn(self, columnID=0):
+        '''
+            Remove the whole column.
+        '''
+        self.data = numpy.delete(self.data, columnID, axis=1)
+        self.resetLines()
+
+    def addRow(self, line):
+        '''
+            Append the given line (a list of elements) as the last row.
+        '''
+        self.data = numpy.vstack([self.data, numpy.array([line], dtype=numpy.float64)])
+        self.resetLines()
+
+    def pivot(self, row, column):
+        '''
+            Divide the given row by its element at the given column, and
+            eliminate this column from all the other rows with a single rank-1
+            update. Values smaller than EPSILON are flushed to 0.
+        '''
+        data = self.data
+        data[row] /= data[row, column]
+        coeffs = data[:, column].copy()
+        coeffs[row] = 0
+        rows = numpy.flatnonzero(coeffs)
+        block = data[rows]
+        block -= numpy.outer(coeffs[rows], data[row])
+        block[numpy.abs(block) < self.EPSILON] = 0
+        data[rows] = block
+        data[:, column] = 0
+        data[row, column] = 1
+
+    def nonZeroRows(self, column):
+        '''
+            Return the rows (except the first one) having a non-zero element in
+            the given column.
+        '''
+        return numpy.flatnonzero(self.data[1:, column]) + 1
+
 class Array(DenseMatrix):
     '''
-        Inherits dynamically from one of the two classes DenseMatrix and SparseMatrix.
+        Inherits dynamically from one of the classes DenseMatrix, SparseMatrix,
+        IndexedSparseMatrix, CompressedMatrix and NumpyMatrix.
     '''
     pass
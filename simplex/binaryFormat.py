@@ -0,0 +1,182 @@
+import gc
+import os
+import sys
+import mmap
+import struct
+from array import array
+from fractions import Fraction
+from .linearProgram import Literal, Expression, Variable, LinearProgram
+
+MAGIC = b'SIMPLEX\x00'
+VERSION = 1
+OBJECTIVES = [None, 'MINIMIZE', 'MAXIMIZE']
+SECTIONS = ['names', 'starts', 'columns', 'factors', 'bounds', 'numerators', 'denominators', 'bigNumbers']
+HEADER = struct.Struct('<8sIIqqqq' + 'qq'*len(SECTIONS))
+INT64 = 2**63
+
+class NumberTable:
+    '''
+        The table of the distinct numbers of a linear program: the factors and
+        the bounds are stored as indices in this table, thus each number is
+        only written and converted once.
+    '''
+    def __init__(self):
+        self.indices = {}
+        self.numerators = array('q')
+        self.denominators = array('q')
+        self.bigNumbers = []
+
+    def index(self, number):
+        '''
+            Return the index of the given number (-1 for None), which is added
+            to the table if needed.
+        '''
+        if number is None:
+            return -1
+        index = self.indices.get(number)
+        if index is None:
+            index = self.indices[number] = len(self.numerators)
+            number = Fraction(number)
+            if -INT64 <= number.numerator < INT64 and number.denominator < INT64:
+                self.numerators.append(number.numerator)
+                self.denominators.append(number.denominator)
+            else:
+                self.numerators.append(len(self.bigNumbers))
+                self.denominators.append(0)
+                self.bigNumbers.append(str(number))
+        return index
+
+def decodeNumbers(numerators, denominators, bigNumbers):
+    '''
+        Return the list of the numbers of a table (see NumberTable), followed by
+        None, so that the index -1 is None.
+    '''
+    numbers = [Fraction(bigNumbers[numerator]) if denominator == 0 else Fraction(numerator, denominator)
+            for numerator, denominator in zip(numerators, denominators)]
+    numbers.append(None)
+    return numbers
+
+def toBytes(values):
+    '''
+        Return the little-endian bytes of the given array.
+    '''
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def save(linearProgram, fileName):
+    '''
+        Write the linear program in the given file, as it was given (before its
+        normalization). The file starts with a header (see HEADER): a magic
+        string, the version of the format, the objective, the numbers of
+        variables, constraints, bounds and non-zero elements, then the offset
+        and the length of each section. The sections are aligned on 8 bytes,
+        their integers are little-endian:
+            - names: the names of the variables, separated by line breaks;
+            - starts (int64), columns (int32) and factors (int32): the rows in
+              CSR format, i.e. the objective function, the constraints and the
+              bounds;
+            - bounds (int32): the left bound, right bound and constant term of
+              each row;
+            - numerators, denominators (int64) and bigNumbers: the number table
+              (see NumberTable), whose indices are the factors and the bounds.
+              A denominator is 0 for a number which does not fit in 64 bits,
+              its numerator is then its index in bigNumbers (strings separated
+              by line breaks).
+    '''
+    lp = linearProgram if linearProgram.original is None else linearProgram.original
+    names = list(lp.variables)
+    indexFromVariable = {var: i for i, var in enumerate(names)}
+    table = NumberTable()
+    starts, columns, factors, bounds = array('q', [0]), array('i'), array('i'), array('i')
+    for expr in [lp.objectiveFunction] + lp.subjectTo + lp.bounds:
+        for lit in expr.literalList:
+            columns.append(indexFromVariable[lit.variable])
+            factors.append(table.index(lit.factor))
+        starts.append(len(columns))
+        bounds.extend((table.index(expr.leftBound), table.index(expr.rightBound), table.index(expr.constantTerm)))
+    sections = {
+        'names': '\n'.join(names).encode(),
+        'starts': toBytes(starts),
+        'columns': toBytes(columns),
+        'factors': toBytes(factors),
+        'bounds': toBytes(bounds),
+        'numerators': toBytes(table.numerators),
+        'denominators': toBytes(table.denominators),
+        'bigNumbers': '\n'.join(table.bigNumbers).encode(),
+    }
+    offsets = []
+    offset = HEADER.size
+    for name in SECTIONS:
+        offset += -offset % 8
+        offsets.extend((offset, len(sections[name])))
+        offset += len(sections[name])
+    with open(fileName, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, OBJECTIVES.index(lp.objective), len(names), len(lp.subjectTo),
+                len(lp.bounds), len(columns), *offsets))
+        for name, offset in zip(SECTIONS, offsets[::2]):
+            f.write(bytes(offset - f.tell()))
+            f.write(sections[name])
+
+def load(fileName, linearProgram=None):
+    '''
+        Fill the given linear program (or a new one) with the content of the
+        given file (see save), and return it. The file is memory-mapped, and its
+        arrays are read in place through memory views, thus no text is parsed.
+        The objects of the linear program are still built from them: each
+        distinct number is converted to a Fraction once, then a Literal is
+        created for each non-zero element, an Expression for each row and a
+        Variable for each name, which is linear in the size of the program.
+        Like in Parser.parse, the garbage collector is paused meanwhile.
+    '''
+    lp = LinearProgram() if linearProgram is None else linearProgram
+    gcEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(fileName, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC or os.fstat(f.fileno()).st_size < HEADER.size:
+                raise Exception('Error: %s is not a linear program in the binary format.' % fileName)
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with data:
+            header = HEADER.unpack_from(data)
+            magic, version, objective, nbVariables, nbConstraints, nbBounds, nbNonZeros = header[:7]
+            if version != VERSION:
+                raise Exception('Error: version %d of the binary format is not supported.' % version)
+            sections = dict(zip(SECTIONS, zip(header[7::2], header[8::2])))
+            if any(offset + length > len(data) for offset, length in sections.values()):
+                raise Exception('Error: %s is truncated.' % fileName)
+            views = [memoryview(data)]
+            def section(name, typecode=None):
+                offset, length = sections[name]
+                values = views[0][offset:offset+length]
+                views.append(values)
+                if typecode is None:
+                    return str(values, 'utf-8')
+                if sys.byteorder != 'little':
+                    values = array(typecode, values)
+                    values.byteswap()
+                    return values
+                views.append(values.cast(typecode))
+                return views[-1]
+            try:
+                names = section('names').split('\n') if nbVariables else []
+                numbers = decodeNumbers(section('numerators', 'q'), section('denominators', 'q'), section('bigNumbers').split('\n'))
+                literals = list(map(Literal, map(numbers.__getitem__, section('factors', 'i')),
+                        map(names.__getitem__, section('columns', 'i'))))
+                bounds = list(map(numbers.__getitem__, section('bounds', 'i')))
+                starts = section('starts', 'q')
+                rows = list(map(Expression, bounds[0::3], bounds[1::3],
+                        map(literals.__getitem__, map(slice, starts[:-1], starts[1:])), bounds[2::3]))
+            finally:
+                for view in reversed(views):
+                    view.release()
+    finally:
+        if gcEnabled:
+            gc.enable()
+    lp.variables = dict(zip(names, map(Variable, names)))
+    lp.objective = OBJECTIVES[objective]
+    lp.objectiveFunction = rows[0]
+    lp.subjectTo = rows[1:1+nbConstraints]
+    lp.bounds = rows[1+nbConstraints:]
+    return lp
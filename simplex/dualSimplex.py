@@ -0,0 +1,27 @@
+from .simplex import Simplex
+
+class DualSimplex(Simplex):
+    '''
+        A class to run the dual simplex algorithm, on the tableaux of the
+        Simplex class.
+        If the initial basis is dual feasible (for instance, when minimizing a
+        function whose costs are all non-negative), the dual simplex goes from
+        it to the optimal basis without first phase, even if it is not feasible
+        (e.g. with constraints a.x >= b). Otherwise, the whole (primal) simplex
+        algorithm is performed.
+    '''
+
+    def solve(self, verbose = False, latex=None, pivotRule=None):
+        '''
+            Perform the dual simplex algorithm if the basis is dual feasible,
+            the whole simplex algorithm otherwise.
+        '''
+        if pivotRule is not None:
+            self.pivotRule = pivotRule
+        if not self.isDualFeasible():
+            return super(DualSimplex, self).solve(verbose, latex)
+        if verbose:
+            print(self, '\n')
+        if latex:
+            latex.write(self.toLatex())
+        return self.reoptimize(verbose, latex)
@@ -0,0 +1,176 @@
+import heapq
+import time
+
+class SingularBasis(Exception):
+    '''
+        The basis matrix is singular.
+    '''
+    pass
+
+class BasisFactorization:
+    '''
+        A sparse LU factorization of a basis matrix.
+        The basis is given as a list of columns, each column being a dictionary
+        mapping row indices to non-zero values. Basis changes are recorded as eta
+        matrices (product form of the inverse), until the next factorization.
+        The eta file is considered too long when it has maxEtas matrices or, if
+        adaptive is set, when it has more non-zeros than ETA_GROWTH times the LU
+        factors.
+    '''
+
+    PIVOT_THRESHOLD = 0.1
+    ETA_GROWTH = 1
+
+    def __init__(self, columns, epsilon=0, maxEtas=50, adaptive=True):
+        self.epsilon = epsilon
+        self.maxEtas = maxEtas
+        self.adaptive = adaptive
+        self.nbFactorizations = 0
+        self.factorizationTime = 0
+        self.nbUpdates = 0
+        self.maxEtaLength = 0
+        self.factorize(columns)
+
+    def __str__(self):
+        return '\n'.join([
+            'Factorizations: %d (%.4fs)' % (self.nbFactorizations, self.factorizationTime),
+            'Basis updates: %d' % self.nbUpdates,
+            'Eta file length: %d (maximum %d)' % (len(self.etas), self.maxEtaLength),
+            'Non-zeros: %d in LU factors, %d in eta file' % (self.factorNonZeros, self.etaNonZeros),
+        ])
+
+    def factorize(self, columns):
+        '''
+            Compute the LU factorization of the matrix made of the given columns,
+            and empty the eta file.
+            The pivots are chosen with the Markowitz heuristic: a column with the
+            fewest non-zeros, then among its large enough elements the one whose
+            row has the fewest non-zeros.
+        '''
+        start = time.time()
+        size = len(columns)
+        rows = [{} for i in range(size)]
+        columnRows = [set() for k in range(size)]
+        for k, column in enumerate(columns):
+            for i, value in column.items():
+                if abs(value) > self.epsilon:
+                    rows[i][k] = value
+                    columnRows[k].add(i)
+        heap = [(len(columnRows[k]), k) for k in range(size)]
+        heapq.heapify(heap)
+        active = [True]*size
+        self.lower = []
+        self.upper = []
+        self.etas = []
+        self.etaNonZeros = 0
+        while heap:
+            count, k = heapq.heappop(heap)
+            if not active[k] or count != len(columnRows[k]):
+                continue
+            if count == 0:
+                raise SingularBasis('Column %d is linearly dependent.' % k)
+            active[k] = False
+            largest = max(abs(rows[r][k]) for r in columnRows[k])
+            i = min((r for r in columnRows[k] if abs(rows[r][k]) >= self.PIVOT_THRESHOLD*largest),
+                    key = lambda r: (len(rows[r]), r))
+            pivotRow = rows[i]
+            pivot = pivotRow[k]
+            for c in pivotRow:
+                columnRows[c].discard(i)
+            factors = []
+            for r in list(columnRows[k]):
+                factor = rows[r][k]/pivot
+                factors.append((r, factor))
+                line = rows[r]
+                for c, value in pivotRow.items():
+                    newValue = line.get(c, 0) - factor*value
+                    if c != k and abs(newValue) > self.epsilon:
+                        line[c] = newValue
+                        columnRows[c].add(r)
+                    else:
+                        line.pop(c, None)
+                        columnRows[c].discard(r)
+            for c in pivotRow:
+                if active[c]:
+                    heapq.heappush(heap, (len(columnRows[c]), c))
+            columnRows[k] = set()
+            self.lower.append((i, factors))
+            self.upper.append((i, k, pivotRow))
+        self.factorNonZeros = sum(len(factors) for i, factors in self.lower) + sum(len(row) for i, k, row in self.upper)
+        self.nbFactorizations += 1
+        self.factorizationTime += time.time() - start
+
+    def update(self, position, column):
+        '''
+            Record the replacement of the basis column at the given position. The
+            column must be given as computed by ftran (i.e. in the current basis).
+        '''
+        self.etas.append((position, column))
+        self.etaNonZeros += len(column)
+        self.nbUpdates += 1
+        self.maxEtaLength = max(self.maxEtaLength, len(self.etas))
+
+    def needsFactorization(self):
+        '''
+            Return True if the eta file is too long, i.e. if a new factorization
+            would make ftran and btran cheaper.
+        '''
+        if len(self.etas) >= self.maxEtas:
+            return True
+        return self.adaptive and self.etaNonZeros > self.ETA_GROWTH*max(self.factorNonZeros, len(self.upper))
+
+    def ftran(self, vector):
+        '''
+            Return x such that Bx = vector.
+            The vector is indexed by rows, x is indexed by positions in the basis.
+        '''
+        vector = dict(vector)
+        for i, factors in self.lower:
+            value = vector.get(i)
+            if value:
+                for r, factor in factors:
+                    vector[r] = vector.get(r, 0) - factor*value
+        result = {}
+        for i, k, row in reversed(self.upper):
+            value = vector.get(i, 0)
+            for c, coeff in row.items():
+                if c != k and c in result:
+                    value -= coeff*result[c]
+            if abs(value) > self.epsilon:
+                result[k] = value/row[k]
+        for position, column in self.etas:
+            value = result.get(position)
+            if value:
+                value /= column[position]
+                for i, coeff in column.items():
+                    if i != position:
+                        result[i] = result.get(i, 0) - coeff*value
+                result[position] = value
+        return result
+
+    def btran(self, vector):
+        '''
+            Return y such that yB = vector.
+            The vector is indexed by positions in the basis, y is indexed by rows.
+        '''
+        vector = dict(vector)
+        for position, column in reversed(self.etas):
+            value = vector.get(position, 0)
+            for i, coeff in column.items():
+                if i != position and i in vector:
+                    value -= vector[i]*coeff
+            vector[position] = value/column[position]
+        result = {}
+        for i, k, row in self.upper:
+            value = vector.get(k, 0)
+            if abs(value) > self.epsilon:
+                value /= row[k]
+                result[i] = value
+                for c, coeff in row.items():
+                    if c != k:
+                        vector[c] = vector.get(c, 0) - value*coeff
+        for i, factors in reversed(self.lower):
+            value = sum(factor*result[r] for r, factor in factors if r in result)
+            if value:
+                result[i] = result.get(i, 0) - value
+        return result
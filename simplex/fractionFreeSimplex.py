@@ -0,0 +1,125 @@
+from fractions import Fraction
+from math import gcd
+from .simplex import Simplex, Unbounded
+from .array import nonZeroItems
+
+def lcm(numbers):
+    '''
+        Return the least common multiple of the given integers (1 if there is none).
+    '''
+    result = 1
+    for n in numbers:
+        result = result*n//gcd(result, n)
+    return result
+
+class FractionFreeSimplex(Simplex):
+    '''
+        A class to run the simplex algorithm in integer arithmetic.
+        Each constraint line is first multiplied by the least common multiple
+        of its denominators (its slack variable is scaled accordingly), and the
+        objective line by objectiveScale. Then, the tableaux only holds
+        integers, which are the actual values multiplied by denominator (and by
+        objectiveScale for the objective line). The pivots are integer-preserving
+        (Bareiss): all the divisions are exact, and no gcd is ever computed.
+        Fractions are only built for the results (and the display).
+    '''
+    supportsBounds = False
+    supportsFreeVariables = False
+    supportsEqualities = False
+    supportsDualSimplex = False
+    supportsSensitivity = False
+
+    def __init__(self, tableaux = None):
+        super(FractionFreeSimplex, self).__init__(tableaux)
+        if self.epsilon != 0:
+            raise Exception('The fraction-free engine requires an exact representation.')
+        self.denominator = 1
+        self.objectiveScale = 1
+        self.savedDenominator = 1
+        if not tableaux is None:
+            self.scaleToIntegers()
+
+    def scaleToIntegers(self):
+        '''
+            Replace the fractions of the tableaux by integers.
+        '''
+        for row in range(len(self.tableaux)):
+            line = self.tableaux[row]
+            scale = lcm(Fraction(x).denominator for j, x in nonZeroItems(line))
+            values = [0]*len(line)
+            for j, x in nonZeroItems(line):
+                x = Fraction(x)
+                values[j] = x.numerator*(scale//x.denominator)
+            if row == 0:
+                self.objectiveScale = scale
+            else:
+                values[self.basicVariables[row]] = 1
+            self.tableaux[row] = line.__class__(values)
+
+    def entry(self, row, column):
+        '''
+            Return the value of the element of the tableaux at the given position.
+        '''
+        if row == 0:
+            return Fraction(self.tableaux[row][column], self.denominator*self.objectiveScale)
+        return Fraction(self.tableaux[row][column], self.denominator)
+
+    def ratioTest(self, column, tieBreak=None):
+        '''
+            Return the row of the leaving variable, given the entering variable.
+            The ratios are compared by cross multiplication, since all the
+            lines have the same denominator.
+        '''
+        row = None
+        for r in self.tableaux.nonZeroRows(column):
+            coeff = self.tableaux[r][column]
+            if coeff > 0:
+                if row is None:
+                    row = r
+                    continue
+                difference = self.tableaux[r][-1]*self.tableaux[row][column] - self.tableaux[row][-1]*coeff
+                if difference < 0 or \
+                        (difference == 0 and tieBreak is not None and tieBreak(r) < tieBreak(row)):
+                    row = r
+        if row is None:
+            raise Unbounded('Variable %d' % column)
+        return row
+
+    def pivotTableaux(self, row, column):
+        '''
+            Perform an integer-preserving pivot on the tableaux.
+        '''
+        self.denominator = self.tableaux.fractionFreePivot(row, column, self.denominator)
+
+    def addArtificialVariable(self):
+        '''
+            Add the variable of the first phase, with integer coefficients.
+        '''
+        column = super(FractionFreeSimplex, self).addArtificialVariable()
+        self.savedDenominator = self.denominator
+        for row in range(len(self.tableaux)):
+            self.tableaux[row][column] = self.denominator if row == 0 else -self.denominator
+        return column
+
+    def updateObjective(self, complemented=(), negated=()):
+        '''
+            Update the objective function after the first phase. It was saved
+            with the denominator of the beginning of the first phase, thus it
+            is first multiplied by the current denominator.
+        '''
+        objective = self.tableaux[0]
+        objective *= self.denominator
+        for row, column in enumerate(self.basicVariables):
+            if column is None:
+                continue
+            objective.axpy(-(objective[column]//self.denominator), self.tableaux[row])
+        self.objectiveScale *= self.savedDenominator
+
+    def solve(self, verbose = False, latex=None, pivotRule=None):
+        '''
+            Perform the whole simplex algorithm, first phase included, and
+            convert the results into fractions.
+        '''
+        opt, optSol = super(FractionFreeSimplex, self).solve(verbose, latex, pivotRule)
+        opt = Fraction(opt, self.denominator*self.objectiveScale)
+        return opt, {var: Fraction(value, self.denominator) for var, value in optSol.items()}
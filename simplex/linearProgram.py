@@ -6,6 +6,8 @@ class Literal:
     '''
         Represents a literal: a variable (a string) with a factor (a fraction).
     '''
+    __slots__ = ('factor', 'variable')
+
     def __init__(self, factor, variable):
         self.factor = factor
         self.variable = variable
@@ -14,7 +16,7 @@ class Literal:
         return '%s%s' % (self.factor, self.variable)
 
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        return (self.factor, self.variable) == (other.factor, other.variable)
 
     def __hash__(self):
         return str(self).__hash__()
@@ -47,11 +49,20 @@ class Expression:
             return False
         return set(self.literalList) == set(other.literalList)
 
-    def normalForm(self):
+    def isEquality(self):
+        return self.leftBound is not None and self.leftBound == self.rightBound
+
+    def copy(self):
+        return self.__class__(self.leftBound, self.rightBound, [lit.copy() for lit in self.literalList], self.constantTerm)
+
+    def normalForm(self, keepEqualities=False):
         '''
             Return a list of equivalent expressions, such that each expression is
-            in canonical form (no left bound).
+            in canonical form (no left bound). If keepEqualities is set, an
+            equality is kept as a single expression.
         '''
+        if keepEqualities and self.isEquality():
+            return [Expression(self.leftBound, self.rightBound, [lit.copy() for lit in self.literalList], self.constantTerm)]
         left, right = None, None
         if not self.rightBound is None:
             right = Expression(None, self.rightBound, [lit.copy() for lit in self.literalList], self.constantTerm)
@@ -86,59 +97,126 @@ class Variable:
         return (n-self.add)*self.mult
 
 class LinearProgram:
+    '''
+        Represents a linear program. Once it is normalized, a copy of the
+        program as it was given is kept in original, so that it can still be
+        modified (see addVariable, addConstraint, setObjectiveCoefficient,
+        setBounds, ...) and solved again with optimize.
+        If keepArtificialColumns is set, the simplex keeps the columns of the
+        artificial variables of the equalities (see Simplex), which the
+        sensitivity analysis of the equalities needs.
+    '''
     def __init__(self):
         self.objective = None
         self.objectiveFunction = None
         self.subjectTo = []
         self.bounds = []
+        self.boundConstraints = []
         self.variables = {}
+        self.occurrences = None
+        self.unconstrained = {}
+        self.presolver = None
+        self.simplex = None
+        self.rows = []
+        self.original = None
+        self.solved = False
+        self.modified = False
+        self.keepArtificialColumns = False
 
     def check(self):
         '''
-            Check the integrity of the linear program.
+            Check the integrity of the linear program. The parser gives pairs of
+            an expression and its line number, they are replaced by the
+            expressions, thus check can be called again after some changes.
         '''
-        for expr, lineno in self.subjectTo + self.bounds:
-            if (not expr.leftBound is None and not expr.rightBound is None and
-                    expr.leftBound > expr.rightBound):
-                raise Exception('Error at line %s: impossible bounds.' % lineno)
-            for lit in expr.literalList:
-                if not lit.variable in self.variables:
-                    raise Exception('Error at line %s: unknown variable %s.' % (lineno, lit.variable))
-        for lit in self.objectiveFunction[0].literalList:
+        self.subjectTo = [self.checkExpression(x) for x in self.subjectTo]
+        self.bounds = [self.checkExpression(x, True) for x in self.bounds]
+        self.objectiveFunction = self.checkExpression(self.objectiveFunction)
+
+    def checkExpression(self, expr, isBound=False):
+        '''
+            Check the given expression, or pair of an expression and its line
+            number, and return the expression.
+        '''
+        lineno = None
+        if isinstance(expr, tuple):
+            expr, lineno = expr
+        where = lambda: 'at line %s' % lineno if lineno is not None else 'in %s' % expr
+        if (not expr.leftBound is None and not expr.rightBound is None and
+                expr.leftBound > expr.rightBound):
+            raise Exception('Error %s: impossible bounds.' % where())
+        for lit in expr.literalList:
             if not lit.variable in self.variables:
-                raise Exception('Error at line %s: unknown variable %s.' % (self.objectiveFunction[1], lit.variable))
-        for expr, lineno in self.bounds:
-            if expr.leftBound is None and expr.rightBound is None:
-                raise Exception('Error at line %s: unbounded variable %s.' % (lineno, expr.literalList[0].variable))
-        self.objectiveFunction = self.objectiveFunction[0]
-        self.subjectTo = [x[0] for x in self.subjectTo]
-        self.bounds = [x[0] for x in self.bounds]
+                raise Exception('Error %s: unknown variable %s.' % (where(), lit.variable))
+        if isBound and expr.leftBound is None and expr.rightBound is None:
+            raise Exception('Error %s: unbounded variable %s.' % (where(), expr.literalList[0].variable))
+        return expr
+
+    def copy(self):
+        '''
+            Return a copy of the expressions and the variables of the linear
+            program, without its simplex.
+        '''
+        lp = self.__class__()
+        lp.objective = self.objective
+        lp.objectiveFunction = self.objectiveFunction.copy()
+        lp.subjectTo = [expr.copy() for expr in self.subjectTo]
+        lp.bounds = [expr.copy() for expr in self.bounds]
+        lp.boundConstraints = [expr.copy() for expr in self.boundConstraints]
+        lp.variables = {var: Variable(var, variable.mult, variable.add) for var, variable in self.variables.items()}
+        return lp
+
+    def buildOccurrences(self):
+        '''
+            Map each variable to the list of its occurrences (pairs of an
+            expression and a literal) in the constraints and the objective
+            function, so that the transformations of a variable do not have to
+            scan the whole linear program.
+        '''
+        self.occurrences = {}
+        for expr in self.subjectTo + self.boundConstraints + [self.objectiveFunction]:
+            self.addOccurrences(expr)
+
+    def addOccurrences(self, expr):
+        '''
+            Add the literals of the given expression to the occurrences, if they
+            have been built.
+        '''
+        if self.occurrences is not None:
+            for lit in expr.literalList:
+                self.occurrences.setdefault(lit.variable, []).append((expr, lit))
+
+    def occurrencesOf(self, variableName):
+        '''
+            Return the list of the occurrences of the variable. Without the map
+            built by buildOccurrences, the whole linear program is scanned.
+        '''
+        if self.occurrences is None:
+            return [(expr, lit) for expr in self.subjectTo + self.boundConstraints + [self.objectiveFunction]
+                    for lit in expr.literalList if lit.variable == variableName]
+        return self.occurrences.get(variableName, [])
 
     def invertVariable(self, variableName):
         '''
             invert(x_1): x'_1:= -x_1 so x_1=-x'_1
         '''
         self.variables[variableName].invert()
-        for expr in self.subjectTo + [self.objectiveFunction]:
-            for lit in expr.literalList:
-                if lit.variable == variableName:
-                    lit.factor = -lit.factor
-                    break
+        for expr, lit in self.occurrencesOf(variableName):
+            lit.factor = -lit.factor
 
     def translateVariable(self, variableName, n):
         '''
             translate(x_1, n): x'_1:= x_1+n so x_1=x'_1-n
         '''
         self.variables[variableName].translate(n)
-        for expr in self.subjectTo + [self.objectiveFunction]:
-            for lit in expr.literalList:
-                if lit.variable == variableName:
-                    expr.constantTerm -= lit.factor*n
-                    break
+        for expr, lit in self.occurrencesOf(variableName):
+            expr.constantTerm -= lit.factor*n
 
     def normalizeBounds(self):
         '''
-            Transform expr>=bound into -expr<=-bound.
+            Transform expr>=bound into -expr<=-bound, so that each variable is
+            non-negative. The upper bounds are kept in boundConstraints, out of
+            the constraints.
         '''
         for expr in self.bounds:
             if not expr.rightBound is None and (expr.rightBound <= 0 or expr.leftBound is None):
@@ -148,48 +226,79 @@ class LinearProgram:
                 self.translateVariable(expr.literalList[0].variable, -expr.leftBound)
                 expr.leftBound, expr.rightBound = 0, (expr.rightBound - expr.leftBound if not expr.rightBound is None else None)
             if not expr.rightBound is None:
-                self.subjectTo.append(Expression(None, expr.rightBound, expr.literalList))
+                constraint = Expression(None, expr.rightBound, expr.literalList)
+                self.boundConstraints.append(constraint)
+                self.addOccurrences(constraint)
 
     def normalizeConstraints(self):
-        self.subjectTo = [subexpr for expr in self.subjectTo for subexpr in expr.normalForm()]
+        '''
+            Put the constraints in canonical form. The equalities are kept, they
+            are only split into two inequalities by initSimplex, for the simplex
+            classes which do not support them.
+        '''
+        self.subjectTo = [subexpr for expr in self.subjectTo for subexpr in expr.normalForm(True)]
+        if self.occurrences is not None:
+            self.buildOccurrences()
 
     def replaceUnconstrained(self, var):
         '''
             If x is an unconstrained variable, we replace it by two variables x1
             and x2 such that x=x1-x2, with constraints x1>=0 and x2>=0.
         '''
-        v1 = '_0_'+var
-        v2 = '_1_'+var
-        self.variables.pop(var)
-        self.variables[v1] = Variable(v1)
-        self.variables[v2] = Variable(v2)
-        l = list(filter(lambda lit: lit.variable == var, self.objectiveFunction.literalList))
-        if l: # the variable is in the objective function
-            self.objectiveFunction.literalList = list(filter(lambda lit: lit.variable != var, self.objectiveFunction.literalList))\
-                + [Literal(l[0].factor, v1), Literal(-l[0].factor, v2)]
-        for expr in self.subjectTo:
-            l = list(filter(lambda lit: lit.variable == var, expr.literalList))
-            if l: # the variable is in the objective function
-                expr.literalList = list(filter(lambda lit: lit.variable != var, expr.literalList))\
-                    + [Literal(l[0].factor, v1), Literal(-l[0].factor, v2)]
-        return v1, v2
+        return self.replaceUnconstrainedVariables([var])[var]
+
+    def replaceUnconstrainedVariables(self, unconstrained):
+        '''
+            Replace all the given unconstrained variables, each expression being
+            rebuilt only once. Return the map from the replaced variables to
+            their substitutes.
+        '''
+        substitutes = {}
+        expressions = {}
+        for var in unconstrained:
+            v1 = '_0_'+var
+            v2 = '_1_'+var
+            self.variables.pop(var)
+            self.variables[v1] = Variable(v1)
+            self.variables[v2] = Variable(v2)
+            substitutes[var] = v1, v2
+            for expr, lit in self.occurrencesOf(var):
+                expressions[id(expr)] = expr
+        if self.occurrences is not None:
+            for var in substitutes:
+                self.occurrences.pop(var, None)
+        for expr in expressions.values():
+            literals = [lit for lit in expr.literalList if not lit.variable in substitutes]
+            for lit in expr.literalList:
+                if lit.variable in substitutes:
+                    v1, v2 = substitutes[lit.variable]
+                    newLiterals = [Literal(lit.factor, v1), Literal(-lit.factor, v2)]
+                    literals += newLiterals
+                    if self.occurrences is not None:
+                        for newLit in newLiterals:
+                            self.occurrences.setdefault(newLit.variable, []).append((expr, newLit))
+            expr.literalList = literals
+        return substitutes
+
+    def unconstrainedVariables(self):
+        '''
+            Return the sorted list of the variables without any bound (the
+            substitutes of the replaced variables are non-negative).
+        '''
+        varBounds = set(expr.literalList[0].variable for expr in self.bounds)
+        substitutes = set(v for pair in self.unconstrained.values() for v in pair)
+        return sorted(set(self.variables)-varBounds-substitutes)
 
     def pullUnconstrainedVariables(self):
         '''
             Replace all the unconstrained variables.
         '''
-        varBounds = set(expr.literalList[0].variable for expr in self.bounds)
-        var = set(self.variables)
-        unconstrained = var-varBounds
-        self.unconstrained = {}
-        for v in unconstrained:
-            v1, v2 = self.replaceUnconstrained(v)
-            self.unconstrained[v] = v1, v2
+        self.unconstrained.update(self.replaceUnconstrainedVariables(self.unconstrainedVariables()))
 
     def pushUnconstrainedVariables(self, solution):
         '''
             Compute the solution of the unconstrained variables, given the solution
-            of their substitute.
+            of their substitute. Nothing is done if they were not replaced.
         '''
         for var, (v1, v2) in self.unconstrained.items():
             assert(solution[v1] == 0 or solution[v2] == 0)
@@ -203,50 +312,510 @@ class LinearProgram:
 
     def normalize(self):
         '''
-            Normalize the linear program.
+            Normalize the linear program. The occurrences of the variables are
+            indexed first, so that each transformation only visits the
+            expressions where the variable appears. The unconstrained variables
+            are only replaced by initSimplex, for the simplex classes which do
+            not support them. A copy of the program is kept before its first
+            normalization.
         '''
+        if self.original is None:
+            self.original = self.copy()
+            self.modified = False
+        self.buildOccurrences()
         self.normalizeBounds()
         self.normalizeConstraints()
-        self.pullUnconstrainedVariables()
 
-    def initSimplex(self):
+    def splitBounds(self, simplexClass=Simplex):
         '''
-            Add a simplex attribute corresponding to the linear program.
+            Return the list of the constraints of the tableaux and the map from
+            the variables to their upper bounds. The bounds are only given to
+            the simplex classes which support them, the other ones get a
+            constraint per bound. Likewise, the equalities are split into two
+            inequalities for the simplex classes which do not support them.
         '''
+        if getattr(simplexClass, 'supportsEqualities', False):
+            constraints = list(self.subjectTo)
+        else:
+            constraints = [subexpr for expr in self.subjectTo
+                    for subexpr in (expr.normalForm() if expr.isEquality() else [expr])]
+        upperBounds = {}
+        for expr in self.boundConstraints:
+            lit = expr.literalList[0]
+            bound = None
+            if getattr(simplexClass, 'supportsBounds', False) and len(expr.literalList) == 1 and lit.factor > 0:
+                bound = Fraction(expr.rightBound - expr.constantTerm)/lit.factor
+            if bound is None or bound < 0:
+                constraints.append(expr)
+            elif not lit.variable in upperBounds or bound < upperBounds[lit.variable]:
+                upperBounds[lit.variable] = bound
+        return constraints, upperBounds
+
+    def initSimplex(self, simplexClass=Simplex):
+        '''
+            Add a simplex attribute corresponding to the linear program, of the
+            given class (Simplex or RevisedSimplex).
+        '''
+        if not getattr(simplexClass, 'supportsFreeVariables', False):
+            self.pullUnconstrainedVariables()
+        constraints, upperBounds = self.splitBounds(simplexClass)
         nbVariables = len(self.variables)
-        nbConstraints = len(self.subjectTo)
-        tableaux = Array([[Fraction(0, 1)]*(nbVariables + nbConstraints + 1)\
-            for i in range(nbConstraints + 1)])
+        nbConstraints = len(constraints)
         variableFromIndex, indexFromVariable = {}, {}
         for i, var in enumerate(sorted(self.variables)):
             variableFromIndex[i] = var
             indexFromVariable[var] = i
-        for v in range(nbVariables, nbVariables + nbConstraints):
-            variableFromIndex[v] = '_slack_%d' % (v-nbVariables)
-            indexFromVariable['_slack_%d' % (v-nbVariables)] = v
+        artificialVariables = set()
+        for v, expr in enumerate(constraints, nbVariables):
+            if expr.isEquality():
+                name = '_artificial_%d' % (v-nbVariables)
+                artificialVariables.add(v)
+            else:
+                name = '_slack_%d' % (v-nbVariables)
+            variableFromIndex[v] = name
+            indexFromVariable[name] = v
+        self.rows = constraints
         objFactor = -1 if self.objective == 'MAXIMIZE' else 1
-        for lit in self.objectiveFunction.literalList:
-            tableaux[0][indexFromVariable[lit.variable]] = objFactor*lit.factor
-        tableaux[0][-1] = -objFactor*self.objectiveFunction.constantTerm
-        for constraint, expr in enumerate(self.subjectTo):
-            for lit in expr.literalList:
-                tableaux[constraint+1][indexFromVariable[lit.variable]] = lit.factor
-            tableaux[constraint+1][nbVariables+constraint] = Fraction(1)
-            tableaux[constraint+1][-1] = expr.rightBound-expr.constantTerm
-        self.simplex = Simplex(tableaux)
+        width = nbVariables + nbConstraints + 1
+        row = {indexFromVariable[lit.variable]: Fraction(objFactor*lit.factor) for lit in self.objectiveFunction.literalList}
+        row[width-1] = Fraction(-objFactor*self.objectiveFunction.constantTerm)
+        rows = [row]
+        for constraint, expr in enumerate(constraints):
+            rightHandSide = expr.rightBound-expr.constantTerm
+            sign = self.rowSign(constraint)
+            row = {indexFromVariable[lit.variable]: Fraction(sign*lit.factor) for lit in expr.literalList}
+            row[nbVariables+constraint] = Fraction(1)
+            row[width-1] = Fraction(sign*rightHandSide)
+            rows.append(row)
+        self.simplex = simplexClass(Array.fromRows(rows, width))
         self.simplex.basicVariables = [None]+list(range(nbVariables, nbVariables+nbConstraints))
         self.simplex.variableFromIndex = variableFromIndex
         self.simplex.indexFromVariable = indexFromVariable
+        if upperBounds:
+            self.simplex.upperBounds = {indexFromVariable[var]: bound for var, bound in upperBounds.items()}
+        if artificialVariables:
+            self.simplex.artificialVariables = artificialVariables
+            self.simplex.keepArtificialColumns = self.keepArtificialColumns
+        freeVariables = self.unconstrainedVariables()
+        if freeVariables:
+            self.simplex.freeVariables = {indexFromVariable[var] for var in freeVariables}
+
+    def rowSign(self, constraint):
+        '''
+            Return the factor of the given row (see rows) in the tableaux: -1
+            for an equality whose right-hand side is negative, since it is
+            negated so that its artificial variable is feasible, 1 otherwise.
+        '''
+        expr = self.rows[constraint]
+        return -1 if expr.isEquality() and expr.rightBound < expr.constantTerm else 1
 
-    def solve(self, verbose=False, latex=None):
+    def basis(self):
         '''
-            Solve the linear program, using the simplex algorithm.
+            Return the current basis of the simplex: the list of the names of
+            the basic variables, and the list of the names of the non-basic
+            variables which are at their upper bound.
+        '''
+        simplex = self.simplex
+        basic = [simplex.variableFromIndex[column] for column in simplex.basicVariables[1:]]
+        atUpperBound = sorted(simplex.variableFromIndex[column] for column in getattr(simplex, 'complemented', ())
+                if not column in simplex.basicVariables)
+        return basic, atUpperBound
+
+    def setBasis(self, basic, atUpperBound=()):
+        '''
+            Start the simplex from the given basis (see basis). The unknown
+            variables are ignored. Return False if some variables cannot enter
+            the basis.
+        '''
+        if not getattr(self.simplex, 'supportsWarmStart', False):
+            raise Exception('The simplex class %s cannot start from a given basis.' % self.simplex.__class__.__name__)
+        indexFromVariable = self.simplex.indexFromVariable
+        basicVariables = [None]+[indexFromVariable[var] for var in basic if var in indexFromVariable]
+        return self.simplex.setBasis(basicVariables, [indexFromVariable[var] for var in atUpperBound if var in indexFromVariable])
+
+    def saveBasis(self, fileName):
+        '''
+            Write the current basis in the given file: one line 'BS name' per
+            basic variable, and one line 'UL name' per non-basic variable at its
+            upper bound.
+        '''
+        basic, atUpperBound = self.basis()
+        with open(fileName, 'w') as f:
+            for var in basic:
+                f.write('BS %s\n' % var)
+            for var in atUpperBound:
+                f.write('UL %s\n' % var)
+
+    @staticmethod
+    def loadBasis(fileName):
+        '''
+            Read a basis written by saveBasis.
+        '''
+        basic, atUpperBound = [], []
+        with open(fileName) as f:
+            for lineno, line in enumerate(f, 1):
+                fields = line.split()
+                if not fields:
+                    continue
+                if len(fields) != 2 or not fields[0] in ('BS', 'UL'):
+                    raise Exception('Error at line %s of the basis file.' % lineno)
+                (basic if fields[0] == 'BS' else atUpperBound).append(fields[1])
+        return basic, atUpperBound
+
+    def program(self):
+        '''
+            Return the linear program to modify: the original one if this one
+            is normalized.
+        '''
+        return self if self.original is None else self.original
+
+    def canUpdate(self):
+        '''
+            Return True if the modifications can be applied to the tableaux of
+            the simplex, which is then solved again from its optimal basis.
+        '''
+        return (self.solved and not self.modified and self.presolver is None and
+                getattr(self.simplex, 'supportsDualSimplex', False))
+
+    def tableauxCoefficients(self, literalList):
+        '''
+            Return the map from the columns of the simplex to the factors of
+            the given literals (on the variables of the original program), and
+            the constant term which comes from the translations of the
+            variables.
+        '''
+        indexFromVariable = self.simplex.indexFromVariable
+        columns, constant = {}, 0
+        for lit in literalList:
+            if lit.variable in self.unconstrained:
+                parts = zip(self.unconstrained[lit.variable], (lit.factor, -lit.factor))
+            else:
+                variable = self.variables[lit.variable]
+                parts = [(lit.variable, lit.factor*variable.mult)]
+                constant -= lit.factor*variable.mult*variable.add
+            for var, factor in parts:
+                column = indexFromVariable[var]
+                columns[column] = columns.get(column, 0) + factor
+        return columns, constant
+
+    @staticmethod
+    def boundTransformation(leftBound, rightBound):
+        '''
+            Return the transformation made by normalizeBounds to a variable
+            between the given bounds: its factor (-1 if it is inverted), its
+            lower bound once inverted, and its upper bound once inverted and
+            translated (None if it has none).
+        '''
+        if not rightBound is None and (rightBound <= 0 or leftBound is None):
+            return -1, -rightBound, (rightBound - leftBound if not leftBound is None else None)
+        return 1, leftBound, (rightBound - leftBound if not rightBound is None else None)
+
+    def constraints(self):
+        '''
+            Return the list of the constraints of the original program.
+        '''
+        return list(self.program().subjectTo)
+
+    def addVariable(self, name, leftBound=0, rightBound=None):
+        '''
+            Add a variable between the given bounds (None for no bound). The
+            simplex is rebuilt by the next resolution.
+        '''
+        program = self.program()
+        if name in program.variables:
+            raise Exception('Error: variable %s already exists.' % name)
+        program.variables[name] = Variable(name)
+        if not leftBound is None or not rightBound is None:
+            program.bounds.append(program.checkExpression(Expression(leftBound, rightBound, [Literal(1, name)]), True))
+        self.modified = True
+
+    def removeVariable(self, name):
+        '''
+            Remove a variable, with its bounds and its literals. The simplex is
+            rebuilt by the next resolution.
+        '''
+        program = self.program()
+        if not name in program.variables:
+            raise Exception('Error: unknown variable %s.' % name)
+        del program.variables[name]
+        program.bounds = [expr for expr in program.bounds if expr.literalList[0].variable != name]
+        for expr in program.subjectTo + [program.objectiveFunction]:
+            expr.literalList = [lit for lit in expr.literalList if lit.variable != name]
+        self.modified = True
+
+    def addConstraint(self, expr):
+        '''
+            Add a constraint (an expression with at least one bound). If the
+            program is solved, its rows are added to the tableaux of the
+            simplex, in the optimal basis.
+        '''
+        program = self.program()
+        program.checkExpression(expr)
+        if expr.leftBound is None and expr.rightBound is None:
+            raise Exception('Error in %s: constraint without bound.' % expr)
+        program.subjectTo.append(expr)
+        if not self.canUpdate():
+            self.modified = True
+            return
+        for subexpr in expr.normalForm():
+            columns, constant = self.tableauxCoefficients(subexpr.literalList)
+            self.simplex.addConstraint(columns, subexpr.rightBound - subexpr.constantTerm - constant)
+            self.rows.append(subexpr)
+
+    def removeConstraint(self, expr):
+        '''
+            Remove the given constraint (or an equal one). The simplex is
+            rebuilt by the next resolution.
+        '''
+        program = self.program()
+        for i, other in enumerate(program.subjectTo):
+            if other is expr:
+                break
+        else:
+            if not expr in program.subjectTo:
+                raise Exception('Error: unknown constraint %s.' % expr)
+            i = program.subjectTo.index(expr)
+        del program.subjectTo[i]
+        self.modified = True
+
+    def setObjectiveCoefficient(self, name, factor):
+        '''
+            Set the factor of the variable in the objective function. If the
+            program is solved, its reduced cost is updated in the tableaux of
+            the simplex.
+        '''
+        program = self.program()
+        if not name in program.variables:
+            raise Exception('Error: unknown variable %s.' % name)
+        objectiveFunction = program.objectiveFunction
+        delta = factor - sum(lit.factor for lit in objectiveFunction.literalList if lit.variable == name)
+        objectiveFunction.literalList = [lit for lit in objectiveFunction.literalList if lit.variable != name]
+        if factor != 0:
+            objectiveFunction.literalList.append(Literal(factor, name))
+        if not self.canUpdate():
+            self.modified = True
+            return
+        objFactor = -1 if self.objective == 'MAXIMIZE' else 1
+        columns, constant = self.tableauxCoefficients([Literal(delta, name)])
+        for column, factor in columns.items():
+            self.simplex.changeCost(column, objFactor*factor)
+        objective = self.simplex.tableaux[0]
+        objective[-1] = objective[-1] - objFactor*constant
+
+    def setBounds(self, name, leftBound=None, rightBound=None):
+        '''
+            Replace the bounds of the variable by the given ones (None for no
+            bound). If the program is solved, the simplex supports the bounds,
+            and the variable keeps the same kind of bounds (lower or upper one),
+            it is translated in the tableaux of the simplex. Otherwise, the
+            simplex is rebuilt by the next resolution.
+        '''
+        program = self.program()
+        if not name in program.variables:
+            raise Exception('Error: unknown variable %s.' % name)
+        old = [expr for expr in program.bounds if expr.literalList[0].variable == name]
+        program.bounds = [expr for expr in program.bounds if expr.literalList[0].variable != name]
+        if not leftBound is None or not rightBound is None:
+            program.bounds.append(program.checkExpression(Expression(leftBound, rightBound, [Literal(1, name)]), True))
+        if (not self.canUpdate() or not self.simplex.supportsBounds or len(old) != 1 or
+                (leftBound, rightBound) == (None, None)):
+            self.modified = True
+            return
+        mult, lower, upper = self.boundTransformation(leftBound, rightBound)
+        if mult != self.boundTransformation(old[0].leftBound, old[0].rightBound)[0]:
+            self.modified = True
+            return
+        simplex = self.simplex
+        column = simplex.indexFromVariable[name]
+        variable = self.variables[name]
+        complemented = column in simplex.complemented
+        if complemented:
+            simplex.complementVariable(column)
+        simplex.translateVariable(column, lower + variable.add)
+        variable.add = -lower
+        if upper is None:
+            simplex.upperBounds.pop(column, None)
+        else:
+            simplex.upperBounds[column] = upper
+            if complemented:
+                simplex.complementVariable(column)
+
+    def restoreModel(self):
+        '''
+            Replace the normalized program by a new normalization of the
+            original one (with its modifications), presolved again if it was.
+        '''
+        model = self.original.copy()
+        self.objective = model.objective
+        self.objectiveFunction = model.objectiveFunction
+        self.subjectTo = model.subjectTo
+        self.bounds = model.bounds
+        self.boundConstraints = []
+        self.variables = model.variables
+        self.occurrences = None
+        self.unconstrained = {}
+        presolver, self.presolver = self.presolver, None
+        self.normalize()
+        if presolver is not None:
+            presolver.__class__(self).run()
+        self.modified = False
+
+    def optimize(self, simplexClass=Simplex, pivotRule=None, basis=None, crash=False, verbose=False, latex=None):
+        '''
+            Solve the linear program, and return the optimal value and the map
+            from the variables to their values. Raise Unbounded or Empty if
+            there is no optimal solution. The simplex starts from the given
+            basis (a pair of lists of names, like the result of basis or
+            loadBasis) if any, or else from a triangular crash basis if crash is
+            set (and supported), or else from the basis made of the slack
+            variables.
+            If the program was already solved with the same simplex class, and
+            all its modifications were applied to the tableaux (see canUpdate),
+            the simplex goes on from its basis with reoptimize. Otherwise, the
+            simplex is rebuilt, and starts from the basis of the previous one
+            when it is possible.
+        '''
+        if (self.canUpdate() and self.simplex.__class__ is simplexClass and
+                basis is None and not crash):
+            if pivotRule is not None:
+                self.simplex.pivotRule = pivotRule
+            solve = self.simplex.reoptimize
+        else:
+            previous = None
+            if basis is None and not crash and self.simplex is not None:
+                previous = self.basis()
+            if self.original is not None and (self.modified or self.simplex is not None):
+                self.restoreModel()
+            self.initSimplex(simplexClass)
+            if basis is not None:
+                self.setBasis(*basis)
+            elif previous is not None:
+                if getattr(self.simplex, 'supportsWarmStart', False):
+                    self.setBasis(*[[var for var in names if var in self.variables] for names in previous])
+            elif crash and getattr(self.simplex, 'supportsWarmStart', False):
+                self.simplex.setBasis(self.simplex.crashBasis())
+            if pivotRule is None:
+                solve = self.simplex.solve
+            else:
+                solve = lambda verbose, latex: self.simplex.solve(verbose, latex, pivotRule)
+        self.solved = False
+        opt, optSol = solve(verbose, latex)
+        self.solved = True
+        if self.objective == 'MINIMIZE':
+            opt = -opt
+        return opt, self.values(optSol)
+
+    def values(self, optSol):
+        '''
+            Return the values of the variables of the program, given the
+            solution of the simplex.
+        '''
+        self.pushUnconstrainedVariables(optSol)
+        if self.presolver is not None:
+            self.presolver.postsolve(optSol)
+        return {var: self.variables[var].computeValue(value) for var, value in optSol.items()}
+
+    def sensitivitySimplex(self, equalities=False):
+        '''
+            Return the simplex, after checking that its sensitivity analysis
+            can be done. If equalities is set and the columns of the artificial
+            variables were erased, keepArtificialColumns is set and the simplex
+            is rebuilt, then solved again from its optimal basis.
+        '''
+        if not self.solved or self.modified:
+            raise Exception('The linear program must be solved before its sensitivity analysis.')
+        if not getattr(self.simplex, 'supportsSensitivity', False):
+            raise Exception('The simplex class %s does not support the sensitivity analysis.' % self.simplex.__class__.__name__)
+        if equalities and self.simplex.artificialVariables and not self.simplex.keepArtificialColumns:
+            self.keepArtificialColumns = True
+            basis, pivotRule = self.basis(), self.simplex.pivotRule
+            self.initSimplex(self.simplex.__class__)
+            self.setBasis(*basis)
+            self.simplex.solve(pivotRule=pivotRule)
+        return self.simplex
+
+    def sensitivity(self):
+        '''
+            Return the sensitivity analysis of the optimal basis:
+                - the map from the variables to their reduced cost and the
+                  range of their factor in the objective function for which
+                  the basis stays optimal,
+                - the list of the rows of the tableaux (see rows), as triples of
+                  the normalized constraint, its dual value, and the range of
+                  its right bound for which the basis stays optimal.
+            The infinite ends of the ranges are None. The variables removed by
+            the presolve are not given.
+        '''
+        simplex = self.sensitivitySimplex(True)
+        objFactor = -1 if self.objective == 'MAXIMIZE' else 1
+        program = self.program()
+        variables = {}
+        for var in program.variables:
+            if not var in self.unconstrained and not var in simplex.indexFromVariable:
+                continue
+            column = simplex.indexFromVariable[self.unconstrained[var][0] if var in self.unconstrained else var]
+            columns = self.tableauxCoefficients([Literal(objFactor, var)])[0]
+            factor = sum(lit.factor for lit in program.objectiveFunction.literalList if lit.variable == var)
+            low, high = simplex.costRange(columns)
+            variables[var] = (objFactor*columns[column]*simplex.reducedCost(column),
+                    (None if low is None else factor+low, None if high is None else factor+high))
+        rows = []
+        for constraint, expr in enumerate(self.rows):
+            sign = self.rowSign(constraint)
+            low, high = simplex.rightHandSideRange({constraint: sign})
+            rows.append((expr, -objFactor*sign*simplex.dualValue(constraint),
+                    (None if low is None else expr.rightBound+low, None if high is None else expr.rightBound+high)))
+        return variables, rows
+
+    def parametricObjective(self, direction, thetaMax=None):
+        '''
+            Increase the factor of each variable of direction in the objective
+            function by theta times its value, from theta = 0 up to thetaMax if
+            given, without solving the program again (see
+            Simplex.parametricCost). Return the list of the breakpoints, as
+            triples (theta, optimal value, values of the variables), and
+            Unbounded if there is no optimal solution beyond the last one (None
+            otherwise). The program is not modified, but it must be solved
+            again before any other analysis.
+        '''
+        simplex = self.sensitivitySimplex()
+        for var in direction:
+            if not var in self.variables:
+                raise Exception('Error: unknown variable %s.' % var)
+        objFactor = -1 if self.objective == 'MAXIMIZE' else 1
+        columns, constant = self.tableauxCoefficients([Literal(objFactor*factor, var) for var, factor in direction.items()])
+        self.solved = False
+        breakpoints, status = simplex.parametricCost(columns, thetaMax)
+        return [(theta, -objFactor*opt + theta*objFactor*constant, self.values(optSol))
+                for theta, opt, optSol in breakpoints], status
+
+    def parametricRightHandSide(self, direction, thetaMax=None):
+        '''
+            Increase the right bound of each row of direction (given by its
+            index in rows) by theta times its value, from theta = 0 up to
+            thetaMax if given, without solving the program again (see
+            Simplex.parametricRightHandSide). Return the list of the
+            breakpoints, like parametricObjective, and Empty if there is no
+            solution beyond the last one (None otherwise).
+        '''
+        for row in direction:
+            if not 0 <= row < len(self.rows):
+                raise Exception('Error: unknown row %s.' % row)
+        simplex = self.sensitivitySimplex(any(self.rows[row].isEquality() for row in direction))
+        objFactor = -1 if self.objective == 'MAXIMIZE' else 1
+        direction = {row: self.rowSign(row)*factor for row, factor in direction.items()}
+        self.solved = False
+        breakpoints, status = simplex.parametricRightHandSide(direction, thetaMax)
+        return [(theta, -objFactor*opt, self.values(optSol)) for theta, opt, optSol in breakpoints], status
+
+    def solve(self, verbose=False, latex=None, simplexClass=Simplex, pivotRule=None, basis=None, crash=False):
+        '''
+            Solve the linear program with optimize, and print the solution.
+            Return the result of optimize, or None if there is no optimal
+            solution.
         '''
-        self.initSimplex()
         try:
-            opt, optSol = self.simplex.solve(verbose, latex)
-            if self.objective == 'MINIMIZE':
-                opt = -opt
+            opt, values = self.optimize(simplexClass, pivotRule, basis, crash, verbose, latex)
         except Unbounded:
             print('No optimal solution (unbounded).')
             if latex:
@@ -257,15 +826,15 @@ class LinearProgram:
             if latex:
                 latex.write('No optimal solution (empty).\n')
             return
-        self.pushUnconstrainedVariables(optSol)
         print('Optimal solution: %s.' % opt)
         print('Found with the following affectation of the variables:')
-        for var in sorted(optSol):
-            print('%s = %s' % (var, self.variables[var].computeValue(optSol[var])))
+        for var in sorted(values):
+            print('%s = %s' % (var, values[var]))
         if latex:
             latex.write('Optimal solution: %s.\n\n' % opt)
             latex.write('Found with the following affectation of the variables:\n\n')
             latex.write('\\[\\begin{cases}\n')
-            for var in sorted(optSol):
-                latex.write('%s &= %s\\\\\n' % (latexWrap(var), fractionToLatex(self.variables[var].computeValue(optSol[var]))))
+            for var in sorted(values):
+                latex.write('%s &= %s\\\\\n' % (latexWrap(var), fractionToLatex(values[var])))
             latex.write('\\end{cases}\\]\n\n')
+        return opt, values
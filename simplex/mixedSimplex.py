@@ -0,0 +1,80 @@
+from .simplex import Simplex, Unbounded, Empty
+from .array import nonZeroItems, numpy, NumpyMatrix, SparseMatrix
+
+class MixedSimplex(Simplex):
+    '''
+        A class to run the simplex algorithm in floating point arithmetic, and
+        to certify its result in exact arithmetic.
+        The whole algorithm is first run on a floating point copy of the
+        tableaux. The optimal basis it finds is then reconstructed in the exact
+        tableaux, by one exact pivot per basic variable (with
+        reconstructBasis). If this basis is
+        feasible and optimal, the solution is exact. Otherwise (or if the
+        floating point run failed), the exact simplex algorithm goes on from
+        the reconstructed basis.
+    '''
+    FLOAT_EPSILON = 1e-9
+    supportsBounds = False
+    supportsFreeVariables = False
+    supportsEqualities = False
+
+    def __init__(self, tableaux = None):
+        super(MixedSimplex, self).__init__(tableaux)
+        if self.epsilon != 0:
+            raise Exception('The mixed engine requires an exact representation.')
+        self.floatPivots = 0
+        self.verified = False
+
+    def floatSimplex(self):
+        '''
+            Return a Simplex working on a floating point copy of the tableaux.
+        '''
+        width = len(self.tableaux[0])
+        lines = []
+        for line in self.tableaux:
+            floatLine = [0.0]*width
+            for j, x in nonZeroItems(line):
+                floatLine[j] = float(x)
+            lines.append(floatLine)
+        simplex = Simplex()
+        simplex.tableaux = (NumpyMatrix if numpy is not None else SparseMatrix)(lines)
+        simplex.epsilon = self.FLOAT_EPSILON
+        simplex.nbConstraints = self.nbConstraints
+        simplex.nbVariables = self.nbVariables
+        simplex.basicVariables = list(self.basicVariables)
+        simplex.variableFromIndex = dict(self.variableFromIndex)
+        simplex.indexFromVariable = dict(self.indexFromVariable)
+        simplex.pivotRule = self.pivotRule
+        return simplex
+
+    def isOptimal(self):
+        '''
+            Return True if the current basis is feasible and optimal.
+        '''
+        if any(self.tableaux[r][-1] < 0 for r in range(1, len(self.tableaux))):
+            return False
+        last = len(self.tableaux[0])-1
+        return all(x >= 0 for j, x in nonZeroItems(self.tableaux[0]) if j < last)
+
+    def solve(self, verbose = False, latex=None, pivotRule=None):
+        '''
+            Perform the whole simplex algorithm in floating point, then verify
+            (and complete if needed) the solution in exact arithmetic.
+        '''
+        if pivotRule is not None:
+            self.pivotRule = pivotRule
+        simplex = self.floatSimplex()
+        try:
+            simplex.solve()
+        except (Unbounded, Empty):
+            basicVariables = None
+        else:
+            basicVariables = simplex.basicVariables
+        self.floatPivots = simplex.nbPivots
+        if basicVariables is not None and self.reconstructBasis(basicVariables):
+            self.verified = self.isOptimal()
+        if verbose:
+            print('Floating point pivots: %d' % self.floatPivots)
+            print('Exact pivots to reconstruct the basis: %d' % self.nbPivots)
+            print('Basis verified: %s' % self.verified)
+        return super(MixedSimplex, self).solve(verbose, latex)
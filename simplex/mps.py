@@ -0,0 +1,419 @@
+import gc
+import re
+from fractions import Fraction
+from functools import lru_cache
+from .linearProgram import Literal, Expression, Variable
+from .parser import Parser
+
+class MPSParser:
+    '''
+        A class to parse a linear program in the MPS format, either free (the
+        fields are separated by spaces) or fixed (the fields are given by their
+        columns, thus the names may contain spaces).
+        The first N row is the objective function (other N rows are ignored),
+        which is minimized unless an OBJSENSE section says otherwise. The
+        variables are non-negative unless the BOUNDS section says otherwise. The
+        integrality markers are ignored: the linear relaxation is solved.
+    '''
+    NAME = 'NAME'
+    OBJSENSE = 'OBJSENSE'
+    ROWS = 'ROWS'
+    COLUMNS = 'COLUMNS'
+    RHS = 'RHS'
+    RANGES = 'RANGES'
+    BOUNDS = 'BOUNDS'
+    ENDATA = 'ENDATA'
+    SECTIONS = frozenset([NAME, OBJSENSE, ROWS, COLUMNS, RHS, RANGES, BOUNDS, ENDATA])
+    ROW_TYPES = frozenset(['N', 'L', 'G', 'E'])
+    BOUND_TYPES = frozenset(['UP', 'LO', 'FX', 'FR', 'MI', 'PL', 'BV', 'LI', 'UI'])
+    VALUELESS_BOUND_TYPES = frozenset(['FR', 'MI', 'PL', 'BV'])
+    FIXED_FIELDS = [(1, 3), (4, 12), (14, 22), (24, 36), (39, 47), (49, 61)]
+    NUMBER_REGEXP = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+    INFINITY = 10**30
+    MARKER = "'MARKER'"
+
+    def __init__(self, linearProgram, fileName, fixed=False):
+        self.linearProgram = linearProgram
+        self.fileName = fileName
+        self.fixed = fixed
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def stringToNumber(n):
+        '''
+            Convert a string (an integer or a decimal, with an optional
+            exponent) into a fraction. Raise ValueError if the string is not a
+            number.
+        '''
+        if not MPSParser.NUMBER_REGEXP.fullmatch(n):
+            raise ValueError(n)
+        if 'e' in n or 'E' in n:
+            return Fraction(n)
+        return Parser.stringToNumber(n)
+
+    def number(self, string, lineno):
+        '''
+            Return the number represented by the given field.
+        '''
+        try:
+            return self.stringToNumber(string)
+        except ValueError:
+            raise Exception('Syntax error at line %s.' % lineno) from None
+
+    def fields(self, line):
+        '''
+            Return the list of the fields of the given data line, the empty
+            trailing fields being removed.
+        '''
+        if not self.fixed:
+            return line.split()
+        fields = [line[start:end].strip() for start, end in self.FIXED_FIELDS]
+        while fields and not fields[-1]:
+            fields.pop()
+        return fields
+
+    def lineRange(self):
+        '''
+            Range over all the lines of the file which are neither empty nor
+            comments. Yield the line number, whether the line is a section
+            header (it starts in the first column with the name of a section),
+            and the line itself.
+        '''
+        with open(self.fileName) as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.rstrip('\r\n')
+                if not line.strip() or line.startswith('*'):
+                    continue
+                yield lineno, not line[0].isspace() and line.split(None, 1)[0] in self.SECTIONS, line
+
+    def parse(self):
+        '''
+            Fill the linear program with the content of the file. The garbage
+            collector is paused meanwhile, like in Parser.parse.
+        '''
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.parseLines(self.lineRange())
+        finally:
+            if gcEnabled:
+                gc.enable()
+        self.linearProgram.check()
+
+    def parseLines(self, lines):
+        '''
+            Parse the given triples (see lineRange), and fill the linear
+            program.
+        '''
+        number = self.number
+        objective = 'MINIMIZE'
+        objectiveRow = None
+        rowTypes = {}     # name -> type of the row
+        rowLines = {}     # name -> line number of its declaration
+        rows = {}         # name -> {variable: factor}
+        rightHandSides = {}
+        ranges = {}
+        bounds = {}       # variable -> [lower bound, upper bound, whether the lower bound is given]
+        columns = {}
+        ignoredRows = set()
+        rhsName, rangesName, boundsName = None, None, None
+        mode = None
+        for lineno, header, line in lines:
+            if header:
+                fields = line.split()
+                mode = fields[0]
+                if mode == self.OBJSENSE and len(fields) > 1:
+                    objective = self.objectiveSense(fields[1], lineno)
+                    mode = None
+                elif mode == self.ENDATA:
+                    break
+                elif mode != self.NAME and len(fields) > 1:
+                    raise Exception('Syntax error at line %s.' % lineno)
+                continue
+            fields = line.split() if mode == self.OBJSENSE else self.fields(line)
+            if self.fixed and mode in (self.COLUMNS, self.RHS, self.RANGES):
+                if fields and fields[0]:
+                    raise Exception('Syntax error at line %s.' % lineno)
+                fields = fields[1:]
+            if mode == self.OBJSENSE:
+                if len(fields) != 1:
+                    raise Exception('Syntax error at line %s.' % lineno)
+                objective = self.objectiveSense(fields[0], lineno)
+            elif mode == self.ROWS:
+                if len(fields) != 2 or not fields[0] in self.ROW_TYPES or fields[1] in rowTypes:
+                    raise Exception('Syntax error at line %s.' % lineno)
+                rowType, name = fields
+                if rowType == 'N':
+                    if objectiveRow is not None:
+                        ignoredRows.add(name)
+                        continue
+                    objectiveRow = name
+                rowTypes[name] = rowType
+                rowLines[name] = lineno
+                rows[name] = {}
+            elif mode == self.COLUMNS:
+                if len(fields) > 1 and fields[1] == self.MARKER:
+                    continue
+                if len(fields) not in (3, 5):
+                    raise Exception('Syntax error at line %s.' % lineno)
+                var = fields[0]
+                columns[var] = None
+                for row, value in zip(fields[1::2], fields[2::2]):
+                    if row in ignoredRows:
+                        continue
+                    if not row in rows:
+                        raise Exception('Error at line %s: unknown row %s.' % (lineno, row))
+                    literals = rows[row]
+                    if var in literals:
+                        literals[var] += number(value, lineno)
+                    else:
+                        literals[var] = number(value, lineno)
+            elif mode == self.RHS or mode == self.RANGES:
+                if self.fixed or len(fields) % 2 == 1:
+                    setName, fields = fields[0], fields[1:]
+                else:
+                    setName = ''
+                if len(fields) not in (2, 4):
+                    raise Exception('Syntax error at line %s.' % lineno)
+                if mode == self.RHS:
+                    rhsName = setName if rhsName is None else rhsName
+                    if setName != rhsName:
+                        continue
+                    values = rightHandSides
+                else:
+                    rangesName = setName if rangesName is None else rangesName
+                    if setName != rangesName:
+                        continue
+                    values = ranges
+                for row, value in zip(fields[0::2], fields[1::2]):
+                    if row in ignoredRows:
+                        continue
+                    if not row in rows or mode == self.RANGES and row == objectiveRow:
+                        raise Exception('Error at line %s: unknown row %s.' % (lineno, row))
+                    values[row] = number(value, lineno)
+            elif mode == self.BOUNDS:
+                if not fields or not fields[0] in self.BOUND_TYPES:
+                    raise Exception('Syntax error at line %s.' % lineno)
+                boundType = fields[0]
+                nbFields = 3 if boundType in self.VALUELESS_BOUND_TYPES else 4
+                if self.fixed:
+                    fields = fields + [''] * (nbFields-len(fields))
+                elif len(fields) == nbFields-1:
+                    fields = [boundType, ''] + fields[1:]
+                if len(fields) < nbFields or len(fields) > 4:
+                    raise Exception('Syntax error at line %s.' % lineno)
+                setName, var = fields[1], fields[2]
+                boundsName = setName if boundsName is None else boundsName
+                if setName != boundsName:
+                    continue
+                columns[var] = None
+                value = number(fields[3], lineno) if nbFields == 4 else None
+                self.setBound(bounds.setdefault(var, [0, None, False]), boundType, value)
+            else:
+                raise Exception('Syntax error at line %s.' % lineno)
+        if objectiveRow is None:
+            raise Exception('Error: no objective row.')
+        lp = self.linearProgram
+        for var in columns:
+            lp.variables[var] = Variable(var)
+        lp.objective = objective
+        lp.objectiveFunction = Expression(None, None, [Literal(factor, var) for var, factor in rows.pop(objectiveRow).items()],
+                -rightHandSides.get(objectiveRow, 0))
+        for row, literals in rows.items():
+            rhs = rightHandSides.get(row, 0)
+            leftBound, rightBound = self.rowBounds(rowTypes[row], rhs, ranges.get(row))
+            lp.subjectTo.append((Expression(leftBound, rightBound, [Literal(factor, var) for var, factor in literals.items()]), rowLines[row]))
+        for var in columns:
+            lower, upper = bounds.get(var, (0, None, False))[:2]
+            if lower is not None or upper is not None:
+                lp.bounds.append(Expression(lower, upper, [Literal(1, var)]))
+
+    def objectiveSense(self, sense, lineno):
+        '''
+            Return the objective of the linear program given by an OBJSENSE
+            section.
+        '''
+        if sense in ('MIN', 'MINIMIZE'):
+            return 'MINIMIZE'
+        if sense in ('MAX', 'MAXIMIZE'):
+            return 'MAXIMIZE'
+        raise Exception('Syntax error at line %s.' % lineno)
+
+    def setBound(self, bound, boundType, value):
+        '''
+            Update the given bound [lower, upper, whether the lower bound is
+            given] of a variable with a line of the BOUNDS section. The values
+            beyond INFINITY are infinite. Following the usual convention, a
+            negative upper bound makes the variable unbounded below, unless its
+            lower bound is given.
+        '''
+        infinite = value is not None and abs(value) >= self.INFINITY
+        if boundType in ('UP', 'UI'):
+            bound[1] = None if infinite else value
+            if not infinite and value < 0 and not bound[2]:
+                bound[0] = None
+        elif boundType in ('LO', 'LI'):
+            bound[0], bound[2] = (None if infinite else value), True
+        elif boundType == 'FX':
+            bound[0], bound[1], bound[2] = value, value, True
+        elif boundType == 'FR':
+            bound[0], bound[1], bound[2] = None, None, True
+        elif boundType == 'MI':
+            bound[0], bound[2] = None, True
+        elif boundType == 'PL':
+            bound[1] = None
+        else:
+            bound[0], bound[1], bound[2] = 0, 1, True
+
+    @staticmethod
+    def rowBounds(rowType, rhs, rangeValue):
+        '''
+            Return the left and right bounds of a row of the given type, right
+            hand side and range (or None).
+        '''
+        if rowType == 'L':
+            return (None if rangeValue is None else rhs-abs(rangeValue)), rhs
+        if rowType == 'G':
+            return rhs, (None if rangeValue is None else rhs+abs(rangeValue))
+        if rangeValue is None:
+            return rhs, rhs
+        if rangeValue > 0:
+            return rhs, rhs+rangeValue
+        return rhs+rangeValue, rhs
+
+@lru_cache(maxsize=4096)
+def numberToString(number):
+    '''
+        Return a decimal representation of the given number. It is exact when
+        the denominator of the number only has the prime factors 2 and 5,
+        otherwise it has 17 significant digits.
+    '''
+    number = Fraction(number)
+    denominator, exponent = number.denominator, 0
+    for factor in (2, 5):
+        while denominator % factor == 0:
+            denominator //= factor
+            exponent += 1
+    if denominator != 1:
+        return repr(float(number))
+    if number.denominator == 1:
+        return str(number.numerator)
+    digits = number.numerator * 10**exponent // number.denominator
+    sign = '-' if digits < 0 else ''
+    digits = str(abs(digits)).rjust(exponent+1, '0')
+    return ('%s%s.%s' % (sign, digits[:-exponent], digits[-exponent:])).rstrip('0')
+
+class MPSWriter:
+    '''
+        A class to write a linear program in the MPS format, free (the default)
+        or fixed. The linear program is written as it was given, before its
+        normalization. The rows are named R0, R1, ... in the order of the
+        constraints, and the objective row is named OBJ.
+        The factors which are not decimals (e.g. 1/3) cannot be written exactly:
+        they are rounded to 17 significant digits, or to the 12 characters of a
+        field in the fixed format, thus the program read back from the file may
+        slightly differ from the original one.
+    '''
+    OBJECTIVE_ROW = 'OBJ'
+    SET_NAME = 'SET'
+
+    def __init__(self, linearProgram, fileName, fixed=False, name=None):
+        self.linearProgram = linearProgram
+        self.fileName = fileName
+        self.fixed = fixed
+        self.name = name
+
+    def line(self, *fields):
+        '''
+            Return a data line made of the given fields: the first one is the
+            type (of a row or a bound), possibly empty.
+        '''
+        if not self.fixed:
+            return ' %s\n' % ' '.join(fields).lstrip()
+        line = ''
+        for (start, end), field in zip(MPSParser.FIXED_FIELDS, fields):
+            if len(field) > end-start:
+                raise Exception('Error: the field %s is too long for the fixed MPS format.' % field)
+            line = line.ljust(start) + field
+        return line + '\n'
+
+    def number(self, value):
+        '''
+            Return the representation of the given number (see numberToString),
+            rounded to fit in a field of the fixed format.
+        '''
+        string = numberToString(value)
+        precision = 12
+        while self.fixed and len(string) > 12:
+            string = '%.*g' % (precision, value)
+            precision -= 1
+        return string
+
+    def write(self):
+        '''
+            Write the linear program in the file.
+        '''
+        lp = self.linearProgram
+        if lp.original is not None:
+            lp = lp.original
+        rowNames = ['R%d' % i for i in range(len(lp.subjectTo))]
+        columns = {var: [] for var in sorted(lp.variables)}
+        for lit in lp.objectiveFunction.literalList:
+            columns[lit.variable].append((self.OBJECTIVE_ROW, lit.factor))
+        for name, expr in zip(rowNames, lp.subjectTo):
+            for lit in expr.literalList:
+                columns[lit.variable].append((name, lit.factor))
+        bounds = {}
+        for expr in lp.bounds:
+            lower, upper = bounds.get(expr.literalList[0].variable, (None, None))
+            if expr.leftBound is not None and (lower is None or expr.leftBound > lower):
+                lower = expr.leftBound
+            if expr.rightBound is not None and (upper is None or expr.rightBound < upper):
+                upper = expr.rightBound
+            bounds[expr.literalList[0].variable] = lower, upper
+        line, number = self.line, self.number
+        with open(self.fileName, 'w') as f:
+            f.write('NAME%s\n' % ('' if self.name is None else ' '*10 + self.name))
+            if lp.objective == 'MAXIMIZE':
+                f.write('OBJSENSE\n%s' % line('', 'MAX'))
+            f.write('ROWS\n')
+            f.write(line('N', self.OBJECTIVE_ROW))
+            for name, expr in zip(rowNames, lp.subjectTo):
+                rowType = 'E' if expr.isEquality() else ('L' if expr.rightBound is not None else 'G')
+                f.write(line(rowType, name))
+            f.write('COLUMNS\n')
+            for var, entries in columns.items():
+                if not entries:
+                    entries = [(self.OBJECTIVE_ROW, 0)]
+                for row, factor in entries:
+                    f.write(line('', var, row, number(factor)))
+            f.write('RHS\n')
+            if lp.objectiveFunction.constantTerm != 0:
+                f.write(line('', self.SET_NAME, self.OBJECTIVE_ROW, number(-lp.objectiveFunction.constantTerm)))
+            ranges = []
+            for name, expr in zip(rowNames, lp.subjectTo):
+                bound = expr.rightBound if expr.rightBound is not None else expr.leftBound
+                if bound - expr.constantTerm != 0:
+                    f.write(line('', self.SET_NAME, name, number(bound - expr.constantTerm)))
+                if expr.leftBound is not None and expr.rightBound is not None and not expr.isEquality():
+                    ranges.append((name, expr.rightBound - expr.leftBound))
+            if ranges:
+                f.write('RANGES\n')
+                for name, value in ranges:
+                    f.write(line('', self.SET_NAME, name, number(value)))
+            f.write('BOUNDS\n')
+            for var in columns:
+                lower, upper = bounds.get(var, (None, None))
+                if lower is not None and lower == upper:
+                    f.write(line('FX', self.SET_NAME, var, number(lower)))
+                    continue
+                if lower is None and upper is None:
+                    f.write(line('FR', self.SET_NAME, var))
+                    continue
+                if lower is None:
+                    f.write(line('MI', self.SET_NAME, var))
+                elif lower != 0 or upper is not None and upper < 0:
+                    f.write(line('LO', self.SET_NAME, var, number(lower)))
+                if upper is not None:
+                    f.write(line('UP', self.SET_NAME, var, number(upper)))
+            f.write('ENDATA\n')
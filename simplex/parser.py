@@ -1,29 +1,36 @@
+import gc
+import os
 import re
+import mmap
+import multiprocessing
 from fractions import Fraction
+from functools import lru_cache
 from .linearProgram import Literal, Expression, Variable, LinearProgram
 from .array import Array
 
 class Parser:
     '''
         A class to parse a linear program.
+        Each line is split into tokens by a single compiled regular expression:
+        a comparison, a literal (an optional sign and factor, and a variable),
+        a constant (a signed number), or any other character, which is a syntax
+        error. Thus, each character is consumed by exactly one token.
+        The lines of a section (except the objective) are independent, thus a
+        large file can be parsed by several processes (see parallelParse).
     '''
-    SPACES_REGEXP = re.compile('\s')
     OBJECTIVE = ['MINIMIZE', 'MAXIMIZE']
     SUBJECT_TO = 'SUBJECTTO'
     BOUNDS = 'BOUNDS'
     VARIABLES = 'VARIABLES'
+    HEADERS = frozenset([SUBJECT_TO, BOUNDS, VARIABLES] + OBJECTIVE)
+    HEADER_REGEXP = re.compile(rb'(?m)^[ \t\r\f\v]*(' + b'|'.join(rb'[ \t\r\f\v]*'.join(bytes([c]) for c in header.encode())
+        for header in sorted(HEADERS)) + rb')[ \t\r\f\v]*(?://.*)?$')
     VAR = '[a-zA-Z][a-zA-Z0-9_]*'
-    VAR_REGEXP = re.compile(VAR)
-    NUMBER = '([\+-][ ]*)?(\d+[/.]\d+|\d+)?'
-    NUMBER_REGEXP = re.compile(NUMBER)
-    LIT = '(?P<factor>%s)( )*(?P<variable>%s)' % (NUMBER, VAR)
-    LIT_REGEXP = re.compile(LIT)
+    NUMBER = r'\d+(?:[/.]\d+)?'
+    TOKEN_REGEXP = re.compile(r'(<=|>=|=)|([+-]?)(%s)?(%s)|([+-]?%s)|(.)' % (NUMBER, VAR, NUMBER))
     LESS = '<='
     GREATER = '>='
     EQUAL = '='
-    COMP_REGEXP = re.compile('%s|%s' % (LESS, GREATER))
-    EQ_REGEXP = re.compile('%s' % EQUAL)
-    COMP_EQ_REGEXP = re.compile('%s|%s|%s' % (LESS, GREATER, EQUAL))
     COMMENT = '//'
 
     def __init__(self, linearProgram, fileName):
@@ -35,64 +42,93 @@ class Parser:
         '''
             Return a string without comments and spaces.
         '''
-        return cls.SPACES_REGEXP.sub('', string.split('//')[0])
+        return ''.join(string.partition(cls.COMMENT)[0].split())
 
     def lineRange(self):
         '''
             Range over all the lines of the file. Yield the line number, and the
             line itself.
         '''
-        lineno = 0
+        removeComment = self.removeComment
         with open(self.fileName) as f:
-            for line in f:
-                lineno+=1
-                content = self.removeComment(line)
-                if content != "":
+            for lineno, line in enumerate(f, 1):
+                content = removeComment(line)
+                if content:
                     yield (lineno, content)
+
     @staticmethod
+    @lru_cache(maxsize=4096)
     def stringToNumber(n):
         '''
-            Convert a string into a fraction.
+            Convert a string (a signed integer, decimal or fraction, or only a
+            sign) into a fraction. The integers and the decimals do not go
+            through the parsing of Fraction.
         '''
-        if n in {'+', ''}:
-            return Fraction(1)
-        elif n == '-':
-            return Fraction(-1)
-        else:
-            return Fraction(n)
+        sign = -1 if n.startswith('-') else 1
+        n = n.lstrip('+-')
+        if not n:
+            return Fraction(sign)
+        if n.isdigit():
+            return Fraction(sign*int(n))
+        integer, point, decimals = n.partition('.')
+        if point:
+            return Fraction(sign*int(integer + decimals), 10**len(decimals))
+        numerator, denominator = n.split('/')
+        return Fraction(sign*int(numerator), int(denominator))
 
     @classmethod
-    def stringToNumberCheck(cls, n, lineno):
+    def tokenize(cls, line, lineno=None):
+        '''
+            Split the given string into parts separated by the comparisons.
+            Return the list of the comparisons, and the list of the parts, each
+            one being either a list of literals or a single constant.
+        '''
+        stringToNumber = cls.stringToNumber
+        part = []
+        comparisons, parts = [], [part]
+        literal = False # whether the last token of the part is a literal
+        for comparison, sign, factor, variable, constant, error in cls.TOKEN_REGEXP.findall(line):
+            if variable and (not part or sign and literal):
+                part.append(Literal(stringToNumber(sign + factor), variable))
+                literal = True
+            elif comparison:
+                comparisons.append(comparison)
+                part, literal = [], False
+                parts.append(part)
+            elif constant and not part:
+                part.append(stringToNumber(constant))
+            else:
+                raise Exception('Syntax error at line %s.' % lineno)
+        return comparisons, parts
+
+    @staticmethod
+    def literalPart(part, lineno):
+        '''
+            Return the given part, after checking that it is a non-empty list of
+            literals.
+        '''
+        if not part or not isinstance(part[0], Literal):
+            raise Exception('Syntax error at line %s.' % lineno)
+        return part
+
+    @staticmethod
+    def constantPart(part, lineno):
         '''
-            Check the integrity of the string and return its conversion into a fraction.
+            Return the constant of the given part.
         '''
-        m = cls.NUMBER_REGEXP.match(n)
-        if m is None or m.end() != len(n):
+        if len(part) != 1 or isinstance(part[0], Literal):
             raise Exception('Syntax error at line %s.' % lineno)
-        return cls.stringToNumber(n)
+        return part[0]
 
     @classmethod
     def parseLiteralList(cls, line, lineno=None):
         '''
             Return the list of literals represented by the given string.
         '''
-        old = None
-        litList = []
-        for lit in cls.LIT_REGEXP.finditer(line):
-            if old is None:
-                if lit.start() != 0:
-                    raise Exception('Syntax error at line %s.' % lineno)
-            else:
-                if lit.start() != old:
-                    raise Exception('Syntax error at line %s.' % lineno)
-            old = lit.end()
-            litList.append(Literal(
-                cls.stringToNumber(lit.group('factor')),
-                lit.group('variable')
-            ))
-        if old != len(line):
+        comparisons, parts = cls.tokenize(line, lineno)
+        if comparisons:
             raise Exception('Syntax error at line %s.' % lineno)
-        return litList
+        return cls.literalPart(parts[0], lineno)
 
     @classmethod
     def parseLine(cls, line, lineno=None):
@@ -100,69 +136,191 @@ class Parser:
             Return the expression represented by the given line.
         '''
         expr = Expression()
-        compList = list(cls.COMP_REGEXP.finditer(line))
-        start, end = 0, len(line)
-        if len(compList) > 2:
+        comparisons, parts = cls.tokenize(line, lineno)
+        if len(comparisons) > 2:
             raise Exception('Syntax error at line %s.' % lineno)
-        elif len(compList) == 2:
-            start = compList[0].end()
-            end = compList[1].start()
-            if compList[0].group() != compList[1].group():
+        elif len(comparisons) == 2:
+            if comparisons[0] != comparisons[1] or comparisons[0] == cls.EQUAL:
                 raise Exception('Syntax error at line %s.' % lineno)
+            if comparisons[0] == cls.LESS:
+                expr.leftBound = cls.constantPart(parts[0], lineno)
+                expr.rightBound = cls.constantPart(parts[2], lineno)
             else:
-                if compList[0].group() == cls.LESS:
-                    expr.leftBound = cls.stringToNumberCheck(line[:compList[0].start()], lineno)
-                    expr.rightBound = cls.stringToNumberCheck(line[compList[1].end():], lineno)
-                else:
-                    expr.rightBound = cls.stringToNumberCheck(line[:compList[0].start()], lineno)
-                    expr.leftBound = cls.stringToNumberCheck(line[compList[1].end():], lineno)
-        elif len(compList) == 1:
-            end = compList[0].start()
-            if compList[0].group() == cls.LESS:
-                expr.rightBound = cls.stringToNumberCheck(line[compList[0].end():], lineno)
-            else:
-                expr.leftBound = cls.stringToNumberCheck(line[compList[0].end():], lineno)
-        else:
-            eqList = list(cls.EQ_REGEXP.finditer(line))
-            if len(eqList) > 1:
-                raise Exception('Syntax error at line %s.' % lineno)
-            elif len(eqList) == 1:
-                end = eqList[0].start()
-                expr.rightBound = cls.stringToNumberCheck(line[eqList[0].end():], lineno)
-                expr.leftBound = expr.rightBound
-        expr.literalList = cls.parseLiteralList(line[start:end], lineno)
+                expr.rightBound = cls.constantPart(parts[0], lineno)
+                expr.leftBound = cls.constantPart(parts[2], lineno)
+            expr.literalList = cls.literalPart(parts[1], lineno)
+            return expr
+        elif len(comparisons) == 1:
+            bound = cls.constantPart(parts[1], lineno)
+            if comparisons[0] != cls.GREATER:
+                expr.rightBound = bound
+            if comparisons[0] != cls.LESS:
+                expr.leftBound = bound
+        expr.literalList = cls.literalPart(parts[0], lineno)
         return expr
 
-    def parse(self):
+    def parseLines(self, lines, mode=None):
         '''
-            Return the linear program represented by the file.
+            Parse the given pairs of a line number and a line (see lineRange),
+            the current section being mode, and add them to the linear program.
+            Return the section at the end of the lines.
         '''
-        mode = None
-        for (lineno, content) in self.lineRange():
-            if content in [self.VARIABLES, self.SUBJECT_TO, self.BOUNDS]+[x for x in self.OBJECTIVE]:
+        for (lineno, content) in lines:
+            if content in self.HEADERS:
                 mode = content
             else:
                 expr = self.parseLine(content, lineno)
+                bounded = expr.leftBound is not None or expr.rightBound is not None
                 if mode == self.VARIABLES:
-                    if ((expr.leftBound, expr.rightBound) != (None, None) or
-                            len(expr.literalList) != 1 or
-                            expr.literalList[0].factor != 1):
+                    if bounded or len(expr.literalList) != 1 or expr.literalList[0].factor != 1:
                         raise Exception('Syntax error at line %s.' % lineno)
                     else:
                         var = expr.literalList[0].variable
                         self.linearProgram.variables[var] = Variable(expr.literalList[0].variable)
                 elif mode in self.OBJECTIVE:
-                    if (expr.leftBound, expr.rightBound) != (None, None) or len(expr.literalList) == 0:
+                    if bounded:
                         raise Exception('Syntax error at line %s.' % lineno)
                     self.linearProgram.objective = mode
                     self.linearProgram.objectiveFunction = (expr, lineno)
                     mode = None
                 elif mode == self.SUBJECT_TO:
-                    if (expr.leftBound, expr.rightBound) == (None, None) or len(expr.literalList) == 0:
+                    if not bounded:
                         raise Exception('Syntax error at line %s.' % lineno)
                     self.linearProgram.subjectTo.append((expr, lineno))
                 else:
-                    if (expr.leftBound, expr.rightBound) == (None, None) or len(expr.literalList) != 1 or expr.literalList[0].factor != 1:
+                    if not bounded or len(expr.literalList) != 1 or expr.literalList[0].factor != 1:
                         raise Exception('Syntax error at line %s.' % lineno)
                     self.linearProgram.bounds.append((expr, lineno))
+        return mode
+
+    def chunks(self, nbChunks):
+        '''
+            Split the file into about nbChunks chunks made of whole lines, and
+            return them as lists [start, end, section], the offsets being in
+            bytes. The chunks do not cross the section headers, and the
+            objective section is never split, since only its first line is the
+            objective function.
+        '''
+        with open(self.fileName, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            sections = []
+            position, mode = 0, None
+            for match in self.HEADER_REGEXP.finditer(data):
+                sections.append((position, match.start(), mode))
+                position, mode = match.end(), b''.join(match.group(1).split()).decode()
+            sections.append((position, size, mode))
+            chunkSize = max(1, size//nbChunks)
+            chunks = []
+            for start, end, mode in sections:
+                while start < end:
+                    stop = data.find(b'\n', start + chunkSize, end)
+                    stop = end if stop < 0 or mode in self.OBJECTIVE else stop + 1
+                    chunks.append([start, stop, mode])
+                    start = stop
+        return chunks
+
+    @staticmethod
+    def encodeExpression(pair):
+        '''
+            Return the given pair of an expression and its line number as a
+            tuple of strings and integers, which is much faster to send to
+            another process than the objects.
+        '''
+        expr, lineno = pair
+        bounds = tuple(None if bound is None else str(bound) for bound in (expr.leftBound, expr.rightBound))
+        return (lineno,) + bounds + (tuple(str(lit.factor) for lit in expr.literalList), tuple(lit.variable for lit in expr.literalList))
+
+    @classmethod
+    def decodeExpression(cls, encoded):
+        '''
+            Return the pair of an expression and its line number encoded by
+            encodeExpression. Since the same factors often come back, most of
+            them are already converted by stringToNumber.
+        '''
+        lineno, leftBound, rightBound, factors, variables = encoded
+        stringToNumber = cls.stringToNumber
+        expr = Expression(None if leftBound is None else stringToNumber(leftBound),
+                None if rightBound is None else stringToNumber(rightBound),
+                [Literal(stringToNumber(factor), var) for factor, var in zip(factors, variables)])
+        return expr, lineno
+
+    def parallelParse(self, nbProcesses):
+        '''
+            Parse the file with a pool of nbProcesses processes: the file is
+            split into chunks (see chunks), the lines of each chunk are counted
+            then parsed by the pool, and the results are merged in the order of
+            the file. The line numbers of the errors are the ones of the file,
+            and the first error of the file is raised.
+        '''
+        chunks = self.chunks(4*nbProcesses)
+        with multiprocessing.Pool(nbProcesses) as pool:
+            lineno = 1
+            for chunk, nbLines in zip(chunks, pool.map(countLines, [(self.fileName, start, end) for start, end, mode in chunks])):
+                chunk.append(lineno)
+                lineno += nbLines
+            results = pool.map(parseChunk, [(self.fileName, start, end, mode, lineno) for start, end, mode, lineno in chunks])
+        lp = self.linearProgram
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+            variables, objective, objectiveFunction, subjectTo, bounds = result
+            for var in variables:
+                lp.variables[var] = Variable(var)
+            if objective is not None:
+                lp.objective, lp.objectiveFunction = objective, self.decodeExpression(objectiveFunction)
+            lp.subjectTo.extend(map(self.decodeExpression, subjectTo))
+            lp.bounds.extend(map(self.decodeExpression, bounds))
+
+    def parse(self, nbProcesses=1):
+        '''
+            Return the linear program represented by the file, parsed by
+            nbProcesses processes. The garbage collector is paused meanwhile:
+            the parsing only creates objects without cycles, and the
+            collections triggered by the growth of the linear program took a
+            large part of the time.
+        '''
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            if nbProcesses > 1 and os.path.getsize(self.fileName) > 0:
+                self.parallelParse(nbProcesses)
+            else:
+                self.parseLines(self.lineRange())
+        finally:
+            if gcEnabled:
+                gc.enable()
         self.linearProgram.check()
+
+def readChunk(fileName, start, end):
+    '''
+        Return the bytes of the file between the given offsets.
+    '''
+    with open(fileName, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return data[start:end]
+
+def countLines(chunk):
+    '''
+        Return the number of line breaks in the given chunk (fileName, start, end).
+    '''
+    return readChunk(*chunk).count(b'\n')
+
+def parseChunk(chunk):
+    '''
+        Parse the given chunk (fileName, start, end, section, line number of
+        its first line) in a new linear program, and return the names of its
+        variables, its objective, and its objective function, constraints and
+        bounds (see encodeExpression), or the syntax error. The error is
+        returned instead of raised, so that the pool is not terminated while it
+        still has tasks.
+    '''
+    fileName, start, end, mode, lineno = chunk
+    parser = Parser(LinearProgram(), fileName)
+    lines = (parser.removeComment(line) for line in readChunk(fileName, start, end).decode().split('\n'))
+    try:
+        parser.parseLines(((n, content) for n, content in enumerate(lines, lineno) if content), mode)
+    except Exception as error:
+        return error
+    lp = parser.linearProgram
+    objectiveFunction = None if lp.objectiveFunction is None else Parser.encodeExpression(lp.objectiveFunction)
+    return (list(lp.variables), lp.objective, objectiveFunction,
+            list(map(Parser.encodeExpression, lp.subjectTo)), list(map(Parser.encodeExpression, lp.bounds)))
@@ -0,0 +1,200 @@
+from .array import nonZeroItems, ObjectiveLine
+
+def barredColumns(simplex):
+    '''
+        Return the set of the columns which cannot enter the basis: the
+        artificial variables whose columns are kept, once the first phase is
+        over (see Simplex.keepArtificialColumns).
+    '''
+    if simplex.firstPhase or not simplex.keepArtificialColumns:
+        return set()
+    return simplex.artificialVariables
+
+def negativeColumns(simplex):
+    '''
+        Return the sorted list of the columns having a negative element in the
+        objective line (i.e. the candidate entering variables), except the
+        barred ones (see barredColumns).
+    '''
+    line = simplex.tableaux[0]
+    last = len(line)-1
+    barred = barredColumns(simplex)
+    return sorted(j for j, x in nonZeroItems(line) if j < last and x < -simplex.epsilon and not j in barred)
+
+class PivotRule:
+    '''
+        A strategy to choose the entering and leaving variables of the pivots
+        performed by the Simplex class.
+    '''
+
+    def initialize(self, simplex):
+        '''
+            Called at the beginning of each run of the simplex.
+        '''
+        pass
+
+    def chooseColumn(self, simplex):
+        '''
+            Return the entering variable, or None if the current solution is optimal.
+        '''
+        raise NotImplementedError
+
+    def chooseRow(self, simplex, column):
+        '''
+            Return the row of the leaving variable, given the entering variable.
+        '''
+        return simplex.ratioTest(column)
+
+    def update(self, simplex, row, column):
+        '''
+            Called just before performing the pivot on the given row and column.
+        '''
+        pass
+
+class DantzigRule(PivotRule):
+    '''
+        Enter the variable with the most negative reduced cost. If it is a
+        barred one (see barredColumns), the heap of an ObjectiveLine is explored
+        further, the other lines are scanned.
+    '''
+
+    def chooseColumn(self, simplex):
+        if len(simplex.tableaux[0]) == 1:
+            return None
+        column = simplex.tableaux[0].argmin(0, -1)
+        barred = barredColumns(simplex)
+        if column in barred:
+            line = simplex.tableaux[0]
+            if not isinstance(line, ObjectiveLine):
+                return min(negativeColumns(simplex), key = lambda j: (line[j], j), default=None)
+            top = line.heap.top(barred)
+            if top is None:
+                return None
+            column = top[1]
+        if column == len(simplex.tableaux[0]) -1 or simplex.tableaux[0][column] >= -simplex.epsilon:
+            return None
+        return column
+
+class BlandRule(PivotRule):
+    '''
+        Enter the variable of smallest index having a negative reduced cost, and
+        break the ties of the ratio test with the smallest leaving variable.
+        This rule never cycles.
+    '''
+
+    def chooseColumn(self, simplex):
+        candidates = negativeColumns(simplex)
+        return candidates[0] if candidates else None
+
+    def chooseRow(self, simplex, column):
+        return simplex.ratioTest(column, lambda row: simplex.basicVariables[row])
+
+class DevexRule(PivotRule):
+    '''
+        Enter the variable maximizing d_j^2/w_j, where d_j is its reduced cost and
+        w_j is an approximation of the norm of its edge, measured in the
+        reference framework made of the non-basic variables at the beginning of
+        the run.
+    '''
+
+    def initialize(self, simplex):
+        self.weights = {}
+
+    def chooseColumn(self, simplex):
+        line = simplex.tableaux[0]
+        candidates = negativeColumns(simplex)
+        if not candidates:
+            return None
+        return max(candidates, key = lambda j: (float(line[j])**2/self.weights.get(j, 1), -j))
+
+    def update(self, simplex, row, column):
+        pivotLine = simplex.tableaux[row]
+        pivot = float(pivotLine[column])
+        weight = self.weights.get(column, 1)
+        last = len(pivotLine)-1
+        for j, x in nonZeroItems(pivotLine):
+            if j != column and j < last:
+                self.weights[j] = max(self.weights.get(j, 1), (float(x)/pivot)**2*weight)
+        self.weights[simplex.basicVariables[row]] = max(weight/pivot**2, 1)
+        self.weights.pop(column, None)
+
+class SteepestEdgeRule(PivotRule):
+    '''
+        Enter the variable maximizing d_j^2/w_j, where d_j is its reduced cost and
+        w_j = 1 + ||column j||^2 is the squared norm of its edge.
+        The weights are computed from the tableaux at the beginning of each run
+        (i.e. of each phase), which costs one pass over the non-zeros, then they
+        are updated after each pivot with the recurrence of Goldfarb and Reid,
+        which only visits the rows having a non-zero element in the entering
+        column, like the pivot.
+    '''
+
+    def initialize(self, simplex):
+        last = len(simplex.tableaux[0])-1
+        basic = set(simplex.basicVariables)
+        self.weights = {j: 1.0 for j in range(last) if not j in basic}
+        for r in range(1, len(simplex.tableaux)):
+            for j, x in nonZeroItems(simplex.tableaux[r]):
+                if j in self.weights:
+                    self.weights[j] += float(x)**2
+
+    def chooseColumn(self, simplex):
+        line = simplex.tableaux[0]
+        candidates = negativeColumns(simplex)
+        if not candidates:
+            return None
+        return max(candidates, key = lambda j: (float(line[j])**2/self.weights[j], -j))
+
+    def update(self, simplex, row, column):
+        pivotLine = simplex.tableaux[row]
+        pivot = float(pivotLine[column])
+        last = len(pivotLine)-1
+        ratios = {j: float(x)/pivot for j, x in nonZeroItems(pivotLine) if j != column and j < last and j in self.weights}
+        products = dict.fromkeys(ratios, 0.0)
+        for r in simplex.tableaux.nonZeroRows(column):
+            coeff = float(simplex.tableaux[r][column])
+            if not coeff:
+                continue
+            for j, x in nonZeroItems(simplex.tableaux[r]):
+                if j in products:
+                    products[j] += coeff*float(x)
+        weight = self.weights.pop(column)
+        for j, ratio in ratios.items():
+            self.weights[j] = max(self.weights[j] - 2*ratio*products[j] + ratio**2*weight, 1 + ratio**2)
+        self.weights[simplex.basicVariables[row]] = max(weight/pivot**2, 1.0)
+
+class PartialPricingRule(PivotRule):
+    '''
+        Only scan a block of blockSize columns, starting where the previous scan
+        stopped, and enter the variable with the most negative reduced cost of
+        the first block which has one.
+    '''
+
+    def __init__(self, blockSize = 50):
+        self.blockSize = blockSize
+
+    def initialize(self, simplex):
+        self.start = 0
+
+    def chooseColumn(self, simplex):
+        line = simplex.tableaux[0]
+        nbColumns = len(line)-1
+        barred = barredColumns(simplex)
+        scanned = 0
+        while scanned < nbColumns:
+            end = min(self.start+self.blockSize, nbColumns)
+            column = min((j for j in range(self.start, end) if not j in barred),
+                    key = lambda j: (line[j], j), default=None)
+            scanned += end-self.start
+            self.start = end % nbColumns
+            if column is not None and line[column] < -simplex.epsilon:
+                return column
+        return None
+
+PIVOT_RULES = {
+    'dantzig': DantzigRule,
+    'bland': BlandRule,
+    'devex': DevexRule,
+    'steepest': SteepestEdgeRule,
+    'partial': PartialPricingRule,
+}
@@ -0,0 +1,265 @@
+from fractions import Fraction
+from .simplex import Empty
+from .linearProgram import Literal, Expression
+
+class Presolve:
+    '''
+        Reduce a normalized linear program before the construction of the
+        tableaux: each variable is either free or non-negative (with an eventual
+        upper bound), and each constraint is an inequality a.x <= b or an
+        equality a.x = b.
+        The following reductions are repeated until none applies:
+            - empty rows are removed (or the program is empty),
+            - singleton rows are turned into bounds,
+            - rows which are always satisfied within the bounds are removed,
+            - duplicate rows are merged,
+            - the upper bounds implied by the rows are tightened,
+            - fixed variables are removed,
+            - dominated columns are fixed to one of their bounds, and removed.
+        The removed variables have a value of 0 after the transformations of
+        the normalization, postsolve puts them back in the solution.
+        At most maxPasses passes are done, since the tightening of the bounds
+        may converge slowly.
+    '''
+    maxPasses = 20
+
+    def __init__(self, linearProgram):
+        self.linearProgram = linearProgram
+        linearProgram.presolver = self
+        self.fixed = {}
+        self.upperBounds = {}
+        self.free = set(linearProgram.unconstrainedVariables())
+        self.nbRemovedRows = 0
+        self.nbRemovedColumns = 0
+        self.nbTightenedBounds = 0
+
+    @staticmethod
+    def coefficients(expr):
+        '''
+            Return the map from the variables of the expression to their
+            (non-zero) factors.
+        '''
+        coefficients = {}
+        for lit in expr.literalList:
+            coefficients[lit.variable] = coefficients.get(lit.variable, 0) + lit.factor
+        return {var: factor for var, factor in coefficients.items() if factor != 0}
+
+    def markBounded(self, variable):
+        '''
+            Record that the free variable is now non-negative.
+        '''
+        self.free.discard(variable)
+        self.linearProgram.bounds.append(Expression(0, None, [Literal(1, variable)]))
+
+    def setLower(self, variable, bound):
+        '''
+            Add the lower bound to the variable, which is translated so that it
+            stays non-negative. Return the translation.
+        '''
+        if variable in self.free:
+            self.linearProgram.translateVariable(variable, -bound)
+            self.markBounded(variable)
+            return bound
+        if bound <= 0:
+            return 0
+        self.linearProgram.translateVariable(variable, -bound)
+        if variable in self.upperBounds:
+            self.upperBounds[variable] -= bound
+            if self.upperBounds[variable] < 0:
+                raise Empty('Variable %s' % variable)
+        return bound
+
+    def setUpper(self, variable, bound):
+        '''
+            Add the upper bound to the variable. A free variable x is replaced
+            by bound-x, which is non-negative.
+        '''
+        if variable in self.free:
+            self.linearProgram.invertVariable(variable)
+            self.linearProgram.translateVariable(variable, bound)
+            self.markBounded(variable)
+            return
+        if bound < 0:
+            raise Empty('Variable %s' % variable)
+        if not variable in self.upperBounds or bound < self.upperBounds[variable]:
+            self.upperBounds[variable] = bound
+
+    def activity(self, coefficients, sign):
+        '''
+            Return the minimum (sign=1) or maximum (sign=-1) value of the sum of
+            the given coefficients multiplied by their variable, within the
+            bounds. Return None if it is infinite.
+        '''
+        total = 0
+        for var, factor in coefficients.items():
+            if sign*factor > 0:
+                if var in self.free:
+                    return None
+            else:
+                if not var in self.upperBounds:
+                    return None
+                total += factor*self.upperBounds[var]
+        return total
+
+    def reduceRow(self, expr):
+        '''
+            Apply the reductions of a single row. Return True if the row can be
+            removed.
+        '''
+        coefficients = self.coefficients(expr)
+        rightHandSide = expr.rightBound - expr.constantTerm
+        if not coefficients:
+            if rightHandSide < 0 or expr.isEquality() and rightHandSide != 0:
+                raise Empty('Empty row')
+            return True
+        if len(coefficients) == 1:
+            (var, factor), = coefficients.items()
+            bound = Fraction(rightHandSide)/factor
+            if expr.isEquality():
+                shift = self.setLower(var, bound)
+                self.setUpper(var, bound-shift)
+            elif factor > 0:
+                self.setUpper(var, bound)
+            else:
+                self.setLower(var, bound)
+            return True
+        minimum = self.activity(coefficients, 1)
+        maximum = self.activity(coefficients, -1)
+        if minimum is not None and minimum > rightHandSide:
+            raise Empty('Infeasible row')
+        if expr.isEquality():
+            if maximum is not None and maximum < rightHandSide:
+                raise Empty('Infeasible row')
+            return False
+        return maximum is not None and maximum <= rightHandSide
+
+    def removeDuplicateRows(self, rows):
+        '''
+            Merge the rows which are equal, up to a positive factor. Return the
+            remaining rows.
+        '''
+        groups = {}
+        for expr in rows:
+            coefficients = self.coefficients(expr)
+            scale = abs(coefficients[min(coefficients)])
+            key = tuple(sorted((var, factor/scale) for var, factor in coefficients.items()))
+            groups.setdefault(key, []).append((Fraction(expr.rightBound - expr.constantTerm)/scale, expr))
+        remaining = []
+        for group in groups.values():
+            equalities = [(rhs, expr) for rhs, expr in group if expr.isEquality()]
+            inequalities = [(rhs, expr) for rhs, expr in group if not expr.isEquality()]
+            if equalities:
+                rhs, expr = equalities[0]
+                if any(other != rhs for other, _ in equalities) or any(other < rhs for other, _ in inequalities):
+                    raise Empty('Incompatible rows')
+                remaining.append(expr)
+            else:
+                remaining.append(min(inequalities, key = lambda pair: pair[0])[1])
+        self.nbRemovedRows += len(rows)-len(remaining)
+        return remaining
+
+    def tightenBounds(self, rows):
+        '''
+            Tighten the upper bounds of the variables with the bounds implied by
+            the rows.
+        '''
+        for expr in rows:
+            coefficients = self.coefficients(expr)
+            rightHandSide = expr.rightBound - expr.constantTerm
+            parts = [(coefficients, rightHandSide)]
+            if expr.isEquality():
+                parts.append(({var: -factor for var, factor in coefficients.items()}, -rightHandSide))
+            for coefficients, rightHandSide in parts:
+                minimum = self.activity(coefficients, 1)
+                if minimum is None:
+                    continue
+                for var, factor in coefficients.items():
+                    if factor > 0 and var in self.upperBounds:
+                        bound = Fraction(rightHandSide - minimum)/factor
+                        if bound < self.upperBounds[var]:
+                            self.upperBounds[var] = bound
+                            self.nbTightenedBounds += 1
+
+    def dominatedColumns(self, rows):
+        '''
+            Return the map from the variables which can be fixed to one of their
+            bounds without changing the optimal value, to this bound.
+        '''
+        lp = self.linearProgram
+        objFactor = 1 if lp.objective == 'MINIMIZE' else -1
+        cost = {var: objFactor*factor for var, factor in self.coefficients(lp.objectiveFunction).items()}
+        signs = {}
+        for expr in rows:
+            for var, factor in self.coefficients(expr).items():
+                signs.setdefault(var, set()).add(0 if expr.isEquality() else (1 if factor > 0 else -1))
+        dominated = {}
+        for var in lp.variables:
+            c = cost.get(var, 0)
+            if not var in signs:
+                if c == 0:
+                    dominated[var] = 0
+                    continue
+            elif var in self.free or 0 in signs[var]:
+                continue
+            if c >= 0 and signs.get(var, {1}) == {1} and not var in self.free:
+                dominated[var] = 0
+            elif c <= 0 and signs.get(var, {-1}) == {-1} and var in self.upperBounds:
+                dominated[var] = self.upperBounds[var]
+        return dominated
+
+    def removeVariables(self, variables, rows):
+        '''
+            Remove the given variables (of value 0) from the linear program.
+        '''
+        lp = self.linearProgram
+        for var in variables:
+            self.fixed[var] = lp.variables.pop(var)
+            self.upperBounds.pop(var, None)
+            self.free.discard(var)
+        for expr in rows + [lp.objectiveFunction]:
+            expr.literalList = [lit for lit in expr.literalList if not lit.variable in variables]
+        self.nbRemovedColumns += len(variables)
+
+    def run(self):
+        '''
+            Apply the reductions until none applies, then write the remaining
+            rows and the upper bounds back in the linear program.
+        '''
+        lp = self.linearProgram
+        rows = list(lp.subjectTo)
+        for expr in lp.boundConstraints:
+            coefficients = self.coefficients(expr)
+            if len(coefficients) == 1 and min(coefficients.values()) > 0:
+                (var, factor), = coefficients.items()
+                self.setUpper(var, Fraction(expr.rightBound - expr.constantTerm)/factor)
+            else:
+                rows.append(expr)
+        changed, nbPasses = True, 0
+        while changed and nbPasses < self.maxPasses:
+            nbPasses += 1
+            nbRows, nbColumns, nbBounds = len(rows), len(lp.variables), self.nbTightenedBounds
+            rows = [expr for expr in rows if not self.reduceRow(expr)]
+            self.nbRemovedRows += nbRows-len(rows)
+            rows = self.removeDuplicateRows(rows)
+            self.tightenBounds(rows)
+            fixed = {var for var, bound in self.upperBounds.items() if bound == 0}
+            for var, bound in self.dominatedColumns(rows).items():
+                if bound != 0:
+                    lp.translateVariable(var, -bound)
+                fixed.add(var)
+            self.removeVariables(fixed, rows)
+            changed = (nbRows, nbColumns, nbBounds) != (len(rows), len(lp.variables), self.nbTightenedBounds)
+        lp.subjectTo = rows
+        lp.boundConstraints = [Expression(None, bound, [Literal(1, var)]) for var, bound in sorted(self.upperBounds.items())]
+        if lp.occurrences is not None:
+            lp.buildOccurrences()
+        return self
+
+    def postsolve(self, solution):
+        '''
+            Put back the removed variables in the given solution, and in the
+            linear program.
+        '''
+        for var, variable in self.fixed.items():
+            self.linearProgram.variables[var] = variable
+            solution[var] = Fraction(0)
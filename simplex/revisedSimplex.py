@@ -0,0 +1,220 @@
+from fractions import Fraction
+from .simplex import EndOfAlgorithm, Unbounded, Empty, latexWrap
+from .factorization import BasisFactorization
+from .array import nonZeroItems
+
+class RevisedSimplex:
+    '''
+        A class to run the revised simplex algorithm.
+        Only the original constraint matrix (stored by columns) and a
+        factorization of the basis are kept. The reduced costs and the column of
+        the entering variable are computed when needed.
+        It is built from the same tableaux as the Simplex class.
+        The basis is factorized again after refactorizationInterval pivots or,
+        if adaptiveRefactorization is set, as soon as the eta file becomes larger
+        than the factors.
+    '''
+    refactorizationInterval = 50
+    adaptiveRefactorization = True
+    supportsBounds = False
+    supportsFreeVariables = False
+    supportsEqualities = False
+    supportsWarmStart = False
+    supportsDualSimplex = False
+    supportsSensitivity = False
+
+    def __init__(self, tableaux = None, refactorizationInterval = None, adaptiveRefactorization = None):
+        if refactorizationInterval is not None:
+            self.refactorizationInterval = refactorizationInterval
+        if adaptiveRefactorization is not None:
+            self.adaptiveRefactorization = adaptiveRefactorization
+        self.columns = []
+        self.rightHandSide = {}
+        self.cost = {}
+        self.constant = 0
+        self.epsilon = getattr(tableaux, 'EPSILON', 0)
+        if not tableaux is None:
+            self.nbConstraints = len(tableaux) - 1
+            width = len(tableaux[0])
+            self.nbVariables = width - self.nbConstraints - 1
+            self.columns = [{} for j in range(width-1)]
+            for i in range(self.nbConstraints):
+                for j, value in nonZeroItems(tableaux[i+1]):
+                    if j == width-1:
+                        self.rightHandSide[i] = value
+                    else:
+                        self.columns[j][i] = value
+            for j, value in nonZeroItems(tableaux[0]):
+                if j == width-1:
+                    self.constant = value
+                else:
+                    self.cost[j] = value
+            self.basicVariables = [None]+list(range(self.nbVariables, self.nbVariables+self.nbConstraints))
+        else:
+            self.nbVariables = 0
+            self.nbConstraints = 0
+            self.basicVariables = [None]
+        self.objective = None
+        self.variableFromIndex = {}
+        self.indexFromVariable = {}
+        self.factorization = None
+        self.values = None
+        self.pivotColumn = None
+        self.nbPivots = 0
+
+    def __repr__(self):
+        return '\n'.join([
+            'nbConstraints: %d' % self.nbConstraints,
+            'nbVariables: %d' % self.nbVariables,
+            'basicVariables: %s' % self.basicVariables,
+            'values: %s' % self.values,
+        ])
+
+    def refactorize(self):
+        '''
+            Factorize the basis matrix, and recompute the values of the basic
+            variables from the right hand side.
+        '''
+        columns = [self.columns[j] for j in self.basicVariables[1:]]
+        if self.factorization is None:
+            self.factorization = BasisFactorization(columns, self.epsilon,
+                    self.refactorizationInterval, self.adaptiveRefactorization)
+        else:
+            self.factorization.factorize(columns)
+        values = self.factorization.ftran(self.rightHandSide)
+        self.values = [values.get(p, 0) for p in range(self.nbConstraints)]
+
+    def reducedCosts(self):
+        '''
+            Return the reduced costs of the non-basic variables.
+        '''
+        duals = self.factorization.btran({p: self.cost[j] for p, j in enumerate(self.basicVariables[1:]) if j in self.cost})
+        basic = set(self.basicVariables[1:])
+        return {j: self.cost.get(j, 0) - sum(duals[i]*value for i, value in column.items() if i in duals)
+                for j, column in enumerate(self.columns) if not j in basic}
+
+    def computeColumn(self, column):
+        '''
+            Return the column of the given variable in the current basis.
+        '''
+        if self.pivotColumn is None or self.pivotColumn[0] != column:
+            self.pivotColumn = column, self.factorization.ftran(self.columns[column])
+        return self.pivotColumn[1]
+
+    def choosePivot(self):
+        '''
+            Choose the entering and leaving variables.
+        '''
+        if self.factorization is None:
+            self.refactorize()
+        column, minCost = None, -self.epsilon
+        for j, cost in self.reducedCosts().items():
+            if cost < minCost:
+                column, minCost = j, cost
+        if column is None:
+            raise EndOfAlgorithm
+        alpha = self.computeColumn(column)
+        position = None
+        for p in sorted(alpha):
+            if alpha[p] > self.epsilon:
+                if position is None or self.values[p]/alpha[p] < self.values[position]/alpha[position]:
+                    position = p
+        if position is None:
+            raise Unbounded('Variable %d' % column)
+        return position+1, column
+
+    def performPivot(self, row, column, verbose = False, latex=None):
+        '''
+            Perform a pivot, given the entering and leaving variables.
+        '''
+        if verbose:
+            print('Entering variable: %s' % self.variableFromIndex[column])
+            print('Leaving variable: %s' % self.variableFromIndex[self.basicVariables[row]])
+        if latex:
+            latex.write('Entering variable: $%s$\n\n' % latexWrap(self.variableFromIndex[column]))
+            latex.write('Leaving variable: $%s$\n\n' % latexWrap(self.variableFromIndex[self.basicVariables[row]]))
+        if self.factorization is None:
+            self.refactorize()
+        alpha = self.computeColumn(column)
+        position = row-1
+        theta = self.values[position]/alpha[position]
+        for p, value in alpha.items():
+            self.values[p] -= theta*value
+        self.values[position] = theta
+        self.basicVariables[row] = column
+        self.nbPivots += 1
+        self.pivotColumn = None
+        self.factorization.update(position, alpha)
+        if self.factorization.needsFactorization():
+            self.refactorize()
+
+    def objectiveValue(self):
+        '''
+            Return the value of the objective function for the current basis.
+        '''
+        return self.constant - sum(self.cost[j]*self.values[p]
+                for p, j in enumerate(self.basicVariables[1:]) if j in self.cost)
+
+    def runSimplex(self, verbose = False, latex=None):
+        '''
+            Run the basic simplex (without first phase).
+        '''
+        while(True):
+            try:
+                row, column = self.choosePivot()
+            except EndOfAlgorithm:
+                break
+            self.performPivot(row, column, verbose, latex)
+        return self.objectiveValue()
+
+    def firstPhase(self, verbose = False, latex=None):
+        '''
+            Find a feasible basis, using an artificial variable appended after
+            all the other variables.
+        '''
+        if self.nbConstraints == 0:
+            return
+        position = min(range(self.nbConstraints), key = lambda p: (self.values[p], p))
+        if self.values[position] >= 0:
+            return
+        artificial = len(self.columns)
+        self.columns.append({i: Fraction(-1) for i in range(self.nbConstraints)})
+        self.variableFromIndex[artificial] = '_phase1_'
+        objective, constant = self.cost, self.constant
+        self.cost, self.constant = {artificial: Fraction(1)}, 0
+        self.performPivot(position+1, artificial, verbose, latex)
+        if abs(self.runSimplex(verbose, latex)) > self.epsilon:
+            raise Empty
+        if artificial in self.basicVariables:
+            position = self.basicVariables.index(artificial) - 1
+            line = self.factorization.btran({position: 1})
+            basic = set(self.basicVariables[1:])
+            for j in range(artificial):
+                if not j in basic and \
+                        abs(sum(line[i]*value for i, value in self.columns[j].items() if i in line)) > self.epsilon:
+                    self.performPivot(position+1, j)
+                    break
+        self.columns.pop()
+        self.variableFromIndex.pop(artificial)
+        self.cost, self.constant = objective, constant
+
+    def solve(self, verbose = False, latex=None):
+        '''
+            Perform the whole simplex algorithm, first phase included.
+        '''
+        self.refactorize()
+        if verbose:
+            print('\n\n# FIRST PHASE\n')
+        if latex:
+            latex.write('\\section*{First phase}\n\n')
+        self.firstPhase(verbose, latex)
+        if verbose:
+            print('\n\n# SECOND PHASE\n')
+        if latex:
+            latex.write('\\section*{Second phase}\n\n')
+        opt = self.runSimplex(verbose, latex)
+        optSol = {self.variableFromIndex[varID] : Fraction(0) for varID in range(self.nbVariables)}
+        for position, varID in enumerate(self.basicVariables[1:]):
+            if varID < self.nbVariables: # not a slack variable
+                optSol[self.variableFromIndex[varID]] = self.values[position]
+        return opt, optSol
@@ -1,5 +1,6 @@
 from fractions import Fraction
-from .array import Array
+from .array import Array, nonZeroItems
+from .pivotRule import DantzigRule
 
 class EndOfAlgorithm(Exception):
     '''
@@ -35,22 +36,67 @@ class Simplex:
     '''
         A class to run the simplex algorithm.
         Uses the tableaux representation.
+        The variables may have an upper bound (given in upperBounds). A
+        non-basic variable at its upper bound u is complemented: it is replaced
+        by u-x, so that all the non-basic variables of the tableaux are 0.
+        The variables of freeVariables have no bound at all: they never leave
+        the basis, and a non-basic one is negated (replaced by -x) when its
+        reduced cost is positive, so that it can enter the basis.
+        The rows of the equalities have an artificial variable (given in
+        artificialVariables) instead of a slack variable. The first phase
+        brings them to 0 (firstPhase is then set), then their columns are
+        erased, so that they stay at 0. If keepArtificialColumns is set, these
+        columns are kept instead, since they are the columns of the inverse of
+        the basis for the equalities (see shiftRightHandSide), and the
+        artificial variables never enter the basis again.
+        If appendArtificial is set, the artificial variable of the first phase
+        is appended as the last column (before the right-hand side) instead of
+        being inserted as column 0, so that no other column is shifted.
+        The algorithm may start from any basis (see setBasis and crashBasis)
+        instead of the basis made of the slack variables.
+        Once solved, the right-hand sides may be changed and constraints may be
+        added (see shiftRightHandSide and addConstraint): the optimal basis
+        stays dual feasible, thus reoptimize only runs the dual simplex from it.
+        The optimal tableaux also gives the reduced costs, the dual values, and
+        the ranges of the costs and of the right-hand sides for which the basis
+        stays optimal (see costRange and rightHandSideRange), and can be walked
+        along a parametric change of them (see parametricCost and
+        parametricRightHandSide).
     '''
+    appendArtificial = True
+    keepArtificialColumns = False
+    supportsBounds = True
+    supportsFreeVariables = True
+    supportsEqualities = True
+    supportsWarmStart = True
+    supportsDualSimplex = True
+    supportsSensitivity = True
 
     def __init__(self, tableaux = None):
         if not tableaux is None:
-            self.tableaux = Array(tableaux)
+            self.tableaux = tableaux if isinstance(tableaux, Array) else Array(tableaux)
             self.nbConstraints = len(self.tableaux) - 1
             self.nbVariables = len(self.tableaux[0]) - self.nbConstraints - 1
             self.basicVariables = [None]+list(range(self.nbVariables, self.nbVariables+self.nbConstraints))
+            self.epsilon = self.tableaux.EPSILON
         else:
             self.tableaux = None
             self.nbVariables = 0
             self.nbConstraints = 0
             self.basicVariables = [None]
+            self.epsilon = 0
         self.objective = None
         self.variableFromIndex = {}
         self.indexFromVariable = {}
+        self.pivotRule = DantzigRule()
+        self.nbPivots = 0
+        self.upperBounds = {}
+        self.complemented = set()
+        self.nbBoundFlips = 0
+        self.freeVariables = set()
+        self.negated = set()
+        self.artificialVariables = set()
+        self.firstPhase = False
 
     def __repr__(self):
         return '\n'.join([
@@ -73,9 +119,15 @@ class Simplex:
         else:
             return str(f)
 
+    def entry(self, row, column):
+        '''
+            Return the value of the element of the tableaux at the given position.
+        '''
+        return self.tableaux[row][column]
+
     def entryToString(self, entryID, avoid = None, sep = ' ', fractionPrint=None):
         fractionPrint = fractionPrint or self.fractionToString
-        return sep.join('%s%s' % (fractionPrint((-1 if avoid is None or i < len(self.tableaux[0])-1 else 1)*self.tableaux[entryID][i]),
+        return sep.join('%s%s' % (fractionPrint((-1 if avoid is None or i < len(self.tableaux[0])-1 else 1)*self.entry(entryID, i)),
                             latexWrap(self.variableFromIndex.get(i, '')))
                         for i in range(len(self.tableaux[0])) if i != avoid and self.tableaux[entryID][i] != 0)
 
@@ -99,23 +151,188 @@ class Simplex:
                 self.entryToString(i, self.basicVariables[i], fractionPrint=fractionToLatex)) for i in range(1, len(self.tableaux))
         ]))
 
-    def choosePivot(self):
+    def ratioTest(self, column, tieBreak=None):
         '''
-            Choose the entering and leaving variables.
+            Return the row of the leaving variable, given the entering variable.
+            A basic variable with an upper bound may leave the basis at this
+            bound (then its element in the column is negative). Return None if
+            the entering variable reaches its own upper bound first.
+            The ties are broken by the smallest value of tieBreak(row) if given,
+            by the smallest row otherwise.
         '''
-        column = self.tableaux[0].argmin(0, -1)
-        if column == len(self.tableaux[0]) -1 or self.tableaux[0][column] >= 0:
-            raise EndOfAlgorithm
-        row = None
-        for r in range(1, len(self.tableaux)):
-            if self.tableaux[r][column] > 0:
-                if row is None:
-                    row = r
-                elif self.tableaux[r][-1]/self.tableaux[r][column] < self.tableaux[row][-1]/self.tableaux[row][column]:
-                    row = r
+        row, ratio = None, None
+        for r in self.tableaux.nonZeroRows(column):
+            if self.basicVariables[r] in self.freeVariables:
+                continue
+            coeff = self.tableaux[r][column]
+            if coeff > self.epsilon:
+                newRatio = self.tableaux[r][-1]/coeff
+            elif coeff < -self.epsilon and self.basicVariables[r] in self.upperBounds:
+                newRatio = (self.upperBounds[self.basicVariables[r]] - self.tableaux[r][-1])/-coeff
+            else:
+                continue
+            if row is None or newRatio < ratio or \
+                    (newRatio == ratio and tieBreak is not None and tieBreak(r) < tieBreak(row)):
+                row, ratio = r, newRatio
+        bound = self.upperBounds.get(column)
+        if bound is not None and (row is None or bound <= ratio):
+            return None
         if row is None:
             raise Unbounded('Variable %d' % column)
-        return row, column
+        return row
+
+    def complementVariable(self, column):
+        '''
+            Replace the variable x of the given column by u-x, where u is its
+            upper bound. If it is basic, its row is negated so that its element
+            in the column stays 1.
+        '''
+        bound = self.upperBounds[column]
+        for r in [0] + list(self.tableaux.nonZeroRows(column)):
+            line = self.tableaux[r]
+            coeff = line[column]
+            if coeff:
+                line[-1] = line[-1] - coeff*bound
+                line[column] = -coeff
+        if column in self.basicVariables[1:]:
+            line = self.tableaux[self.basicVariables.index(column)]
+            line *= -1
+        self.complemented ^= {column}
+
+    def negateVariable(self, column):
+        '''
+            Replace the non-basic variable x of the given column by -x.
+        '''
+        for r in [0] + list(self.tableaux.nonZeroRows(column)):
+            line = self.tableaux[r]
+            line[column] = -line[column]
+        self.negated ^= {column}
+
+    def orientFreeVariables(self):
+        '''
+            Negate the non-basic free variables having a positive reduced cost.
+        '''
+        if not self.freeVariables:
+            return
+        basic = set(self.basicVariables)
+        for column in self.freeVariables:
+            if self.tableaux[0][column] > self.epsilon and not column in basic:
+                self.negateVariable(column)
+
+    def flipBound(self, column, verbose = False, latex=None):
+        '''
+            Move the non-basic variable of the given column to its other bound.
+        '''
+        if verbose:
+            print('Bound flip: %s' % self.variableFromIndex[column])
+        if latex:
+            latex.write('Bound flip: $%s$\n\n' % latexWrap(self.variableFromIndex[column]))
+        self.complementVariable(column)
+        self.nbBoundFlips += 1
+
+    def reconstructBasis(self, basicVariables):
+        '''
+            Perform pivots until the given variables are basic, each one
+            preferably in the row where it is given. Return False if some
+            variables cannot enter the basis (singular basis).
+        '''
+        target = set(basicVariables[1:])
+        complete = True
+        for column in basicVariables[1:]:
+            if column in self.basicVariables:
+                continue
+            rows = [r for r in self.tableaux.nonZeroRows(column)
+                    if not self.basicVariables[r] in target and abs(self.tableaux[r][column]) > self.epsilon]
+            if not rows:
+                complete = False
+                continue
+            row = basicVariables.index(column) if basicVariables.index(column) in rows else rows[0]
+            self.performPivot(row, column)
+        return complete
+
+    def setBasis(self, basicVariables, atUpperBound=()):
+        '''
+            Start from the given basis: basicVariables is the list of the basic
+            variables (after a None, like the basicVariables attribute), and
+            atUpperBound the non-basic variables which are at their upper bound.
+            The bounded basic variables which are out of their bounds then leave
+            the basis (see releaseBoundedVariables). Return False if some
+            variables cannot enter the basis (singular basis), or had to leave it.
+        '''
+        for column in atUpperBound:
+            if column in self.upperBounds and not column in self.complemented and not column in self.basicVariables:
+                self.complementVariable(column)
+        complete = self.reconstructBasis(basicVariables)
+        return self.releaseBoundedVariables() and complete
+
+    def releaseBoundedVariables(self):
+        '''
+            The first phase only makes the unbounded basic variables feasible,
+            thus the bounded basic variables which are out of their bounds leave
+            the basis (at their nearest bound), for a slack (or artificial)
+            variable of their row. Return False if some variables left the
+            basis (or could not leave it).
+        '''
+        complete = True
+        slacks = range(self.nbVariables, len(self.tableaux[0])-1)
+        while True:
+            rows = [r for r in range(1, len(self.tableaux)) if self.basicVariables[r] in self.upperBounds and
+                    not -self.epsilon <= self.tableaux[r][-1] <= self.upperBounds[self.basicVariables[r]]+self.epsilon]
+            if not rows:
+                return complete
+            column = self.basicVariables[rows[0]]
+            if self.tableaux[rows[0]][-1] > 0:
+                self.complementVariable(column)
+            line = self.tableaux[rows[0]]
+            candidates = [j for j in slacks if not j in self.basicVariables and abs(line[j]) > self.epsilon]
+            if not candidates:
+                return False
+            self.performPivot(rows[0], max(candidates, key = lambda j: abs(line[j])))
+            complete = False
+
+    def crashBasis(self):
+        '''
+            Return a triangular crash basis, to be given to setBasis. The
+            structural variables are considered by decreasing attractiveness
+            (free variables first, then by reduced cost), and the variables
+            with a non-negative reduced cost are ignored. Each variable takes the
+            row where its element is the largest, among the rows which are still
+            available. All the rows where it has a non-zero element are then
+            unavailable, so that the basis matrix is triangular (thus
+            non-singular). The other rows keep their basic variable.
+        '''
+        objective = self.tableaux[0]
+        basicVariables = list(self.basicVariables)
+        structural = set(range(self.nbVariables))
+        available = set(r for r in range(1, len(self.tableaux)) if not self.basicVariables[r] in structural)
+        columns = sorted((j for j in structural if not j in self.basicVariables and
+                    (j in self.freeVariables or objective[j] < -self.epsilon)),
+                key = lambda j: (not j in self.freeVariables, objective[j], j))
+        for column in columns:
+            rows = self.tableaux.nonZeroRows(column)
+            candidates = [r for r in rows if r in available and abs(self.tableaux[r][column]) > self.epsilon]
+            if not candidates:
+                continue
+            row = max(candidates, key = lambda r: (abs(self.tableaux[r][column]), -r))
+            basicVariables[row] = column
+            available.difference_update(rows)
+        return basicVariables
+
+    def choosePivot(self):
+        '''
+            Choose the entering and leaving variables, with the pivot rule.
+        '''
+        self.orientFreeVariables()
+        column = self.pivotRule.chooseColumn(self)
+        if column is None:
+            raise EndOfAlgorithm
+        return self.pivotRule.chooseRow(self, column), column
+
+    def pivotTableaux(self, row, column):
+        '''
+            Perform the pivot on the tableaux.
+        '''
+        self.tableaux.pivot(row, column)
 
     def performPivot(self, row, column, verbose = False, latex=None):
         '''
@@ -128,11 +345,8 @@ class Simplex:
             latex.write('Entering variable: $%s$\n\n' % latexWrap(self.variableFromIndex[column]))
             latex.write('Leaving variable: $%s$\n\n' % latexWrap(self.variableFromIndex[self.basicVariables[row]]))
         self.basicVariables[row] = column
-        self.tableaux[row]/=self.tableaux[row][column]
-        for r in range(len(self.tableaux)):
-            if r != row:
-                coeff = self.tableaux[r][column]
-                self.tableaux[r] -= coeff*self.tableaux[row]
+        self.pivotTableaux(row, column)
+        self.nbPivots += 1
         if verbose:
             print(self, '\n')
         if latex:
@@ -142,11 +356,18 @@ class Simplex:
         '''
             Run the basic simplex (without first phase).
         '''
+        self.pivotRule.initialize(self)
         while(True):
             try:
                 row, column = self.choosePivot()
             except EndOfAlgorithm:
                 break
+            if row is None:
+                self.flipBound(column, verbose, latex)
+                continue
+            if self.tableaux[row][column] < 0:
+                self.complementVariable(self.basicVariables[row])
+            self.pivotRule.update(self, row, column)
             self.performPivot(row, column, verbose, latex)
         return self.tableaux[0][-1]
 
@@ -158,6 +379,11 @@ class Simplex:
         self.tableaux[0][0] = Fraction(1)
         self.basicVariables = [None]+[x+1 for x in self.basicVariables[1:]]
         self.nbVariables += 1
+        self.upperBounds = {i+1:bound for i, bound in self.upperBounds.items()}
+        self.complemented = {i+1 for i in self.complemented}
+        self.freeVariables = {i+1 for i in self.freeVariables}
+        self.negated = {i+1 for i in self.negated}
+        self.artificialVariables = {i+1 for i in self.artificialVariables}
         self.variableFromIndex = {i+1:var for i, var in self.variableFromIndex.items()}
         self.variableFromIndex[0] = '_phase1_'
         self.indexFromVariable = {var:i+1 for var, i in self.indexFromVariable.items()}
@@ -167,43 +393,148 @@ class Simplex:
         '''
             Remove the variable which was added by addVariable.
         '''
-        if 0 in self.basicVariables:
-            row = self.basicVariables.index(0)
-            assert self.tableaux[row][-1] == 0
-            column = 1
-            while column < len(self.tableaux[row]) and self.tableaux[row][column] == 0:
-                column += 1
-            assert column < len(self.tableaux[row])
-            self.performPivot(row, column)
+        self.pivotOutOfBasis(0)
         self.tableaux.removeColumn()
         self.nbVariables -= 1
+        self.upperBounds = {i-1:bound for i, bound in self.upperBounds.items()}
+        self.complemented = {i-1 for i in self.complemented}
+        self.freeVariables = {i-1 for i in self.freeVariables}
+        self.negated = {i-1 for i in self.negated}
+        self.artificialVariables = {i-1 for i in self.artificialVariables}
         self.basicVariables = [None]+[x-1 for x in self.basicVariables[1:]]
         self.variableFromIndex = {i-1:var for i, var in self.variableFromIndex.items() if i != 0}
         self.indexFromVariable = {var:i-1 for var, i in self.indexFromVariable.items() if i != 0}
 
+    def pivotOutOfBasis(self, column):
+        '''
+            If the variable of the given column is basic (with a value of 0),
+            make it leave the basis, with a pivot on another column.
+        '''
+        if not column in self.basicVariables:
+            return
+        row = self.basicVariables.index(column)
+        assert abs(self.tableaux[row][-1]) <= self.epsilon
+        last = len(self.tableaux[row])-1
+        candidates = [j for j, x in nonZeroItems(self.tableaux[row]) if j != column and j < last and abs(x) > self.epsilon]
+        assert candidates
+        self.performPivot(row, min(candidates))
+
+    def addArtificialVariable(self):
+        '''
+            Add the artificial variable of the first phase, and return its
+            column. Its element is 0 in the rows of the bounded basic variables
+            (after a warm start), so that they stay below their upper bound.
+        '''
+        if not self.appendArtificial:
+            self.addVariable()
+            column = 0
+        else:
+            column = len(self.tableaux[0])-1
+            self.tableaux.addColumn(Fraction(-1), column)
+            self.tableaux[0][column] = Fraction(1)
+            self.variableFromIndex[column] = '_phase1_'
+            self.indexFromVariable['_phase1_'] = column
+        for row in range(1, len(self.tableaux)):
+            if self.basicVariables[row] in self.upperBounds:
+                self.tableaux[row][column] = 0
+        return column
+
+    def removeArtificialVariable(self, column):
+        '''
+            Remove the variable which was added by addArtificialVariable.
+        '''
+        if not self.appendArtificial:
+            self.removeVariable()
+            return
+        self.pivotOutOfBasis(column)
+        self.tableaux.removeColumn(column)
+        self.variableFromIndex.pop(column)
+        self.indexFromVariable.pop('_phase1_')
+
+    def artificialObjective(self):
+        '''
+            Subtract the artificial variables from the objective function of the
+            first phase, and eliminate the basic ones.
+        '''
+        objective = self.tableaux[0]
+        for column in self.artificialVariables:
+            objective[column] = objective[column] + 1
+        for row in range(1, len(self.tableaux)):
+            if self.basicVariables[row] in self.artificialVariables:
+                objective.axpy(-1, self.tableaux[row])
+
+    def removeArtificialVariables(self):
+        '''
+            Drive the artificial variables out of the basis after the first
+            phase, and erase their columns, so that they stay at 0. If
+            keepArtificialColumns is set, their columns are kept, but they never
+            enter the basis again (the pivot rules and dualRatioTest skip them).
+            An artificial variable which cannot leave the basis stays basic (at
+            0), its row being redundant.
+        '''
+        if not self.artificialVariables:
+            return
+        last = len(self.tableaux[0])-1
+        for row in range(1, len(self.tableaux)):
+            if not self.basicVariables[row] in self.artificialVariables:
+                continue
+            assert abs(self.tableaux[row][-1]) <= self.epsilon
+            for column, x in nonZeroItems(self.tableaux[row]):
+                if column < last and not column in self.artificialVariables and abs(x) > self.epsilon:
+                    self.performPivot(row, column)
+                    break
+        if self.keepArtificialColumns:
+            return
+        basic = set(self.basicVariables)
+        for column in self.artificialVariables - basic:
+            for r in [0] + list(self.tableaux.nonZeroRows(column)):
+                self.tableaux[r][column] = 0
+
     def firstPhaseLeavingVariable(self):
         '''
-            Choose the leaving variable of the first phase's first pivot.
+            Choose the leaving variable of the first phase's first pivot (the
+            basic free variables may be negative).
         '''
-        imin = 1
-        for i in range(2, len(self.tableaux)):
+        rows = [i for i in range(1, len(self.tableaux)) if not self.basicVariables[i] in self.freeVariables]
+        if not rows:
+            return None, 0
+        imin = rows[0]
+        for i in rows[1:]:
             if self.tableaux[i][-1] < self.tableaux[imin][-1]:
                 imin = i
         return imin, self.tableaux[imin][-1]
 
-    def updateObjective(self):
+    def updateObjective(self, complemented=(), negated=()):
         '''
-            Update the objective function after the first phase.
+            Update the objective function after the first phase: complement (or
+            negate) the variables which were complemented (or negated) during
+            the first phase (the given ones already were when the objective was
+            saved), erase the artificial variables (unless keepArtificialColumns
+            is set), and eliminate the basic variables.
         '''
+        objective = self.tableaux[0]
+        for column in self.negated ^ set(negated):
+            objective[column] = -objective[column]
+        for column in self.complemented ^ set(complemented):
+            coeff = objective[column]
+            if coeff:
+                objective[-1] = objective[-1] - coeff*self.upperBounds[column]
+                objective[column] = -coeff
+        if not self.keepArtificialColumns:
+            for column in self.artificialVariables:
+                objective[column] = 0
         for row, column in enumerate(self.basicVariables):
             if column is None:
                 continue
-            self.tableaux[0] -= self.tableaux[0][column]*self.tableaux[row]
+            self.tableaux[0].axpy(-self.tableaux[0][column], self.tableaux[row])
 
-    def solve(self, verbose = False, latex=None):
+    def solve(self, verbose = False, latex=None, pivotRule=None):
         '''
             Perform the whole simplex algorithm, first phase included.
+            The pivots are chosen with the given PivotRule (default is Dantzig's rule).
         '''
+        if pivotRule is not None:
+            self.pivotRule = pivotRule
         if verbose:
             print(self, '\n')
         if latex:
@@ -213,21 +544,30 @@ class Simplex:
             print('\n\n# FIRST PHASE\n')
         if latex:
             latex.write('\\section*{First phase}\n\n')
-        if constantValue < 0:
+        if constantValue < 0 or self.artificialVariables:
             objective = self.tableaux[0].copy()
+            complemented, negated = set(self.complemented), set(self.negated)
             self.tableaux[0] = self.tableaux[0].__class__([0]*len(self.tableaux[0]))
-            self.addVariable()
+            if constantValue < 0:
+                artificial = self.addArtificialVariable()
+            self.artificialObjective()
             if verbose:
                 print(self, '\n')
             if latex:
                 latex.write(self.toLatex())
-            self.performPivot(firstPhaseVariable, 0, verbose, latex)
-            if self.runSimplex(verbose, latex) != 0:
-                raise Empty
-            self.removeVariable()
-            for i, col in enumerate(objective):
-                self.tableaux[0][i] = objective[i]
-            self.updateObjective()
+            if constantValue < 0:
+                self.performPivot(firstPhaseVariable, artificial, verbose, latex)
+            self.firstPhase = True
+            try:
+                if abs(self.runSimplex(verbose, latex)) > self.epsilon:
+                    raise Empty
+            finally:
+                self.firstPhase = False
+            if constantValue < 0:
+                self.removeArtificialVariable(artificial)
+            self.removeArtificialVariables()
+            self.tableaux[0] = objective
+            self.updateObjective(complemented, negated)
             if verbose:
                 print('Remove the variable and put back the objective function:')
                 print(self, '\n')
@@ -238,9 +578,459 @@ class Simplex:
             print('\n\n# SECOND PHASE\n')
         if latex:
             latex.write('\\section*{Second phase}\n\n')
-        opt = self.runSimplex(verbose, latex)
-        optSol = {self.variableFromIndex[varID] : Fraction(0) for varID in range(self.nbVariables)}
+        self.runSimplex(verbose, latex)
+        return self.solution()
+
+    def solution(self):
+        '''
+            Return the value of the objective function and the values of the
+            variables, for the current basis.
+        '''
+        values = {varID : Fraction(0) for varID in range(self.nbVariables)}
         for constraint in range(1, self.nbConstraints+1):
             if self.basicVariables[constraint] < self.nbVariables: # not a slack variable
-                optSol[self.variableFromIndex[self.basicVariables[constraint]]] = self.tableaux[constraint][-1]
-        return opt, optSol
+                values[self.basicVariables[constraint]] = self.tableaux[constraint][-1]
+        for varID in self.complemented:
+            if varID < self.nbVariables:
+                values[varID] = self.upperBounds[varID] - values[varID]
+        for varID in self.negated:
+            if varID < self.nbVariables:
+                values[varID] = -values[varID]
+        optSol = {self.variableFromIndex[varID] : value for varID, value in values.items()}
+        return self.tableaux[0][-1], optSol
+
+    def isDualFeasible(self):
+        '''
+            Return True if no reduced cost is negative (the ones of the free
+            variables must be 0), i.e. if the dual simplex can be run.
+        '''
+        objective = self.tableaux[0]
+        last = len(objective)-1
+        for column, x in nonZeroItems(objective):
+            if column == last or column in self.artificialVariables:
+                continue
+            if x < -self.epsilon or (column in self.freeVariables and x > self.epsilon):
+                return False
+        return True
+
+    def dualLeavingRow(self):
+        '''
+            Choose the leaving variable of the dual simplex: the basic variable
+            which is the farthest out of its bounds (the artificial variables
+            must be 0, the free variables never leave). Return None if there is
+            none, i.e. if the basis is feasible.
+        '''
+        row, infeasibility = None, self.epsilon
+        for r in range(1, len(self.tableaux)):
+            column = self.basicVariables[r]
+            if column in self.freeVariables:
+                continue
+            value = self.tableaux[r][-1]
+            if column in self.artificialVariables:
+                newInfeasibility = abs(value)
+            elif column in self.upperBounds:
+                newInfeasibility = max(-value, value - self.upperBounds[column])
+            else:
+                newInfeasibility = -value
+            if newInfeasibility > infeasibility:
+                row, infeasibility = r, newInfeasibility
+        return row
+
+    def dualRatioTest(self, row):
+        '''
+            Return the entering variable of the dual simplex, given the row of
+            the leaving variable (whose value is negative): among the columns
+            having a negative element in this row (or any non-zero element, for
+            the free variables), the one with the smallest ratio of its reduced
+            cost to the absolute value of this element, so that the reduced costs
+            stay non-negative. The ties are broken by the largest element.
+            The artificial variables never enter. Raise Empty if there is no
+            such column.
+        '''
+        objective = self.tableaux[0]
+        line = self.tableaux[row]
+        last = len(line)-1
+        basic = set(self.basicVariables)
+        column, ratio, pivot = None, None, None
+        for j, x in nonZeroItems(line):
+            if j == last or j in basic or j in self.artificialVariables:
+                continue
+            if x < -self.epsilon or (j in self.freeVariables and x > self.epsilon):
+                newRatio = abs(objective[j])/abs(x)
+                if column is None or newRatio < ratio or (newRatio == ratio and abs(x) > pivot):
+                    column, ratio, pivot = j, newRatio, abs(x)
+        if column is None:
+            raise Empty('Row %d' % row)
+        return column
+
+    def runDualSimplex(self, verbose = False, latex=None):
+        '''
+            Run the dual simplex algorithm, from a dual feasible basis: each
+            pivot makes an infeasible basic variable leave the basis, while the
+            reduced costs stay non-negative, until the basis is feasible (thus
+            optimal). A basic variable above its upper bound is complemented
+            (an artificial variable above 0 is negated) before leaving, so that
+            its value is negative.
+        '''
+        while True:
+            row = self.dualLeavingRow()
+            if row is None:
+                break
+            self.dualPivot(row, self.tableaux[row][-1] > 0, verbose, latex)
+        return self.tableaux[0][-1]
+
+    def dualPivot(self, row, atUpperBound, verbose = False, latex=None):
+        '''
+            Make the basic variable of the given row leave the basis, at its
+            upper bound if atUpperBound is set (an artificial variable is then
+            negated, instead of being complemented), at 0 otherwise. The
+            entering variable is chosen by dualRatioTest.
+        '''
+        if atUpperBound:
+            if self.basicVariables[row] in self.artificialVariables:
+                line = self.tableaux[row]
+                line *= -1
+            else:
+                self.complementVariable(self.basicVariables[row])
+        column = self.dualRatioTest(row)
+        if self.tableaux[row][column] > 0:
+            self.negateVariable(column)
+        self.performPivot(row, column, verbose, latex)
+
+    def reoptimize(self, verbose = False, latex=None):
+        '''
+            Solve again, after a change of the right-hand sides or the addition
+            of constraints. If the basis is still dual feasible (which is the
+            case if it was optimal), the dual simplex is run from it, then the
+            artificial variables are driven out of the basis. Otherwise, the
+            primal simplex is run from it if it is feasible (e.g. after a change
+            of the costs), the whole simplex algorithm otherwise.
+        '''
+        if not self.isDualFeasible():
+            self.releaseBoundedVariables()
+            if self.dualLeavingRow() is not None:
+                return self.solve(verbose, latex)
+            if verbose:
+                print('\n\n# SECOND PHASE\n')
+            if latex:
+                latex.write('\\section*{Second phase}\n\n')
+            self.removeArtificialVariables()
+            self.runSimplex(verbose, latex)
+            return self.solution()
+        if verbose:
+            print('\n\n# DUAL SIMPLEX\n')
+        if latex:
+            latex.write('\\section*{Dual simplex}\n\n')
+        self.runDualSimplex(verbose, latex)
+        self.removeArtificialVariables()
+        self.runSimplex(verbose, latex)
+        return self.solution()
+
+    def changeCost(self, column, delta):
+        '''
+            Add delta to the cost of the variable of the given column (its
+            element in the objective line of the initial tableaux), in the
+            current basis. The basis stays feasible, but may not be optimal
+            anymore.
+        '''
+        objective = self.tableaux[0]
+        if column in self.negated:
+            delta = -delta
+        if column in self.complemented:
+            objective[-1] = objective[-1] - delta*self.upperBounds[column]
+            delta = -delta
+        objective[column] = objective[column] + delta
+        if column in self.basicVariables[1:]:
+            objective.axpy(-objective[column], self.tableaux[self.basicVariables.index(column)])
+
+    def translateVariable(self, column, shift):
+        '''
+            Replace the variable x of the given column (neither complemented
+            nor negated) by x+shift, in the current basis: the right-hand sides
+            are updated with the column, like in complementVariable. The
+            reduced costs do not change, thus the basis stays dual feasible.
+        '''
+        for r in [0] + list(self.tableaux.nonZeroRows(column)):
+            line = self.tableaux[r]
+            coeff = line[column]
+            if coeff:
+                line[-1] = line[-1] - coeff*shift
+
+    def rightHandSideColumn(self, constraint):
+        '''
+            Return the column of the slack variable of the given constraint,
+            or of its artificial variable for an equality, which requires
+            keepArtificialColumns (otherwise, this column is erased after the
+            first phase).
+        '''
+        column = self.nbVariables + constraint
+        if column in self.artificialVariables and not self.keepArtificialColumns:
+            raise Exception('The column of the equality %d is erased, unless keepArtificialColumns is set.' % constraint)
+        return column
+
+    def shiftRightHandSide(self, constraint, delta):
+        '''
+            Add delta to the right-hand side of the given constraint (numbered
+            from 0, in the order of the rows of the initial tableaux), in the
+            current basis: the column of its slack variable is the column of
+            the inverse of the basis for this row (see rightHandSideColumn).
+        '''
+        column = self.rightHandSideColumn(constraint)
+        for r in [0] + list(self.tableaux.nonZeroRows(column)):
+            line = self.tableaux[r]
+            coeff = line[column]
+            if coeff:
+                line[-1] = line[-1] + coeff*delta
+
+    def addConstraint(self, coefficients, bound):
+        '''
+            Add the constraint sum(factor*x_column) <= bound, where coefficients
+            maps the columns of some (non-slack) variables to their factor, to
+            the current basis. Its slack variable is appended as the last column
+            and is basic in the new row, which is expressed with the non-basic
+            variables. Return the number of the constraint.
+        '''
+        column = len(self.tableaux[0])-1
+        self.tableaux.addColumn(0, column)
+        line = {column: Fraction(1), column+1: Fraction(bound)}
+        for j, factor in coefficients.items():
+            factor = Fraction(factor)
+            if j in self.complemented:
+                line[column+1] -= factor*self.upperBounds[j]
+                factor = -factor
+            if j in self.negated:
+                factor = -factor
+            line[j] = line.get(j, 0) + factor
+        for row, j in enumerate(self.basicVariables):
+            if j is not None and line.get(j):
+                factor = line[j]
+                for k, x in nonZeroItems(self.tableaux[row]):
+                    line[k] = line.get(k, 0) - factor*x
+        dense = [Fraction(0)]*(column+2)
+        for k, x in line.items():
+            dense[k] = x
+        self.tableaux.addRow(dense)
+        constraint = column - self.nbVariables
+        self.nbConstraints += 1
+        self.basicVariables.append(column)
+        self.variableFromIndex[column] = '_slack_%d' % constraint
+        self.indexFromVariable['_slack_%d' % constraint] = column
+        return constraint
+
+    def reducedCost(self, column):
+        '''
+            Return the reduced cost of the variable of the given column, for
+            the variable itself (not complemented nor negated).
+        '''
+        cost = self.tableaux[0][column]
+        if column in self.complemented or column in self.negated:
+            return -cost
+        return cost
+
+    def dualValue(self, constraint):
+        '''
+            Return the dual value of the given constraint (numbered like in
+            shiftRightHandSide): the derivative of the objective value with
+            respect to its right-hand side.
+        '''
+        return self.tableaux[0][self.rightHandSideColumn(constraint)]
+
+    def costRates(self, direction):
+        '''
+            Return the map from the non-basic columns to the derivative of
+            their reduced cost, when the cost of each column of direction
+            increases by its factor (like in changeCost). The factors are
+            converted to fractions, so that the steps are exact.
+        '''
+        last = len(self.tableaux[0])-1
+        basic = set(self.basicVariables)
+        rates = {}
+        for column, factor in direction.items():
+            factor = Fraction(factor)
+            if column in self.complemented or column in self.negated:
+                factor = -factor
+            if not column in basic:
+                rates[column] = rates.get(column, 0) + factor
+                continue
+            for j, x in nonZeroItems(self.tableaux[self.basicVariables.index(column)]):
+                if j != last and not j in basic:
+                    rates[j] = rates.get(j, 0) - factor*x
+        return rates
+
+    def costStep(self, rates):
+        '''
+            Return the largest step along the given rates (see costRates) for
+            which the reduced costs stay non-negative (the ones of the free
+            variables stay 0), and the column which then blocks. Return
+            (None, None) if the step is infinite.
+        '''
+        objective = self.tableaux[0]
+        column, step = None, None
+        for j, rate in rates.items():
+            if j in self.artificialVariables:
+                continue
+            if j in self.freeVariables:
+                if abs(rate) <= self.epsilon:
+                    continue
+                newStep = 0
+            elif rate < -self.epsilon:
+                newStep = max(objective[j], 0)/-rate
+            else:
+                continue
+            if column is None or newStep < step:
+                column, step = j, newStep
+        return step, column
+
+    def rightHandSideRates(self, direction):
+        '''
+            Return the map from the rows to the derivative of the value of
+            their basic variable, when the right-hand side of each constraint
+            of direction increases by its factor (like in shiftRightHandSide).
+            The factors are converted to fractions, like in costRates.
+        '''
+        rates = {}
+        for constraint, factor in direction.items():
+            factor = Fraction(factor)
+            column = self.rightHandSideColumn(constraint)
+            for r in self.tableaux.nonZeroRows(column):
+                rates[r] = rates.get(r, 0) + factor*self.tableaux[r][column]
+        return rates
+
+    def rightHandSideStep(self, rates):
+        '''
+            Return the largest step along the given rates (see
+            rightHandSideRates) for which the basic variables stay within their
+            bounds (the artificial ones stay 0), and the row which then blocks.
+            Return (None, None) if the step is infinite.
+        '''
+        row, step = None, None
+        for r, rate in rates.items():
+            column = self.basicVariables[r]
+            if column in self.freeVariables:
+                continue
+            value = self.tableaux[r][-1]
+            if rate < -self.epsilon:
+                newStep = max(value, 0)/-rate
+            elif rate > self.epsilon and column in self.artificialVariables:
+                newStep = 0
+            elif rate > self.epsilon and column in self.upperBounds:
+                newStep = max(self.upperBounds[column] - value, 0)/rate
+            else:
+                continue
+            if row is None or newStep < step:
+                row, step = r, newStep
+        return step, row
+
+    @staticmethod
+    def stepRange(step, rates):
+        '''
+            Return the range of theta (None for an infinite end) given by the
+            step function, in both directions of the given rates.
+        '''
+        high = step(rates)[0]
+        low = step({key: -rate for key, rate in rates.items()})[0]
+        return (None if low is None else -low), high
+
+    def costRange(self, direction):
+        '''
+            Return the range of theta for which the basis stays optimal when
+            the cost of each column of direction increases by theta times its
+            factor. The infinite ends are None.
+        '''
+        return self.stepRange(self.costStep, self.costRates(direction))
+
+    def rightHandSideRange(self, direction):
+        '''
+            Return the range of theta for which the basis stays feasible (thus
+            optimal) when the right-hand side of each constraint of direction
+            increases by theta times its factor. The infinite ends are None.
+        '''
+        return self.stepRange(self.rightHandSideStep, self.rightHandSideRates(direction))
+
+    def parametricRightHandSide(self, direction, thetaMax=None):
+        '''
+            Increase the right-hand side of each constraint of direction by
+            theta times its factor, from theta = 0 (from an optimal basis) up to
+            thetaMax if given: at each breakpoint, the blocking basic variable
+            leaves the basis with a pivot of the dual simplex, instead of
+            solving the program again. Return the list of the breakpoints, as
+            triples (theta, value of the objective, solution), the first one
+            being theta = 0 and the last one thetaMax, and Empty if there is no
+            solution beyond the last breakpoint (None otherwise). Between two
+            breakpoints, the basis stays the same and the solution is linear: the
+            solution of a breakpoint is the one of the basis following it.
+        '''
+        theta = 0
+        breakpoints = [(theta,) + self.solution()]
+        while True:
+            rates = self.rightHandSideRates(direction)
+            step, row = self.rightHandSideStep(rates)
+            end = thetaMax is not None and (step is None or theta + step >= thetaMax)
+            if end:
+                step = thetaMax - theta
+            elif step is None:
+                return breakpoints, None
+            for constraint, factor in direction.items():
+                self.shiftRightHandSide(constraint, step*factor)
+            theta += step
+            status = None
+            if not end:
+                try:
+                    self.dualPivot(row, rates[row] > 0)
+                except Empty:
+                    status = Empty
+            if breakpoints[-1][0] == theta:
+                breakpoints.pop()
+            breakpoints.append((theta,) + self.solution())
+            if end or status is not None:
+                return breakpoints, status
+
+    def parametricCost(self, direction, thetaMax=None):
+        '''
+            Increase the cost of each column of direction by theta times its
+            factor, from theta = 0 (from an optimal basis) up to thetaMax if
+            given: at each breakpoint, the blocking variable enters the basis
+            with a pivot of the simplex (or a bound flip), instead of solving
+            the program again. Return the list of the breakpoints, like
+            parametricRightHandSide, and Unbounded if there is no optimal
+            solution beyond the last breakpoint (None otherwise).
+        '''
+        theta = 0
+        breakpoints = [(theta,) + self.solution()]
+        while True:
+            rates = self.costRates(direction)
+            step, column = self.costStep(rates)
+            end = thetaMax is not None and (step is None or theta + step >= thetaMax)
+            if end:
+                step = thetaMax - theta
+            elif step is None:
+                return breakpoints, None
+            for j, factor in direction.items():
+                self.changeCost(j, step*factor)
+            theta += step
+            status = None
+            if not end:
+                try:
+                    self.costPivot(column, rates[column])
+                except Unbounded:
+                    status = Unbounded
+            if breakpoints[-1][0] == theta:
+                breakpoints.pop()
+            breakpoints.append((theta,) + self.solution())
+            if end or status is not None:
+                return breakpoints, status
+
+    def costPivot(self, column, rate):
+        '''
+            Make the given column, whose cost reached 0 with the given rate,
+            enter the basis (or flip its bound).
+        '''
+        if column in self.freeVariables and rate > 0:
+            self.negateVariable(column)
+        row = self.ratioTest(column)
+        if row is None:
+            self.flipBound(column)
+            return
+        if self.tableaux[row][column] < 0:
+            self.complementVariable(self.basicVariables[row])
+        self.performPivot(row, column)
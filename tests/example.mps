@@ -0,0 +1,30 @@
+* A small linear program in the fixed MPS format.
+NAME          EXAMPLE
+ROWS
+ N  COST
+ L  LIM1
+ G  LIM2
+ E  MYEQN
+ N  OTHER
+COLUMNS
+    MARKER    'MARKER'                 'INTORG'
+    X1        COST      1.0            LIM1      1.0
+    X1        LIM2      1.0
+    MARKER    'MARKER'                 'INTEND'
+    X2        COST      2.0            LIM1      1.0
+    X2        MYEQN     -1.0           OTHER     5
+    X3        COST      -1.0           MYEQN     1.0
+    X4        COST      1.5e0
+RHS
+    RHS       COST      -2.5
+    RHS       LIM1      4.0            LIM2      1.0
+    RHS       MYEQN     7.0
+RANGES
+    RNG       LIM1      2.5
+BOUNDS
+ UP BND       X1        4.0
+ UP BND       X2        -1.0
+ UP BND       X3        8.0
+ BV BND       X4
+ FX BND       X5        3.0
+ENDATA
@@ -1,4 +1,4 @@
-from simplex import Array, DenseMatrix, SparseLine, SparseMatrix
+from simplex import Array, DenseMatrix, SparseLine, IndexedHeap, ObjectiveLine, SparseMatrix, IndexedSparseMatrix, CompressedLine, CompressedMatrix, NumpyLine, NumpyMatrix
 from fractions import Fraction as F
 
 from unittest import TestCase
@@ -40,12 +40,30 @@ class DenseTests(TestCase):
         a.removeColumn()
         self.assertEqual(a, DenseMatrix([[1, 42], [3, 42]]))
 
+    def testAxpy(self):
+        a = DenseMatrix([F(1), F(2), F(3)])
+        a.axpy(F(-2), DenseMatrix([F(0), F(1), F(3)]))
+        self.assertEqual(a, DenseMatrix([1, 0, -3]))
+        a.axpy(F(3), SparseLine([F(1), F(0), F(1)]))
+        self.assertEqual(a, DenseMatrix([4, 0, 0]))
+
+    def testPivot(self):
+        a = DenseMatrix([[F(1), F(2), F(3)], [F(2), F(4), F(2)]])
+        a.pivot(1, 0)
+        self.assertEqual(a, DenseMatrix([[0, 0, 2], [1, 2, 1]]))
+
     def testArgmin(self):
         a = DenseMatrix([3, 1, 5, 4, 0])
         self.assertEqual(a.argmin(), len(a)-1)
         self.assertEqual(a.argmin(0, -1), 1)
         self.assertEqual(a.argmin(2, -1), 3)
 
+    def testAddRow(self):
+        a = DenseMatrix([[F(1), F(2)]])
+        a.addRow([F(0), F(3)])
+        self.assertEqual(a, DenseMatrix([[1, 2], [0, 3]]))
+        self.assertIsInstance(a[1], DenseMatrix)
+
 class SparseTests(TestCase):
 
     def testConstructor(self):
@@ -73,6 +91,16 @@ class SparseTests(TestCase):
         a/=3
         self.assertEqual(a, SparseLine([1, 2, 3, 4]))
 
+    def testAxpy(self):
+        a = SparseLine([F(1), F(2), F(0), F(4)])
+        a.axpy(F(-2), SparseLine([F(0), F(1), F(1), F(0)]))
+        self.assertEqual(a, {0: 1, 2: -2, 3: 4})
+        a.axpy(F(0), SparseLine([F(5), F(5), F(5), F(5)]))
+        self.assertEqual(a, {0: 1, 2: -2, 3: 4})
+        a.axpy(F(1, 2), DenseMatrix([F(-2), F(0), F(4), F(0)]))
+        self.assertEqual(a, {3: 4})
+        self.assertEqual(len(a), 4)
+
     def testAddRemoveColumn(self):
         a = SparseLine([F(1), F(2), F(3), F(4)])
         a.addColumn(F(42), 1)
@@ -103,7 +131,246 @@ class SparseTests(TestCase):
         self.assertEqual(a.argmin(), 0)
         a = SparseLine([0, 3, 0, 5, 4])
         self.assertEqual(a.argmin(), 0)
+        a = SparseLine([3, 0, 0, 4, -1])
+        self.assertEqual(a.argmin(0, -1), 1)
         a = SparseLine([3, 1, 5, 4, 0])
         self.assertEqual(a.argmin(), len(a)-1)
         self.assertEqual(a.argmin(0, -1), 1)
         self.assertEqual(a.argmin(2, -1), 3)
+
+    def testPivot(self):
+        a = SparseMatrix([[F(1), F(2), F(3)], [F(2), F(4), F(2)]])
+        a.pivot(1, 0)
+        self.assertEqual(a, SparseMatrix([[0, 0, 2], [1, 2, 1]]))
+
+class IndexedTests(TestCase):
+
+    def testIndex(self):
+        a = IndexedSparseMatrix([[F(1), F(0), F(3)], [F(0), F(4), F(2)], [F(5), F(0), F(0)]])
+        self.assertEqual(a.columnRows, {0: {0, 2}, 1: {1}, 2: {0, 1}})
+        self.assertEqual(a.nonZeroRows(0), [2])
+        a[2] = SparseLine([F(0), F(1), F(0)])
+        self.assertEqual(a.columnRows, {0: {0}, 1: {1, 2}, 2: {0, 1}})
+        a.addColumn(F(1))
+        self.assertEqual(a.columnRows, {0: {0, 1, 2}, 1: {0}, 2: {1, 2}, 3: {0, 1}})
+        a.removeColumn()
+        self.assertEqual(a.nonZeroRows(1), [1, 2])
+
+    def testPivot(self):
+        l = [[F(1), F(2), F(0), F(3)], [F(2), F(4), F(1), F(2)], [F(0), F(1), F(1), F(0)], [F(1), F(0), F(0), F(1)]]
+        a = IndexedSparseMatrix(l)
+        a.pivot(1, 0)
+        b = SparseMatrix(l)
+        b.pivot(1, 0)
+        self.assertEqual(a, b)
+        self.assertEqual(a, SparseMatrix([[0, 0, F(-1, 2), 2], [1, 2, F(1, 2), 1], [0, 1, 1, 0], [0, -2, F(-1, 2), 0]]))
+        self.assertEqual(a.columnRows, {0: {1}, 1: {1, 2, 3}, 2: {0, 1, 2, 3}, 3: {0, 1}})
+        self.assertEqual(a.nonZeroRows(1), [1, 2, 3])
+
+    def testFractionFreePivot(self):
+        l = [[-3, -2, 0, 0, 0], [1, 1, 1, 0, 4], [1, 0, 0, 1, 3], [0, 2, 0, 0, 5]]
+        a = IndexedSparseMatrix([SparseLine(line) for line in l])
+        b = SparseMatrix([SparseLine(line) for line in l])
+        self.assertEqual(a.fractionFreePivot(2, 0, 1), b.fractionFreePivot(2, 0, 1))
+        self.assertEqual(a.fractionFreePivot(3, 1, 1), b.fractionFreePivot(3, 1, 1))
+        self.assertEqual(list.__getitem__(a, 2), [1, 0, 0, 1, 3]) # scaling delayed
+        self.assertEqual(a[2], [2, 0, 0, 2, 6])
+        self.assertEqual(a[1], b[1])
+        self.assertEqual(a, b)
+
+    def testPivotObjectiveModifiedInPlace(self):
+        a = IndexedSparseMatrix([[F(0), F(0), F(0)], [F(2), F(1), F(4)]])
+        a[0][0] = F(-1)
+        a.pivot(1, 0)
+        self.assertEqual(a[0], [0, F(1, 2), 2])
+
+    def testAddRow(self):
+        a = IndexedSparseMatrix([[F(1), F(0), F(3)], [F(0), F(4), F(2)]])
+        a.addRow([F(5), F(0), F(1)])
+        self.assertIsInstance(a[2], SparseLine)
+        self.assertEqual(a[2], [5, 0, 1])
+        self.assertEqual(a.columnRows, {0: {0, 2}, 1: {1}, 2: {0, 1, 2}})
+
+class CompressedTests(TestCase):
+
+    def testConstructor(self):
+        a = CompressedLine([F(0), F(2), F(0), F(-1)])
+        self.assertEqual(list(a.indices), [1, 3])
+        self.assertEqual(a.values, [2, -1])
+        self.assertEqual(len(a), 4)
+        self.assertEqual(a[3], -1)
+        self.assertEqual(a[-1], -1)
+        self.assertEqual(a[0], 0)
+        self.assertEqual(CompressedLine({3: F(1), 0: F(2)}).values, [2, 1])
+        self.assertEqual(a.copy(), a)
+
+    def testSetItem(self):
+        a = CompressedLine([F(0), F(2), F(0), F(-1)])
+        a[2] = F(5)
+        a[1] = F(0)
+        a[-1] = F(3)
+        self.assertEqual(list(a.indices), [2, 3])
+        self.assertEqual(a, [0, 0, 5, 3])
+
+    def testAxpy(self):
+        a = CompressedLine([F(1), F(0), F(2), F(0), F(3)])
+        a.axpy(F(2), CompressedLine([F(0), F(1), F(-1), F(0), F(1)]))
+        self.assertEqual(a, [1, 2, 0, 0, 5])
+        self.assertEqual(list(a.indices), [0, 1, 4])
+        a.axpy(F(-1), SparseLine([F(1), F(0), F(0), F(1), F(0)]))
+        self.assertEqual(a, [0, 2, 0, -1, 5])
+        a.axpy(F(0), CompressedLine([F(1)]*5))
+        self.assertEqual(a, [0, 2, 0, -1, 5])
+
+    def testAddRemoveColumn(self):
+        a = CompressedMatrix([[F(1), F(0), F(3)], [F(0), F(4), F(2)]])
+        a.addColumn(F(-1), 1)
+        self.assertEqual(a, [[1, -1, 0, 3], [0, -1, 4, 2]])
+        a.removeColumn(0)
+        self.assertEqual(a, [[-1, 0, 3], [-1, 4, 2]])
+        self.assertEqual(len(a[0]), 3)
+
+    def testArgmin(self):
+        a = CompressedLine([F(3), F(1), F(5), F(4), F(0)])
+        self.assertEqual(a.argmin(), len(a)-1)
+        self.assertEqual(a.argmin(0, -1), 1)
+        self.assertEqual(a.argmin(2, -1), 3)
+        a = CompressedLine([F(3), F(0), F(-2), F(4), F(-2)])
+        self.assertEqual(a.argmin(), 2)
+        self.assertEqual(a.argmin(0, 2), 1)
+
+    def testPivot(self):
+        l = [[F(1), F(2), F(0), F(3)], [F(2), F(4), F(1), F(2)], [F(0), F(1), F(1), F(0)], [F(1), F(0), F(0), F(1)]]
+        a = CompressedMatrix(l)
+        a.pivot(1, 0)
+        b = SparseMatrix(l)
+        b.pivot(1, 0)
+        self.assertEqual(a, b)
+        self.assertEqual(a.nonZeroRows(1), [1, 2, 3])
+
+    def testColumns(self):
+        a = CompressedMatrix([[F(1), F(0), F(3)], [F(0), F(4), F(2)]])
+        columns = a.columns()
+        self.assertEqual(columns, [[1, 0], [0, 4], [3, 2]])
+        self.assertEqual(list(columns[2].indices), [0, 1])
+
+    def testAddRow(self):
+        a = CompressedMatrix([[F(1), F(0), F(3)]])
+        a.addRow([F(0), F(2), F(0)])
+        self.assertEqual(a[1], CompressedLine([0, 2, 0]))
+
+class HeapTests(TestCase):
+
+    def testIndexedHeap(self):
+        h = IndexedHeap([(0, 5), (1, 3), (2, 8)])
+        self.assertEqual(h.top(), (3, 1))
+        h.update(2, 1)
+        self.assertEqual(h.top(), (1, 2))
+        h.update(3, 1)
+        self.assertEqual(h.top(), (1, 2))
+        h.remove(2)
+        self.assertEqual(h.top(), (1, 3))
+        h.update(3, 9)
+        self.assertEqual(h.top(), (3, 1))
+        h.remove(4)
+        self.assertEqual(len(h), 3)
+        self.assertEqual(sorted(h.heap), [(3, 1), (5, 0), (9, 3)])
+        self.assertEqual(h.top({1}), (5, 0))
+        self.assertEqual(h.top({0, 1}), (9, 3))
+        self.assertIsNone(h.top({0, 1, 3}))
+
+    def testObjectiveLine(self):
+        a = ObjectiveLine([F(3), F(-1), F(0), F(-2), F(-5)])
+        self.assertEqual(a.argmin(0, -1), 3)
+        a -= SparseLine([F(0), F(1), F(0), F(0), F(0)])
+        self.assertEqual(a.argmin(0, -1), 1)
+        a[1] = F(0)
+        self.assertNotIn(1, a)
+        self.assertEqual(a.argmin(0, -1), 3)
+        self.assertIsInstance(a.copy(), ObjectiveLine)
+        self.assertEqual(a.copy().argmin(0, -1), 3)
+        a.addColumn(F(-7))
+        self.assertEqual(a.argmin(0, -1), 0)
+        a.removeColumn()
+        a[3] = F(4)
+        self.assertEqual(a.argmin(0, -1), 1)
+        self.assertEqual(a, SparseLine([3, 0, 0, 4, -5]))
+        a.axpy(F(2), SparseLine([F(-3, 2), F(-1), F(0), F(-2), F(0)]))
+        self.assertEqual(a.argmin(0, -1), 1)
+        self.assertNotIn(0, a.heap)
+        self.assertNotIn(3, a.heap)
+        self.assertIsInstance(SparseMatrix([[1, 2], [3, 4]])[0], ObjectiveLine)
+
+class NumpyTests(TestCase):
+
+    def testConstructor(self):
+        a = NumpyMatrix([[F(1), F(2)], [F(3), F(1, 4)]])
+        self.assertEqual(a.data.tolist(), [[1, 2], [3, 0.25]])
+        for l in a:
+            self.assertIsInstance(l, NumpyLine)
+        a[1][0] = 5
+        self.assertEqual(a.data[1, 0], 5)
+        a[0] = NumpyLine([7, 8])
+        self.assertEqual(a.data.tolist(), [[7, 8], [5, 0.25]])
+        self.assertEqual(NumpyMatrix(a).data.tolist(), a.data.tolist())
+
+    def testAddRemoveColumn(self):
+        a = NumpyMatrix([[1, 2], [3, 4]])
+        a.addColumn(42, 1)
+        self.assertEqual(a.data.tolist(), [[1, 42, 2], [3, 42, 4]])
+        a.removeColumn(2)
+        self.assertEqual(a.data.tolist(), [[1, 42], [3, 42]])
+        a.addColumn(4)
+        self.assertEqual(a.data.tolist(), [[4, 1, 42], [4, 3, 42]])
+        a[0][1] = 0
+        self.assertEqual(a[0].tolist(), [4, 0, 42])
+
+    def testPivot(self):
+        a = NumpyMatrix([[1, 2, 3], [2, 4, 2], [0, 1, 1]])
+        a.pivot(1, 0)
+        self.assertEqual(a.data.tolist(), [[0, 0, 2], [1, 2, 1], [0, 1, 1]])
+        self.assertEqual(list(a.nonZeroRows(1)), [1, 2])
+        a = NumpyMatrix([[3, 1], [1, 1/3]])
+        a.pivot(0, 0)
+        self.assertEqual(a.data.tolist(), [[1, 1/3], [0, 0]])
+
+    def testArgmin(self):
+        a = NumpyLine([3, 1, 5, 4, 0])
+        self.assertEqual(a.argmin(), len(a)-1)
+        self.assertEqual(a.argmin(0, -1), 1)
+        self.assertEqual(a.argmin(2, -1), 3)
+
+    def testAddRow(self):
+        a = NumpyMatrix([[1, 2], [3, 4]])
+        a.addRow([F(1, 2), 0])
+        self.assertEqual(a.data.tolist(), [[1, 2], [3, 4], [0.5, 0]])
+        self.assertIsInstance(a[2], NumpyLine)
+
+class FractionFreePivotTests(TestCase):
+
+    def testFractionFreePivot(self):
+        l = [[-1, -2, 0, 0, 0], [2, 3, 1, 0, 6], [4, 1, 0, 1, 8]]
+        for matrixClass in [DenseMatrix, SparseMatrix, IndexedSparseMatrix, CompressedMatrix]:
+            a = matrixClass(l)
+            self.assertEqual(a.fractionFreePivot(2, 0, 1), 4)
+            self.assertEqual(a, [[0, -7, 0, 1, 8], [0, 10, 4, -2, 8], [4, 1, 0, 1, 8]], matrixClass)
+            self.assertEqual(a.fractionFreePivot(1, 1, 4), 10)
+            self.assertEqual(a, [[0, 0, 7, -1, 34], [0, 10, 4, -2, 8], [10, 0, -1, 3, 18]], matrixClass)
+
+    def testNegativePivot(self):
+        a = SparseMatrix([[1, 0, 0], [-2, 1, -4]])
+        self.assertEqual(a.fractionFreePivot(1, 0, 1), 2)
+        self.assertEqual(a, [[0, 1, -4], [2, -1, 4]])
+
+class FromRowsTests(TestCase):
+
+    def testFromRows(self):
+        rows = [{0: -1, 3: 2}, {1: F(1, 2), 3: 6}, {}]
+        expected = [[-1, 0, 0, 2], [0, F(1, 2), 0, 6], [0, 0, 0, 0]]
+        for matrixClass in [DenseMatrix, SparseMatrix, IndexedSparseMatrix, CompressedMatrix, NumpyMatrix]:
+            a = matrixClass.fromRows(rows, 4)
+            self.assertIsInstance(a, matrixClass)
+            self.assertEqual([len(line) for line in a], [4, 4, 4], matrixClass)
+            self.assertEqual([[line[k] for k in range(4)] for line in a], expected, matrixClass)
+        self.assertIsInstance(SparseMatrix.fromRows(rows, 4)[0], ObjectiveLine)
+        self.assertEqual(IndexedSparseMatrix.fromRows(rows, 4).columnRows, {0: {0}, 1: {1}, 3: {0, 1}})
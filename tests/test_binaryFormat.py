@@ -0,0 +1,68 @@
+from simplex import Literal, Expression, Variable, LinearProgram, Parser
+from simplex import binaryFormat
+
+import os, tempfile
+from unittest import TestCase
+from fractions import Fraction as F
+
+class BinaryFormatTests(TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.fileName)
+
+    def assertSameProgram(self, lp1, lp2):
+        self.assertEqual(lp1.objective, lp2.objective)
+        self.assertEqual(lp1.objectiveFunction, lp2.objectiveFunction)
+        self.assertEqual(lp1.subjectTo, lp2.subjectTo)
+        self.assertEqual(lp1.bounds, lp2.bounds)
+        self.assertEqual(lp1.variables, lp2.variables)
+
+    def testSaveLoad(self):
+        for example in ['example.lp', 'example_bounds.lp', 'example_diet.lp', 'ex3_dm.lp', 'generated_100.lp']:
+            lp = LinearProgram()
+            Parser(lp, 'examples/%s' % example).parse()
+            binaryFormat.save(lp, self.fileName)
+            loaded = binaryFormat.load(self.fileName)
+            self.assertSameProgram(lp, loaded)
+            lp.normalize()
+            loaded.normalize()
+            self.assertEqual(lp.optimize()[0], loaded.optimize()[0], example)
+
+    def testSaveNormalized(self):
+        lp = LinearProgram()
+        Parser(lp, 'examples/example_bounds.lp').parse()
+        expected = lp.copy()
+        lp.normalize()
+        binaryFormat.save(lp, self.fileName)
+        self.assertSameProgram(expected, binaryFormat.load(self.fileName, LinearProgram()))
+
+    def testNumbers(self):
+        lp = LinearProgram()
+        lp.variables = {'x': Variable('x'), 'y': Variable('y')}
+        lp.objective = 'MINIMIZE'
+        lp.objectiveFunction = Expression(None, None, [Literal(F(10**30, 7), 'x'), Literal(F(-1, 3), 'y')], F(5, 2))
+        lp.subjectTo = [Expression(-2**70, 4, [Literal(1, 'x'), Literal(F(-1, 3), 'y')], 1), Expression(F(1, 2), None, [])]
+        lp.bounds = [Expression(0, None, [Literal(1, 'x')])]
+        binaryFormat.save(lp, self.fileName)
+        loaded = binaryFormat.load(self.fileName)
+        self.assertSameProgram(lp, loaded)
+        self.assertIsInstance(loaded.subjectTo[0].rightBound, F)
+
+    def testErrors(self):
+        with self.assertRaisesRegex(Exception, 'not a linear program'):
+            binaryFormat.load(self.fileName)
+        with self.assertRaisesRegex(Exception, 'not a linear program'):
+            binaryFormat.load('examples/example.lp')
+        lp = LinearProgram()
+        Parser(lp, 'examples/example.lp').parse()
+        binaryFormat.save(lp, self.fileName)
+        with open(self.fileName, 'rb') as f:
+            content = f.read()
+        with open(self.fileName, 'wb') as f:
+            f.write(content[:-8])
+        with self.assertRaisesRegex(Exception, 'truncated'):
+            binaryFormat.load(self.fileName)
@@ -0,0 +1,65 @@
+from simplex import BasisFactorization, SingularBasis
+
+from unittest import TestCase
+from fractions import Fraction as F
+
+# columns of the matrix
+# 2 0 1
+# 1 3 0
+# 0 1 4
+testColumns = [
+    {0: F(2), 1: F(1)},
+    {1: F(3), 2: F(1)},
+    {0: F(1), 2: F(4)},
+]
+
+def multiply(columns, x):
+    return {i: sum(column.get(i, 0)*x.get(k, 0) for k, column in enumerate(columns)) for i in range(len(columns))}
+
+def leftMultiply(y, columns):
+    return {k: sum(y.get(i, 0)*value for i, value in column.items()) for k, column in enumerate(columns)}
+
+class FactorizationTests(TestCase):
+
+    def testFtranBtran(self):
+        f = BasisFactorization(testColumns)
+        x = f.ftran({0: F(1), 1: F(2), 2: F(3)})
+        self.assertEqual(multiply(testColumns, x), {0: 1, 1: 2, 2: 3})
+        y = f.btran({0: F(1), 1: F(-1), 2: F(5)})
+        self.assertEqual(leftMultiply(y, testColumns), {0: 1, 1: -1, 2: 5})
+
+    def testUpdate(self):
+        columns = list(testColumns)
+        f = BasisFactorization(columns)
+        newColumn = {0: F(1), 1: F(1), 2: F(1)}
+        f.update(1, f.ftran(newColumn))
+        columns[1] = newColumn
+        self.assertEqual(len(f.etas), 1)
+        x = f.ftran({0: F(4), 2: F(-1)})
+        self.assertEqual(multiply(columns, x), {0: 4, 1: 0, 2: -1})
+        y = f.btran({1: F(2)})
+        self.assertEqual(leftMultiply(y, columns), {0: 0, 1: 2, 2: 0})
+        f.factorize(columns)
+        self.assertEqual(len(f.etas), 0)
+        self.assertEqual(multiply(columns, f.ftran({0: F(4), 2: F(-1)})), {0: 4, 1: 0, 2: -1})
+
+    def testSingular(self):
+        with self.assertRaises(SingularBasis):
+            BasisFactorization([{0: F(1), 1: F(2)}, {0: F(2), 1: F(4)}])
+
+    def testRefactorizationPolicy(self):
+        f = BasisFactorization(testColumns, maxEtas=2, adaptive=False)
+        self.assertEqual((f.nbFactorizations, f.factorNonZeros), (1, 7))
+        f.update(0, {0: F(1)})
+        self.assertFalse(f.needsFactorization())
+        f.update(1, {0: F(1), 1: F(2), 2: F(1)})
+        self.assertTrue(f.needsFactorization())
+        self.assertEqual((f.nbUpdates, f.etaNonZeros, f.maxEtaLength), (2, 4, 2))
+        f.factorize(testColumns)
+        self.assertEqual((f.nbFactorizations, f.etaNonZeros, f.maxEtaLength), (2, 0, 2))
+        f = BasisFactorization(testColumns, maxEtas=10, adaptive=True)
+        f.update(1, {0: F(1), 1: F(2), 2: F(1)})
+        f.update(2, {0: F(1), 1: F(2), 2: F(1)})
+        self.assertFalse(f.needsFactorization())
+        f.update(0, {0: F(1), 1: F(2), 2: F(1)})
+        self.assertTrue(f.needsFactorization())
@@ -0,0 +1,72 @@
+from simplex import FractionFreeSimplex, Simplex, Unbounded, Empty, LinearProgram, Parser, Array, NumpyMatrix
+
+from unittest import TestCase
+from fractions import Fraction as F
+from test_simplex import testMatrix1, testMatrix2
+
+class FractionFreeSimplexTests(TestCase):
+
+    def testScaleToIntegers(self):
+        s = FractionFreeSimplex([
+            [F(1, 2), F(-1, 3), F(0), F(0)],
+            [F(2, 3), F(1, 2), F(1), F(5, 6)],
+        ])
+        self.assertEqual(s.objectiveScale, 6)
+        self.assertEqual(s.tableaux, [[3, -2, 0, 0], [4, 3, 1, 5]])
+        self.assertEqual(s.entry(0, 1), F(-1, 3))
+
+    def testSimplex(self):
+        s = FractionFreeSimplex(testMatrix2)
+        self.assertEqual(s.runSimplex(), 13*s.denominator)
+        self.assertEqual(s.basicVariables[1:], [0, 4, 2])
+        for row in range(len(s.tableaux)):
+            for x in s.tableaux[row]:
+                self.assertIsInstance(x, int)
+
+    def testSolve(self):
+        s = FractionFreeSimplex(testMatrix1)
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, -20)
+        self.assertEqual(optSol, {'0' : 0, '1' : 12, '2' : 22, '3' : 0})
+
+    def testTrivialEmpty(self):
+        s = FractionFreeSimplex([
+            [F(0), F(0), F(0), F(0)],
+            [F(1), F(1), F(0), F(3)],
+            [F(-1), F(0), F(1), F(-4)]
+        ])
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        with self.assertRaises(Empty):
+            s.solve()
+
+    def testTrivialUnbounded(self):
+        s = FractionFreeSimplex([
+            [F(-1), F(0), F(0)],
+            [F(-1), F(1),F(-4)]
+        ])
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        with self.assertRaises(Unbounded):
+            s.solve()
+
+    def testInexactRepresentation(self):
+        bases = Array.__bases__
+        Array.__bases__ = (NumpyMatrix,)
+        try:
+            with self.assertRaises(Exception):
+                FractionFreeSimplex(testMatrix1)
+        finally:
+            Array.__bases__ = bases
+
+    def testSameAsTableaux(self):
+        for fileName in ['examples/example.lp', 'examples/example3.lp', 'examples/ex3_dm.lp', 'examples/quentin_example.lp']:
+            results = []
+            for simplexClass in [Simplex, FractionFreeSimplex]:
+                lp = LinearProgram()
+                Parser(lp, fileName).parse()
+                lp.normalize()
+                lp.initSimplex(simplexClass)
+                opt, optSol = lp.simplex.solve()
+                lp.pushUnconstrainedVariables(optSol)
+                results.append((opt, optSol))
+            self.assertEqual(results[0], results[1], fileName)
@@ -1,5 +1,6 @@
-from simplex import Literal, Expression, Variable, LinearProgram, Array
+from simplex import Literal, Expression, Variable, LinearProgram, Array, SparseMatrix, Simplex, RevisedSimplex, Parser, Unbounded, Empty
 
+import os, tempfile
 from unittest import TestCase
 from fractions import Fraction as F
 
@@ -79,12 +80,39 @@ class LinearProgramTests(TestCase):
             Expression(None, 4, [Literal(2, 'x_1'), Literal(F(-1, 3), 'x_2')], F(2, 3)),
             Expression(F(1, 9), None, [Literal(-3, 'x_1'), Literal(1, 'x_2')], 1),
             Expression(F(27, 42), 11, [Literal(-1, 'x_1'), Literal(1, 'x_2')], 3),
+        ])
+        self.assertEqual(lp.boundConstraints, [
             Expression(None, 2, [Literal(1, 'x_1')]),
             Expression(None, 5, [Literal(1, 'x_2')])
         ])
         self.assertEqual(lp.variables['x_1'].computeValue(1), -2)
         self.assertEqual(lp.variables['x_2'].computeValue(3), 7)
 
+    def testOccurrences(self):
+        lp = getLP()
+        lp.buildOccurrences()
+        self.assertEqual([(expr, lit.factor) for expr, lit in lp.occurrencesOf('x_2')],
+            [(lp.subjectTo[0], F(-1, 3)), (lp.subjectTo[1], 1), (lp.subjectTo[2], 1), (lp.objectiveFunction, -2)])
+        lp.normalizeBounds()
+        self.assertEqual(len(lp.occurrencesOf('x_1')), 5)
+        self.assertEqual(lp.objectiveFunction, Expression(None, None, [Literal(-4, 'x_1'), Literal(-2, 'x_2')], -12))
+        self.assertEqual(lp.subjectTo[0], Expression(None, 4, [Literal(2, 'x_1'), Literal(F(-1, 3), 'x_2')], F(2, 3)))
+
+    def testSeveralBounds(self):
+        programs = []
+        for indexed in [False, True]:
+            lp = getLP2()
+            lp.bounds[0] = Expression(0, 5, [Literal(1, 'x_1')])
+            lp.bounds.append(Expression(2, None, [Literal(1, 'x_1')]))
+            if indexed:
+                lp.buildOccurrences()
+            lp.normalizeBounds()
+            programs.append(lp)
+        self.assertEqual(programs[1].boundConstraints[0], Expression(None, 5, [Literal(1, 'x_1')], 2))
+        self.assertEqual(programs[0].subjectTo, programs[1].subjectTo)
+        self.assertEqual(programs[0].boundConstraints, programs[1].boundConstraints)
+        self.assertEqual(programs[0].objectiveFunction, programs[1].objectiveFunction)
+
     def testNormalizeConstraints(self):
         lp = getLP()
         lp.normalizeConstraints()
@@ -135,6 +163,209 @@ class LinearProgramTests(TestCase):
             Expression(None, 4, [Literal(-2, 'x_1'), Literal(F(-1, 3), v1), Literal(F(1, 3), v2)]),
             Expression(0, 5, [Literal(3, 'x_1'), Literal(1, v1), Literal(-1, v2)])
         ])
+        self.assertIsNone(lp.occurrences)
         sol = {'x_1' : 3, v1 : 0, v2 : 4}
         lp.pushUnconstrainedVariables(sol)
         self.assertEqual(sol, {'x_1' : 3, 'x_2' : -4})
+
+    def testUnconstrainedIndexed(self):
+        lp = getLP3()
+        lp.buildOccurrences()
+        lp.pullUnconstrainedVariables()
+        v1, v2 = lp.unconstrained['x_2']
+        self.assertNotIn('x_2', lp.occurrences)
+        self.assertEqual([(expr, lit.factor) for expr, lit in lp.occurrencesOf(v2)],
+            [(lp.subjectTo[0], F(1, 3)), (lp.subjectTo[1], -1), (lp.objectiveFunction, 2)])
+        self.assertEqual(lp.subjectTo[1], Expression(0, 5, [Literal(3, 'x_1'), Literal(1, v1), Literal(-1, v2)]))
+
+    def testSplitBounds(self):
+        lp = getLP()
+        lp.normalizeBounds()
+        constraints, upperBounds = lp.splitBounds(Simplex)
+        self.assertEqual(constraints, lp.subjectTo)
+        self.assertEqual(upperBounds, {'x_1': 2, 'x_2': 5})
+        constraints, upperBounds = lp.splitBounds(RevisedSimplex)
+        self.assertEqual(constraints, lp.subjectTo + lp.boundConstraints)
+        self.assertEqual(upperBounds, {})
+        lp.normalizeConstraints()
+        lp.initSimplex(Simplex)
+        self.assertEqual(lp.simplex.nbConstraints, 4)
+        self.assertEqual(lp.simplex.upperBounds, {0: 2, 1: 5})
+
+    def testSolveBounds(self):
+        results = []
+        for simplexClass in [Simplex, RevisedSimplex]:
+            lp = LinearProgram()
+            Parser(lp, 'examples/example_bounds.lp').parse()
+            lp.normalize()
+            lp.initSimplex(simplexClass)
+            results.append(lp.simplex.solve())
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0][0], 25)
+
+    def testFreeVariables(self):
+        lp = getLP3()
+        lp.normalize()
+        self.assertEqual(lp.unconstrained, {})
+        lp.initSimplex(Simplex)
+        self.assertEqual(lp.simplex.nbVariables, 2)
+        self.assertEqual(lp.simplex.freeVariables, {lp.simplex.indexFromVariable['x_2']})
+        lp = getLP3()
+        lp.normalize()
+        lp.initSimplex(RevisedSimplex)
+        self.assertEqual(lp.simplex.nbVariables, 3)
+        self.assertIn('x_2', lp.unconstrained)
+
+    def testEqualities(self):
+        lp = getLP2()
+        lp.subjectTo.append(Expression(-2, -2, [Literal(1, 'x_1'), Literal(-1, 'x_2')]))
+        lp.normalizeConstraints()
+        self.assertEqual(lp.subjectTo[3], Expression(-2, -2, [Literal(1, 'x_1'), Literal(-1, 'x_2')]))
+        lp.initSimplex(Simplex)
+        self.assertEqual(lp.simplex.nbConstraints, 4)
+        self.assertEqual(lp.simplex.artificialVariables, {5})
+        self.assertEqual(lp.simplex.variableFromIndex[5], '_artificial_3')
+        self.assertEqual(lp.simplex.tableaux[4], Array([[F(-1), F(1), F(0), F(0), F(0), F(1), F(2)]])[0])
+        lp.initSimplex(RevisedSimplex)
+        self.assertEqual(lp.simplex.nbConstraints, 5)
+
+    def testSolveEqualities(self):
+        results = []
+        for simplexClass in [Simplex, RevisedSimplex]:
+            lp = LinearProgram()
+            Parser(lp, 'examples/ex3_dm.lp').parse()
+            lp.normalize()
+            lp.initSimplex(simplexClass)
+            opt, optSol = lp.simplex.solve()
+            lp.pushUnconstrainedVariables(optSol)
+            results.append((opt, optSol))
+        self.assertEqual(results[0][0], 127000)
+        self.assertEqual(results[1][0], 127000)
+
+    def testWarmStart(self):
+        lp = LinearProgram()
+        Parser(lp, 'examples/ex3_dm.lp').parse()
+        lp.normalize()
+        lp.initSimplex(Simplex)
+        opt, optSol = lp.simplex.solve()
+        nbPivots = lp.simplex.nbPivots
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, 'basis')
+            lp.saveBasis(fileName)
+            basis = LinearProgram.loadBasis(fileName)
+        self.assertEqual(basis, lp.basis())
+        lp.initSimplex(Simplex)
+        self.assertTrue(lp.setBasis(*basis))
+        self.assertEqual(lp.simplex.solve(), (opt, optSol))
+        self.assertLess(lp.simplex.nbPivots, nbPivots)
+        lp.initSimplex(Simplex)
+        lp.simplex.setBasis(lp.simplex.crashBasis())
+        self.assertEqual(lp.simplex.solve()[0], opt)
+        lp.initSimplex(RevisedSimplex)
+        with self.assertRaises(Exception):
+            lp.setBasis(*basis)
+
+    def testCheck(self):
+        lp = LinearProgram()
+        Parser(lp, 'examples/example.lp').parse()
+        subjectTo = list(lp.subjectTo)
+        lp.check()
+        self.assertEqual(lp.subjectTo, subjectTo)
+        with self.assertRaises(Exception):
+            lp.addConstraint(Expression(None, 1, [Literal(1, 'y')]))
+        with self.assertRaises(Exception):
+            lp.setBounds('x_1', 2, 1)
+
+    def testModifyInPlace(self):
+        lp = getLP2()
+        lp.normalize()
+        self.assertEqual(lp.optimize(), (F(20, 3), {'x_1': F(5, 3), 'x_2': 0}))
+        lp.setObjectiveCoefficient('x_2', 3)
+        lp.setBounds('x_1', 1, None)
+        lp.addConstraint(Expression(None, 1, [Literal(1, 'x_2')]))
+        self.assertTrue(lp.canUpdate())
+        self.assertEqual(lp.optimize(), (F(25, 3), {'x_1': F(4, 3), 'x_2': 1}))
+        lp.setBounds('x_2', None, -2)
+        self.assertFalse(lp.canUpdate())
+        other = lp.original.copy()
+        other.normalize()
+        self.assertEqual(lp.optimize(), other.optimize())
+        self.assertEqual(lp.optimize()[0], F(10, 3))
+
+    def testModifyRebuild(self):
+        lp = getLP2()
+        lp.normalize()
+        lp.optimize()
+        lp.addVariable('x_3', 0, 2)
+        lp.setObjectiveCoefficient('x_3', 1)
+        self.assertFalse(lp.canUpdate())
+        self.assertEqual(lp.optimize(), (F(26, 3), {'x_1': F(5, 3), 'x_2': 0, 'x_3': 2}))
+        lp.removeConstraint(lp.constraints()[1])
+        with self.assertRaises(Unbounded):
+            lp.optimize()
+        lp.removeVariable('x_1')
+        self.assertEqual(lp.optimize(), (2, {'x_2': 0, 'x_3': 2}))
+
+    def testSensitivity(self):
+        lp = LinearProgram()
+        Parser(lp, 'examples/example_diet.lp').parse()
+        lp.normalize()
+        with self.assertRaises(Exception):
+            lp.sensitivity()
+        lp.optimize()
+        variables, rows = lp.sensitivity()
+        self.assertEqual(variables['x_4'], (F(9, 4), (F(11, 4), None)))
+        self.assertEqual(variables['x_1'], (0, (F(15, 13), F(19, 5))))
+        self.assertEqual([dual for expr, dual, bounds in rows], [F(-11, 32), F(-9, 16), 0, F(-13, 32)])
+        self.assertEqual(rows[2][2], (-9, None))
+        breakpoints, status = lp.parametricObjective({'x_1': 1}, 20)
+        self.assertIsNone(status)
+        self.assertEqual([(theta, opt) for theta, opt, values in breakpoints], [(0, 13), (F(9, 5), F(92, 5)), (20, F(92, 5))])
+        self.assertEqual(breakpoints[1][2], {'x_1': 0, 'x_2': F(8, 5), 'x_3': F(2, 5), 'x_4': F(12, 5)})
+        with self.assertRaises(Exception):
+            lp.sensitivity()
+        self.assertEqual(lp.optimize()[0], 13)
+        lp.optimize(RevisedSimplex)
+        with self.assertRaises(Exception):
+            lp.sensitivity()
+
+    def testSensitivityEquality(self):
+        lp = LinearProgram()
+        lp.variables = {'x': Variable('x'), 'y': Variable('y')}
+        lp.bounds = [Expression(0, None, [Literal(1, 'x')]), Expression(0, None, [Literal(1, 'y')])]
+        lp.objective = 'MAXIMIZE'
+        lp.objectiveFunction = Expression(None, None, [Literal(1, 'x'), Literal(1, 'y')])
+        lp.subjectTo = [
+            Expression(-1, -1, [Literal(1, 'x'), Literal(-1, 'y')]),
+            Expression(None, 4, [Literal(1, 'x'), Literal(2, 'y')]),
+        ]
+        lp.normalize()
+        self.assertEqual(lp.optimize(), (F(7, 3), {'x': F(2, 3), 'y': F(5, 3)}))
+        self.assertFalse(lp.simplex.keepArtificialColumns)
+        variables, rows = lp.sensitivity()
+        self.assertTrue(lp.simplex.keepArtificialColumns)
+        equality = [k for k, (expr, dual, bounds) in enumerate(rows) if expr.isEquality()]
+        self.assertEqual(len(equality), 1)
+        self.assertEqual(rows[equality[0]][1:], (F(1, 3), (-2, 4)))
+        breakpoints, status = lp.parametricRightHandSide({equality[0]: 1}, 6)
+        self.assertEqual(status, Empty)
+        self.assertEqual([(theta, opt) for theta, opt, values in breakpoints], [(0, F(7, 3)), (5, 4)])
+
+    def testSensitivitySparse(self):
+        bases = Array.__bases__
+        Array.__bases__ = (SparseMatrix,)
+        try:
+            lp = LinearProgram()
+            Parser(lp, 'examples/example_bounds.lp').parse()
+            lp.normalize()
+            lp.optimize()
+            variables, rows = lp.sensitivity()
+        finally:
+            Array.__bases__ = bases
+        self.assertEqual(variables['z'], (0, (4, None)))
+        for cost, (low, high) in variables.values():
+            for bound in [low, high]:
+                self.assertTrue(bound is None or isinstance(bound, F))
+        for expr, dual, (low, high) in rows:
+            for bound in [low, high]:
+                self.assertTrue(bound is None or isinstance(bound, F))
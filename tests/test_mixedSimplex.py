@@ -0,0 +1,78 @@
+from simplex import MixedSimplex, Simplex, Unbounded, Empty, LinearProgram, Parser, Array, NumpyMatrix
+
+from unittest import TestCase
+from fractions import Fraction as F
+from test_simplex import testMatrix1, testMatrix2
+
+class MixedSimplexTests(TestCase):
+
+    def testSolve(self):
+        s = MixedSimplex(testMatrix1)
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, -20)
+        self.assertIsInstance(opt, F)
+        self.assertEqual(optSol, {'0' : 0, '1' : 12, '2' : 22, '3' : 0})
+        self.assertTrue(s.verified)
+        self.assertGreater(s.floatPivots, 0)
+
+    def testInexactRepresentation(self):
+        bases = Array.__bases__
+        Array.__bases__ = (NumpyMatrix,)
+        try:
+            with self.assertRaises(Exception):
+                MixedSimplex(testMatrix1)
+        finally:
+            Array.__bases__ = bases
+
+    def testReconstructBasis(self):
+        s = MixedSimplex(testMatrix2)
+        self.assertTrue(s.reconstructBasis([None, 0, 4, 2]))
+        self.assertEqual(s.basicVariables[1:], [0, 4, 2])
+        self.assertTrue(s.isOptimal())
+        self.assertEqual(s.tableaux[0][-1], 13)
+
+    def testNotOptimal(self):
+        s = MixedSimplex(testMatrix2)
+        self.assertTrue(s.reconstructBasis([None, 0, 4, 5]))
+        self.assertFalse(s.isOptimal())
+        self.assertEqual(s.runSimplex(), 13)
+
+    def testSingularBasis(self):
+        s = MixedSimplex([
+            [F(-1), F(-1), F(0), F(0), F(0)],
+            [F(1), F(2), F(1), F(0), F(4)],
+            [F(2), F(4), F(0), F(1), F(8)],
+        ])
+        self.assertFalse(s.reconstructBasis([None, 0, 1]))
+
+    def testTrivialEmpty(self):
+        s = MixedSimplex([
+            [F(0), F(0), F(0), F(0)],
+            [F(1), F(1), F(0), F(3)],
+            [F(-1), F(0), F(1), F(-4)]
+        ])
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        with self.assertRaises(Empty):
+            s.solve()
+        self.assertFalse(s.verified)
+
+    def testTrivialUnbounded(self):
+        s = MixedSimplex([
+            [F(-1), F(0), F(0)],
+            [F(-1), F(1),F(-4)]
+        ])
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        with self.assertRaises(Unbounded):
+            s.solve()
+
+    def testSameAsTableaux(self):
+        for fileName in ['examples/example.lp', 'examples/example3.lp', 'examples/ex3_dm.lp', 'examples/quentin_example.lp']:
+            results = []
+            for simplexClass in [Simplex, MixedSimplex]:
+                lp = LinearProgram()
+                Parser(lp, fileName).parse()
+                lp.normalize()
+                lp.initSimplex(simplexClass)
+                results.append(lp.simplex.solve())
+            self.assertEqual(results[0][0], results[1][0], fileName)
@@ -0,0 +1,108 @@
+from simplex import Literal, Expression, Variable, LinearProgram, Parser, MPSParser, MPSWriter, Unbounded, Empty
+from simplex.mps import numberToString
+
+import os, tempfile
+from unittest import TestCase
+from fractions import Fraction as F
+
+def solve(lp):
+    lp.normalize()
+    try:
+        return lp.optimize()[0]
+    except Unbounded:
+        return 'unbounded'
+    except Empty:
+        return 'empty'
+
+class MPSTests(TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix='.mps')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.fileName)
+
+    def parseString(self, content, fixed=False):
+        with open(self.fileName, 'w') as f:
+            f.write(content)
+        lp = LinearProgram()
+        MPSParser(lp, self.fileName, fixed).parse()
+        return lp
+
+    def testParse(self):
+        for fixed in [True, False]:
+            lp = LinearProgram()
+            MPSParser(lp, 'tests/example.mps', fixed).parse()
+            self.assertEqual(lp.objective, 'MINIMIZE')
+            self.assertEqual(lp.objectiveFunction, Expression(None, None, [
+                Literal(1, 'X1'), Literal(2, 'X2'), Literal(-1, 'X3'), Literal(F(3, 2), 'X4')], F(5, 2)))
+            self.assertEqual(lp.subjectTo, [
+                Expression(F(3, 2), 4, [Literal(1, 'X1'), Literal(1, 'X2')]),
+                Expression(1, None, [Literal(1, 'X1')]),
+                Expression(7, 7, [Literal(-1, 'X2'), Literal(1, 'X3')]),
+            ])
+            self.assertEqual(lp.bounds, [
+                Expression(0, 4, [Literal(1, 'X1')]),
+                Expression(None, -1, [Literal(1, 'X2')]),
+                Expression(0, 8, [Literal(1, 'X3')]),
+                Expression(0, 1, [Literal(1, 'X4')]),
+                Expression(3, 3, [Literal(1, 'X5')]),
+            ])
+            self.assertEqual(sorted(lp.variables), ['X1', 'X2', 'X3', 'X4', 'X5'])
+            self.assertEqual(solve(lp), -3)
+
+    def testFreeFormat(self):
+        lp = self.parseString('NAME\nOBJSENSE MAX\nROWS\n N obj\n L c1\n E c2\nCOLUMNS\n'
+                ' x obj 1 c1 1\n x c1 2\n y obj 1e0 c2 -.5\nRHS\n c1 8 c2 1.5E1\nRANGES\n c2 -3\n'
+                'BOUNDS\n FR BND y\n UP BND z 2\nENDATA\n')
+        self.assertEqual(lp.objective, 'MAXIMIZE')
+        self.assertEqual(lp.subjectTo, [
+            Expression(None, 8, [Literal(3, 'x')]),
+            Expression(12, 15, [Literal(F(-1, 2), 'y')]),
+        ])
+        self.assertEqual(lp.bounds, [
+            Expression(0, None, [Literal(1, 'x')]),
+            Expression(0, 2, [Literal(1, 'z')]),
+        ])
+        self.assertEqual(solve(lp), F(8, 3) - 24)
+
+    def testFixedFormatNames(self):
+        lp = self.parseString('NAME\nROWS\n N  COST\n G  ROW 1\nCOLUMNS\n'
+                '    MY VAR    COST      1              ROW 1     2\nRHS\n'
+                '              ROW 1     4\nENDATA\n', True)
+        self.assertEqual(lp.subjectTo, [Expression(4, None, [Literal(2, 'MY VAR')])])
+        self.assertEqual(solve(lp), 2)
+
+    def testErrors(self):
+        for content, lineno in [('ROWS\n N obj\nCOLUMNS\n x obj 1 c1 1\nENDATA\n', 4),
+                ('ROWS\n N obj\nCOLUMNS\n x obj 1..2\nENDATA\n', 4),
+                ('ROWS\n N obj\n X c1\nENDATA\n', 3),
+                ('ROWS\n N obj\nCOLUMNS\n x obj 1\nBOUNDS\n XX BND x 1\nENDATA\n', 6)]:
+            with self.assertRaisesRegex(Exception, 'line %d' % lineno, msg=content):
+                self.parseString(content)
+        with self.assertRaisesRegex(Exception, 'no objective'):
+            self.parseString('ROWS\n L c1\nENDATA\n')
+
+    def testNumberToString(self):
+        self.assertEqual(numberToString(F(-1, 8)), '-0.125')
+        self.assertEqual(numberToString(F(25, 2)), '12.5')
+        self.assertEqual(numberToString(F(1, 1024)), '0.0009765625')
+        self.assertEqual(numberToString(-7), '-7')
+        self.assertEqual(float(numberToString(F(1, 3))), 1/3)
+
+    def testWrite(self):
+        for example in ['example.lp', 'example_bounds.lp', 'example_diet.lp', 'example_unbounded.lp', 'example_empty.lp', 'ex3_dm.lp']:
+            for fixed in [False, True]:
+                if fixed and example == 'ex3_dm.lp':
+                    continue
+                lp = LinearProgram()
+                Parser(lp, 'examples/%s' % example).parse()
+                MPSWriter(lp, self.fileName, fixed).write()
+                expected = solve(lp)
+                written = LinearProgram()
+                MPSParser(written, self.fileName, fixed).parse()
+                self.assertEqual(written.objective, lp.original.objective)
+                self.assertEqual(solve(written), expected, example)
+        with self.assertRaisesRegex(Exception, 'too long'):
+            MPSWriter(lp, self.fileName, True).write()
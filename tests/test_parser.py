@@ -1,5 +1,6 @@
 from simplex import Literal, Expression, Variable, LinearProgram, Parser
 
+import os, tempfile
 from unittest import TestCase
 import numpy as np
 from fractions import Fraction as F
@@ -39,6 +40,23 @@ class ParserTests(TestCase):
         self.assertEqual(expr.leftBound, F(4, 3))
         self.assertEqual(expr.rightBound, F(4, 3))
 
+    def testStringToNumber(self):
+        self.assertEqual(Parser.stringToNumber('42'), 42)
+        self.assertEqual(Parser.stringToNumber('-0.125'), F(-1, 8))
+        self.assertEqual(Parser.stringToNumber('+3/6'), F(1, 2))
+        self.assertEqual(Parser.stringToNumber('-'), -1)
+        self.assertEqual(Parser.stringToNumber(''), 1)
+        self.assertIsInstance(Parser.stringToNumber('7'), F)
+
+    def testSyntaxErrors(self):
+        p = Parser(None, None)
+        for line in ['x<=', '<=x', 'x+<=3', '3<=x>=4', '3=x=4', 'x<=3<=4<=y', 'x+3<=4', 'xy-2', '2-x', 'x*y<=1', 'x<=y', '']:
+            with self.assertRaisesRegex(Exception, 'line 7', msg=line):
+                p.parseLine(line, 7)
+        expr = p.parseLine('-1.5x+y_2-3/4z>=-2.25')
+        self.assertEqual(expr.literalList, [Literal(F(-3, 2), 'x'), Literal(1, 'y_2'), Literal(F(-3, 4), 'z')])
+        self.assertEqual((expr.leftBound, expr.rightBound), (F(-9, 4), None))
+
     def testParse(self):
         lp = LinearProgram()
         p = Parser(lp, 'tests/example2.in')
@@ -71,3 +89,25 @@ class ParserTests(TestCase):
             self.assertIn(Expression(0, None, [Literal(1, v)]), lp.bounds)
         self.assertEqual(len(lp.variables), 3)
         self.assertEqual(set(lp.variables), set(['x_1', 'x_2', 'x_3']))
+
+    def parsed(self, fileName, nbProcesses):
+        lp = LinearProgram()
+        Parser(lp, fileName).parse(nbProcesses)
+        return lp.objective, lp.objectiveFunction, lp.subjectTo, lp.bounds, list(lp.variables)
+
+    def testParallelParse(self):
+        for example in ['examples/ex3_dm.lp', 'examples/generated_100.lp', 'tests/example2.in']:
+            self.assertEqual(self.parsed(example, 3), self.parsed(example, 1), example)
+
+    def testParallelParseErrors(self):
+        fd, path = tempfile.mkstemp(suffix='.lp')
+        with os.fdopen(fd, 'w') as f:
+            f.write('MAXIMIZE\nx+y\nSUBJECT TO\n' + 'x+y<=3\n'*50 + 'x+*y<=3\n' + 'x-y<=1\n'*50 + 'x+<=1\nVARIABLES\nx\ny\n')
+        try:
+            chunks = Parser(None, path).chunks(8)
+            self.assertGreater(len(chunks), 3)
+            self.assertEqual([mode for start, end, mode in chunks][:2], ['MAXIMIZE', 'SUBJECTTO'])
+            with self.assertRaisesRegex(Exception, 'line 54'):
+                self.parsed(path, 4)
+        finally:
+            os.remove(path)
@@ -0,0 +1,98 @@
+from simplex import Simplex, Array, DenseMatrix, SparseMatrix, EndOfAlgorithm, DantzigRule, BlandRule, DevexRule, SteepestEdgeRule, PartialPricingRule, PIVOT_RULES
+
+from unittest import TestCase
+from fractions import Fraction as F
+from test_simplex import testMatrix1, testMatrix2
+
+class PivotRuleTests(TestCase):
+
+    def testDantzig(self):
+        s = Simplex(testMatrix2)
+        self.assertIsInstance(s.pivotRule, DantzigRule)
+        self.assertEqual(s.choosePivot(), (1, 0))
+
+    def testDantzigBarred(self):
+        bases = Array.__bases__
+        try:
+            for matrixClass in [DenseMatrix, SparseMatrix]:
+                Array.__bases__ = (matrixClass,)
+                s = Simplex([
+                    [F(-1), F(-2), F(-5), F(0), F(0)],
+                    [F(1), F(1), F(1), F(0), F(2)],
+                    [F(2), F(1), F(0), F(1), F(4)],
+                ])
+                s.artificialVariables = {2}
+                self.assertEqual(s.choosePivot()[1], 2)
+                s.keepArtificialColumns = True
+                self.assertEqual(s.choosePivot()[1], 1)
+                s.firstPhase = True
+                self.assertEqual(s.choosePivot()[1], 2)
+        finally:
+            Array.__bases__ = bases
+
+    def testBland(self):
+        s = Simplex([
+            [F(-1), F(-3), F(0), F(0), F(0)],
+            [F(1), F(1), F(1), F(0), F(2)],
+            [F(2), F(1), F(0), F(1), F(4)],
+        ])
+        s.pivotRule = BlandRule()
+        self.assertEqual(s.choosePivot(), (1, 0))
+        s.basicVariables = [None, 3, 2]
+        self.assertEqual(s.choosePivot(), (2, 0))
+        s.tableaux[0] = Array([[0, 0, 1, 1, 0]])[0]
+        with self.assertRaises(EndOfAlgorithm):
+            s.choosePivot()
+
+    def testDevex(self):
+        s = Simplex(testMatrix2)
+        s.pivotRule = DevexRule()
+        s.pivotRule.initialize(s)
+        self.assertEqual(s.choosePivot(), (1, 0))
+        s.pivotRule.update(s, 1, 0)
+        self.assertEqual(s.pivotRule.weights, {1: 2.25, 2: 1, 3: 1})
+        s.performPivot(1, 0)
+        self.assertEqual(s.choosePivot(), (3, 2))
+
+    def testSteepestEdge(self):
+        s = Simplex([
+            [F(-2), F(-1), F(0), F(0), F(0)],
+            [F(3), F(0), F(1), F(0), F(6)],
+            [F(3), F(1), F(0), F(1), F(6)],
+        ])
+        s.pivotRule = SteepestEdgeRule()
+        s.pivotRule.initialize(s)
+        self.assertEqual(s.pivotRule.weights, {0: 19, 1: 2})
+        self.assertEqual(s.choosePivot(), (2, 1))
+
+    def testSteepestEdgeUpdate(self):
+        s = Simplex(testMatrix1)
+        s.pivotRule = SteepestEdgeRule()
+        s.pivotRule.initialize(s)
+        for row, column in [(1, 0), (2, 2)]:
+            s.pivotRule.update(s, row, column)
+            s.performPivot(row, column)
+            exact = SteepestEdgeRule()
+            exact.initialize(s)
+            self.assertEqual(s.pivotRule.weights.keys(), exact.weights.keys())
+            for j, weight in exact.weights.items():
+                self.assertAlmostEqual(s.pivotRule.weights[j], weight)
+
+    def testPartialPricing(self):
+        s = Simplex([
+            [F(-1), F(-2), F(0), F(-5), F(0)],
+            [F(1), F(1), F(1), F(1), F(4)],
+        ])
+        s.pivotRule = PartialPricingRule(2)
+        s.pivotRule.initialize(s)
+        self.assertEqual(s.choosePivot(), (1, 1))
+        self.assertEqual(s.choosePivot(), (1, 3))
+        self.assertEqual(s.choosePivot(), (1, 1))
+
+    def testSolve(self):
+        for name, rule in PIVOT_RULES.items():
+            for matrix, expected in [(testMatrix1, -20), (testMatrix2, 13)]:
+                s = Simplex(matrix)
+                s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+                opt, optSol = s.solve(pivotRule=rule())
+                self.assertEqual(opt, expected, name)
@@ -0,0 +1,120 @@
+from simplex import Literal, Expression, Variable, LinearProgram, Simplex, RevisedSimplex, Parser, Presolve, Empty, Unbounded
+
+from unittest import TestCase
+from fractions import Fraction as F
+
+def getLP(subjectTo, bounds, objective='MAXIMIZE'):
+    lp = LinearProgram()
+    lp.variables = {'x_1': Variable('x_1'), 'x_2': Variable('x_2'), 'x_3': Variable('x_3')}
+    lp.bounds = bounds
+    lp.objective = objective
+    lp.objectiveFunction = Expression(None, None, [Literal(F(2), 'x_1'), Literal(F(1), 'x_2'), Literal(F(-1), 'x_3')])
+    lp.subjectTo = subjectTo
+    lp.normalize()
+    return lp
+
+def nonNegative(*variables):
+    return [Expression(0, None, [Literal(1, var)]) for var in variables]
+
+def solution(lp):
+    lp.initSimplex()
+    opt, optSol = lp.simplex.solve()
+    lp.pushUnconstrainedVariables(optSol)
+    if lp.presolver is not None:
+        lp.presolver.postsolve(optSol)
+    return opt, {var: lp.variables[var].computeValue(value) for var, value in optSol.items()}
+
+class PresolveTests(TestCase):
+
+    def testSingletonRows(self):
+        lp = getLP([
+            Expression(None, F(4), [Literal(F(1), 'x_1'), Literal(F(1), 'x_2'), Literal(F(1), 'x_3')]),
+            Expression(None, F(3), [Literal(F(1), 'x_1')]),
+            Expression(F(1), None, [Literal(F(1), 'x_2')]),
+        ], nonNegative('x_1', 'x_2', 'x_3'))
+        presolver = Presolve(lp).run()
+        self.assertEqual(presolver.nbRemovedRows, 2)
+        self.assertEqual(lp.subjectTo, [Expression(None, F(4), [Literal(F(1), 'x_1'), Literal(F(1), 'x_2')], F(1))])
+        self.assertEqual(lp.boundConstraints, [Expression(None, F(3), [Literal(1, 'x_1')])])
+        self.assertEqual(lp.variables['x_2'], Variable('x_2', 1, -1))
+        self.assertEqual(solution(lp), (F(7), {'x_1': 3, 'x_2': 1, 'x_3': 0}))
+
+    def testFixedVariable(self):
+        lp = getLP([
+            Expression(None, F(4), [Literal(F(1), 'x_1'), Literal(F(1), 'x_2')]),
+            Expression(F(2), F(2), [Literal(F(2), 'x_2')]),
+        ], nonNegative('x_1', 'x_2', 'x_3'))
+        presolver = Presolve(lp).run()
+        self.assertIn('x_2', presolver.fixed)
+        self.assertNotIn('x_2', lp.variables)
+        self.assertEqual(solution(lp), (F(7), {'x_1': 3, 'x_2': 1, 'x_3': 0}))
+
+    def testFreeVariable(self):
+        lp = getLP([
+            Expression(None, F(4), [Literal(F(1), 'x_1'), Literal(F(1), 'x_2')]),
+            Expression(None, F(1), [Literal(F(1), 'x_2')]),
+        ], nonNegative('x_1', 'x_3'))
+        Presolve(lp).run()
+        self.assertEqual(lp.unconstrainedVariables(), [])
+        self.assertEqual(lp.variables['x_2'], Variable('x_2', -1, 1))
+        with self.assertRaises(Unbounded):
+            solution(lp)
+
+    def testEmptyRow(self):
+        lp = getLP([
+            Expression(None, F(-1), [Literal(F(0), 'x_1')]),
+        ], nonNegative('x_1', 'x_2', 'x_3'))
+        with self.assertRaises(Empty):
+            Presolve(lp).run()
+
+    def testDuplicateRows(self):
+        lp = getLP([
+            Expression(None, F(4), [Literal(F(1), 'x_1'), Literal(F(1), 'x_2')]),
+            Expression(None, F(6), [Literal(F(2), 'x_1'), Literal(F(2), 'x_2')]),
+            Expression(F(1), None, [Literal(F(1), 'x_1'), Literal(F(-1), 'x_2')]),
+        ], nonNegative('x_1', 'x_2', 'x_3'))
+        presolver = Presolve(lp).run()
+        self.assertEqual(presolver.nbRemovedRows, 1)
+        self.assertEqual(lp.subjectTo[0], Expression(None, F(6), [Literal(F(2), 'x_1'), Literal(F(2), 'x_2')]))
+
+    def testRedundantRow(self):
+        lp = getLP([
+            Expression(None, F(10), [Literal(F(1), 'x_1'), Literal(F(1), 'x_2')]),
+            Expression(None, F(4), [Literal(F(1), 'x_1'), Literal(F(-1), 'x_2')]),
+        ], [Expression(0, 3, [Literal(1, 'x_1')]), Expression(0, 2, [Literal(1, 'x_2')])] + nonNegative('x_3'))
+        presolver = Presolve(lp).run()
+        self.assertEqual(lp.subjectTo, [])
+        self.assertEqual(presolver.nbRemovedRows, 2)
+        self.assertEqual(solution(lp), (F(8), {'x_1': 3, 'x_2': 2, 'x_3': 0}))
+
+    def testTightenBounds(self):
+        lp = getLP([
+            Expression(None, F(4), [Literal(F(1), 'x_1'), Literal(F(2), 'x_2')]),
+            Expression(None, F(5), [Literal(F(1), 'x_1'), Literal(F(-1), 'x_2'), Literal(F(-1), 'x_3')]),
+        ], [Expression(0, 10, [Literal(1, 'x_1')]), Expression(0, 10, [Literal(1, 'x_2')])] + nonNegative('x_3'))
+        presolver = Presolve(lp).run()
+        self.assertEqual(presolver.upperBounds, {'x_1': 4, 'x_2': 2})
+        self.assertEqual(presolver.nbTightenedBounds, 2)
+
+    def testDominatedColumn(self):
+        lp = getLP([
+            Expression(None, F(4), [Literal(F(1), 'x_1'), Literal(F(1), 'x_2'), Literal(F(1), 'x_3')]),
+            Expression(None, F(5), [Literal(F(1), 'x_1'), Literal(F(-1), 'x_2')]),
+        ], nonNegative('x_1', 'x_2', 'x_3'))
+        presolver = Presolve(lp).run()
+        self.assertEqual(set(presolver.fixed), {'x_3'})
+        self.assertEqual(solution(lp), (F(8), {'x_1': 4, 'x_2': 0, 'x_3': 0}))
+
+    def testSolveExamples(self):
+        for example in ['example.lp', 'example_bounds.lp', 'ex3_dm.lp']:
+            for simplexClass in [Simplex, RevisedSimplex]:
+                results = []
+                for presolve in [False, True]:
+                    lp = LinearProgram()
+                    Parser(lp, 'examples/%s' % example).parse()
+                    lp.normalize()
+                    if presolve:
+                        Presolve(lp).run()
+                    lp.initSimplex(simplexClass)
+                    results.append(lp.simplex.solve()[0])
+                self.assertEqual(results[0], results[1], example)
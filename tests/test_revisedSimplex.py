@@ -0,0 +1,66 @@
+from simplex import RevisedSimplex, Simplex, Unbounded, Empty, LinearProgram, Parser
+
+from unittest import TestCase
+from fractions import Fraction as F
+from test_simplex import testMatrix1, testMatrix2
+
+class RevisedSimplexTests(TestCase):
+
+    def testConstructor(self):
+        s = RevisedSimplex(testMatrix1)
+        self.assertEqual(s.nbConstraints, 2)
+        self.assertEqual(s.nbVariables, 4)
+        self.assertEqual(s.basicVariables[1:], [4, 5])
+        self.assertEqual(s.columns[0], {0: 4, 1: -1})
+        self.assertEqual(s.columns[4], {0: 1})
+        self.assertEqual(s.rightHandSide, {0: -2, 1: -10})
+        self.assertEqual(s.cost, {0: 3, 1: -2, 2: 2, 3: 1})
+
+    def testSimplex(self):
+        s = RevisedSimplex(testMatrix2)
+        self.assertEqual(s.runSimplex(), 13)
+        self.assertEqual(s.basicVariables[1:], [0, 4, 2])
+        self.assertEqual(s.values, [2, 1, 1])
+
+    def testRefactorization(self):
+        s = RevisedSimplex(testMatrix2, refactorizationInterval=1)
+        self.assertEqual(s.runSimplex(), 13)
+        self.assertEqual(s.factorization.etas, [])
+
+    def testSolve(self):
+        s = RevisedSimplex(testMatrix1)
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, -20)
+        self.assertEqual(optSol, {'0' : 0, '1' : 12, '2' : 22, '3' : 0})
+        self.assertEqual(len(s.columns), 6)
+
+    def testTrivialEmpty(self):
+        s = RevisedSimplex([
+            [F(0), F(0), F(0), F(0)],
+            [F(1), F(1), F(0), F(3)],
+            [F(-1), F(0), F(1), F(-4)]
+        ])
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        with self.assertRaises(Empty):
+            s.solve()
+
+    def testTrivialUnbounded(self):
+        s = RevisedSimplex([
+            [F(-1), F(0), F(0)],
+            [F(-1), F(1),F(-4)]
+        ])
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        with self.assertRaises(Unbounded):
+            s.solve()
+
+    def testSameAsTableaux(self):
+        for fileName in ['examples/example.lp', 'examples/example3.lp', 'examples/ex3_dm.lp', 'examples/quentin_example.lp']:
+            results = []
+            for simplexClass in [Simplex, RevisedSimplex]:
+                lp = LinearProgram()
+                Parser(lp, fileName).parse()
+                lp.normalize()
+                lp.initSimplex(simplexClass)
+                results.append(lp.simplex.solve()[0])
+            self.assertEqual(results[0], results[1], fileName)
@@ -1,4 +1,4 @@
-from simplex import Simplex, EndOfAlgorithm, Unbounded, Empty, Array
+from simplex import Simplex, DualSimplex, EndOfAlgorithm, Unbounded, Empty, Array, NumpyMatrix, CompressedMatrix
 
 from unittest import TestCase
 from fractions import Fraction as F
@@ -124,6 +124,30 @@ class StructureTests(TestCase):
             self.assertEqual(s.tableaux[i], expected[i], "(row %d)" % i)
         self.assertEqual(s.basicVariables[1:], [0, 2])
 
+    def testAppendArtificialVariable(self):
+        s = Simplex(testMatrix2)
+        column = s.addArtificialVariable()
+        self.assertEqual(column, 6)
+        self.assertEqual(s.nbVariables, 3)
+        self.assertEqual(s.variableFromIndex[6], '_phase1_')
+        expected = Array([line[1:-1] + [line[0], line[-1]] for line in testMatrix2FirstPhase])
+        for i in range(len(expected)):
+            self.assertEqual(s.tableaux[i], expected[i], "(row %d)" % i)
+        s.performPivot(1, column)
+        s.performPivot(1, 0)
+        s.removeArtificialVariable(column)
+        self.assertNotIn('_phase1_', s.indexFromVariable)
+        self.assertEqual(len(s.tableaux[0]), 7)
+        self.assertEqual(s.basicVariables[1:], [0, 4, 5])
+
+    def testSolveArtificialColumn0(self):
+        s = Simplex(Array(testMatrix1))
+        s.appendArtificial = False
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, -20)
+        self.assertEqual(optSol, {'0' : 0, '1' : 12, '2' : 22, '3' : 0})
+
     def testSolve(self):
         s = Simplex(testMatrix1)
         s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
@@ -221,3 +245,331 @@ class StructureTests(TestCase):
         s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
         with self.assertRaises(Unbounded):
             s.solve()
+
+    def testSolveNumpy(self):
+        bases = Array.__bases__
+        Array.__bases__ = (NumpyMatrix,)
+        try:
+            s = Simplex(testMatrix1)
+            s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+            opt, optSol = s.solve()
+        finally:
+            Array.__bases__ = bases
+        self.assertAlmostEqual(opt, -20)
+        for var, value in {'0' : 0, '1' : 12, '2' : 22, '3' : 0}.items():
+            self.assertAlmostEqual(optSol[var], value)
+
+    def testSolveCompressed(self):
+        bases = Array.__bases__
+        Array.__bases__ = (CompressedMatrix,)
+        try:
+            s = Simplex(testMatrix1)
+            s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+            opt, optSol = s.solve()
+        finally:
+            Array.__bases__ = bases
+        self.assertEqual(opt, -20)
+        self.assertEqual(optSol, {'0' : 0, '1' : 12, '2' : 22, '3' : 0})
+
+class BoundsTests(TestCase):
+
+    def testBoundFlip(self):
+        s = Simplex([
+            [F(-1), F(0), F(0), F(0)],
+            [F(1), F(1), F(1), F(10)],
+        ])
+        s.upperBounds = {0: F(2)}
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, 2)
+        self.assertEqual(optSol, {'0' : 2, '1' : 0})
+        self.assertEqual(s.nbBoundFlips, 1)
+        self.assertEqual(s.nbPivots, 0)
+        self.assertEqual(s.complemented, {0})
+        self.assertEqual(s.tableaux[1], [-1, 1, 1, 8])
+
+    def testLeaveAtUpperBound(self):
+        s = Simplex([
+            [F(-1), F(-2), F(0), F(0)],
+            [F(-1), F(1), F(1), F(0)],
+        ])
+        s.upperBounds = {0: F(3), 1: F(2)}
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, 7)
+        self.assertEqual(optSol, {'0' : 3, '1' : 2})
+        self.assertEqual(s.complemented, {0, 1})
+
+    def testComplementVariable(self):
+        s = Simplex(testMatrix2)
+        s.upperBounds = {0: F(1), 3: F(4)}
+        s.complementVariable(0)
+        self.assertEqual(s.tableaux[0], [5, -4, -3, 0, 0, 0, 5])
+        self.assertEqual(s.tableaux[1], [-2, 3, 1, 1, 0, 0, 3])
+        s.complementVariable(3)
+        self.assertEqual(s.tableaux[1], [2, -3, -1, 1, 0, 0, 1])
+        self.assertEqual(s.complemented, {0, 3})
+
+    def testFirstPhase(self):
+        s = Simplex([
+            [F(-1), F(-1), F(0), F(0), F(0)],
+            [F(-1), F(-1), F(1), F(0), F(-3)],
+            [F(1), F(0), F(0), F(1), F(1)],
+        ])
+        s.upperBounds = {0: F(5), 1: F(4)}
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, 5)
+        self.assertEqual(optSol, {'0' : 1, '1' : 4})
+
+class FreeVariablesTests(TestCase):
+
+    def testNegateVariable(self):
+        s = Simplex([
+            [F(-1), F(1), F(0), F(0), F(0)],
+            [F(1), F(0), F(1), F(0), F(3)],
+            [F(0), F(-1), F(0), F(1), F(2)],
+        ])
+        s.freeVariables = {1}
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, 5)
+        self.assertEqual(optSol, {'0' : 3, '1' : -2})
+        self.assertEqual(s.negated, {1})
+
+    def testBasicFreeVariableNeverLeaves(self):
+        s = Simplex(testMatrix2)
+        self.assertEqual(s.ratioTest(0), 1)
+        s.freeVariables = {3}
+        self.assertEqual(s.ratioTest(0), 3)
+
+class EqualitiesTests(TestCase):
+
+    def testArtificialVariables(self):
+        s = Simplex([
+            [F(-1), F(-1), F(0), F(0), F(0)],
+            [F(1), F(1), F(1), F(0), F(3)],
+            [F(1), F(0), F(0), F(1), F(2)],
+        ])
+        s.artificialVariables = {2}
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, 3)
+        self.assertNotIn(2, s.basicVariables)
+        for line in s.tableaux:
+            self.assertEqual(line[2], 0)
+        with self.assertRaises(Exception):
+            s.dualValue(0)
+
+    def testKeepArtificialColumns(self):
+        s = Simplex([
+            [F(-1), F(-1), F(0), F(0), F(0)],
+            [F(1), F(1), F(1), F(0), F(3)],
+            [F(1), F(0), F(0), F(1), F(2)],
+        ])
+        s.artificialVariables = {2}
+        s.keepArtificialColumns = True
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        self.assertEqual(s.solve()[0], 3)
+        self.assertNotIn(2, s.basicVariables)
+        self.assertEqual([line[2] for line in s.tableaux], [1, 1, 0])
+        self.assertEqual(s.dualValue(0), 1)
+
+    def testRedundantEquality(self):
+        s = Simplex([
+            [F(-1), F(-2), F(0), F(0), F(0), F(0)],
+            [F(1), F(1), F(1), F(0), F(0), F(3)],
+            [F(2), F(2), F(0), F(1), F(0), F(6)],
+            [F(1), F(0), F(0), F(0), F(1), F(1)],
+        ])
+        s.artificialVariables = {2, 3}
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        opt, optSol = s.solve()
+        self.assertEqual(opt, 6)
+        self.assertEqual(optSol, {'0' : 0, '1' : 3})
+        self.assertEqual(len(s.artificialVariables & set(s.basicVariables)), 1)
+
+    def testEmpty(self):
+        s = Simplex([
+            [F(-1), F(0), F(0), F(0)],
+            [F(1), F(1), F(0), F(1)],
+            [F(1), F(0), F(1), F(2)],
+        ])
+        s.artificialVariables = {1, 2}
+        with self.assertRaises(Empty):
+            s.solve()
+
+class WarmStartTests(TestCase):
+
+    def testSetBasis(self):
+        s = Simplex(testMatrix2)
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        result = s.solve()
+        basicVariables = s.basicVariables
+        s = Simplex(testMatrix2)
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        self.assertTrue(s.setBasis(basicVariables))
+        self.assertEqual(s.basicVariables, basicVariables)
+        self.assertEqual(s.nbPivots, 2)
+        self.assertEqual(s.solve(), result)
+        self.assertEqual(s.nbPivots, 2)
+
+    def testCrashBasis(self):
+        s = Simplex(testMatrix2)
+        self.assertEqual(s.crashBasis(), [None, 3, 0, 5])
+        self.assertEqual(s.basicVariables, [None, 3, 4, 5])
+
+    def testSetBasisOutOfBounds(self):
+        s = Simplex([
+            [F(-1), F(-1), F(0), F(0), F(0)],
+            [F(1), F(1), F(1), F(0), F(4)],
+            [F(1), F(-1), F(0), F(1), F(-2)],
+        ])
+        s.upperBounds = {0: F(2)}
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        self.assertFalse(s.setBasis([None, 0, 3]))
+        self.assertEqual(s.basicVariables, [None, 2, 3])
+        self.assertEqual(s.complemented, {0})
+        opt, optSol = s.solve()
+        self.assertEqual(opt, 4)
+        self.assertEqual(optSol, {'0' : 1, '1' : 3})
+
+class DualSimplexTests(TestCase):
+
+    def solved(self, tableaux):
+        s = Simplex(tableaux)
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        s.solve()
+        return s
+
+    def testDualSimplex(self):
+        covering = [
+            [F(2), F(3), F(0), F(0), F(0)],
+            [F(-1), F(-1), F(1), F(0), F(-2)],
+            [F(-1), F(-2), F(0), F(1), F(-3)],
+        ]
+        s = DualSimplex(covering)
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        self.assertTrue(s.isDualFeasible())
+        opt, optSol = s.solve()
+        self.assertEqual(opt, -5)
+        self.assertEqual(optSol, {'0' : 1, '1' : 1})
+        self.assertEqual(s.nbPivots, 2)
+        self.assertEqual(self.solved(covering).solution(), (opt, optSol))
+
+    def testShiftRightHandSide(self):
+        s = self.solved(testMatrix2)
+        nbPivots = s.nbPivots
+        s.shiftRightHandSide(0, -3)
+        self.assertEqual([line[-1] for line in s.tableaux], [10, -4, 7, 10])
+        opt, optSol = s.reoptimize()
+        self.assertEqual(opt, 6)
+        self.assertEqual(optSol, {'0' : 0, '1' : 0, '2' : 2})
+        self.assertEqual(s.nbPivots, nbPivots+1)
+
+    def testAddConstraint(self):
+        s = self.solved(testMatrix2)
+        nbPivots = s.nbPivots
+        self.assertEqual(s.addConstraint({0: F(1)}, F(1)), 3)
+        self.assertEqual(s.nbConstraints, 4)
+        self.assertEqual(s.basicVariables, [None, 0, 4, 2, 6])
+        self.assertEqual(s.tableaux[4], Array([[0, -2, 0, -2, 0, 1, 1, -1]])[0])
+        self.assertEqual(s.variableFromIndex[6], '_slack_3')
+        opt, optSol = s.reoptimize()
+        self.assertEqual(opt, F(25, 2))
+        self.assertEqual(optSol, {'0' : 1, '1' : 0, '2' : F(5, 2)})
+        self.assertEqual(s.nbPivots, nbPivots+1)
+
+    def testReoptimizeEmpty(self):
+        s = self.solved(testMatrix2)
+        s.addConstraint({0: F(-1), 1: F(-1), 2: F(-1)}, F(-10))
+        with self.assertRaises(Empty):
+            s.reoptimize()
+
+    def testShiftEquality(self):
+        s = Simplex([
+            [F(-1), F(-1), F(0), F(0), F(0)],
+            [F(1), F(1), F(1), F(0), F(3)],
+            [F(1), F(0), F(0), F(1), F(2)],
+        ])
+        s.artificialVariables = {2}
+        s.keepArtificialColumns = True
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        s.solve()
+        for delta, rightHandSide in [(2, 5), (-4, 1)]:
+            s.shiftRightHandSide(0, delta)
+            other = Simplex([
+                [F(-1), F(-1), F(0), F(0), F(0)],
+                [F(1), F(1), F(1), F(0), F(rightHandSide)],
+                [F(1), F(0), F(0), F(1), F(2)],
+            ])
+            other.artificialVariables = {2}
+            other.variableFromIndex = dict(s.variableFromIndex)
+            self.assertEqual(s.reoptimize(), other.solve())
+        s.shiftRightHandSide(0, -2)
+        with self.assertRaises(Empty):
+            s.reoptimize()
+
+    def testReoptimizeCost(self):
+        matrix = [
+            [F(-1), F(-1), F(0), F(0), F(0)],
+            [F(1), F(1), F(1), F(0), F(3)],
+            [F(1), F(0), F(0), F(1), F(2)],
+        ]
+        s = Simplex(matrix)
+        s.artificialVariables = {2}
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        s.solve()
+        s.changeCost(0, 3)
+        self.assertFalse(s.isDualFeasible())
+        s.artificialObjective = lambda: self.fail('The first phase is performed again.')
+        other = Simplex(matrix)
+        other.tableaux[0][0] = F(2)
+        other.artificialVariables = {2}
+        other.variableFromIndex = dict(s.variableFromIndex)
+        self.assertEqual(s.reoptimize(), other.solve())
+
+class SensitivityTests(TestCase):
+
+    def solved(self, tableaux):
+        s = Simplex(tableaux)
+        s.variableFromIndex = {i : str(i) for i in range(s.nbVariables)}
+        s.solve()
+        return s
+
+    def testReducedCosts(self):
+        s = self.solved(testMatrix2)
+        self.assertEqual([s.reducedCost(j) for j in range(3)], [0, 3, 0])
+        self.assertEqual([s.dualValue(k) for k in range(3)], [1, 0, 1])
+
+    def testRanges(self):
+        s = self.solved(testMatrix2)
+        self.assertEqual(s.rightHandSideRange({0: 1}), (-1, F(1, 3)))
+        self.assertEqual(s.rightHandSideRange({1: 1}), (-1, None))
+        self.assertEqual(s.costRange({0: -1}), (F(-1, 2), 1))
+        self.assertEqual(s.costRange({1: 1}), (-3, None))
+
+    def testParametricRightHandSide(self):
+        s = self.solved(testMatrix2)
+        breakpoints, status = s.parametricRightHandSide({0: 1}, 2)
+        self.assertIsNone(status)
+        self.assertEqual([(theta, opt) for theta, opt, optSol in breakpoints], [(0, 13), (F(1, 3), F(40, 3)), (2, F(40, 3))])
+        other = self.solved(testMatrix2)
+        other.shiftRightHandSide(0, 2)
+        self.assertEqual(other.reoptimize(), breakpoints[-1][1:])
+        s = self.solved(testMatrix2)
+        breakpoints, status = s.parametricRightHandSide({1: -1})
+        self.assertEqual(status, Empty)
+        self.assertEqual(breakpoints[-1][0], 11)
+
+    def testParametricCost(self):
+        s = self.solved(testMatrix2)
+        breakpoints, status = s.parametricCost({1: -1})
+        self.assertEqual(status, None)
+        self.assertEqual([theta for theta, opt, optSol in breakpoints], [0, 3, 5])
+        self.assertEqual(breakpoints[1][2], {'0': 0, '1': 1, '2': 2})
+        self.assertEqual(s.basicVariables[1:], [1, 4, 5])
+        s = self.solved(testMatrix2)
+        self.assertEqual(s.parametricCost({2: 1})[1], None)
+        breakpoints, status = self.solved(testMatrix2).parametricCost({0: 1, 1: 1, 2: 1}, 10)
+        self.assertEqual(breakpoints[-1][:2], (10, 0))